@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db.models import F
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.html import format_html
-from .models import InterpreterProfile
+from .models import InterpreterEarnings, InterpreterProfile
 from jobs.models import Job
 
 
@@ -58,7 +60,7 @@ class InterpreterProfileAdmin(admin.ModelAdmin):
             'fields': ('first_name', 'last_name', 'phone_number', 'email_address')
         }),
         ('Address', {
-            'fields': ('street_address', 'city', 'state', 'zip_code')
+            'fields': ('street_address', 'city', 'state', 'zip_code', 'latitude', 'longitude')
         }),
         ('Certification', {
             'fields': ('dshs_certified',)
@@ -74,6 +76,15 @@ class InterpreterProfileAdmin(admin.ModelAdmin):
 
     readonly_fields = ['projected_earnings_box']
 
+    def get_queryset(self, request):
+        # Read the maintained totals in the same query as the profiles so the
+        # changelist costs a constant number of queries whatever the page size
+        qs = super().get_queryset(request)
+        return qs.annotate(
+            job_total=Coalesce(F('earnings__job_count'), 0),
+            earnings_total=Coalesce(F('earnings__projected_earnings'), 0),
+        )
+
     def languages_spoken(self, obj):
         """Display languages spoken in the list view"""
         languages = obj.get_languages()
@@ -82,24 +93,27 @@ class InterpreterProfileAdmin(admin.ModelAdmin):
 
     def job_count(self, obj):
         """Display number of jobs assigned to this interpreter"""
-        return obj.jobs.count()
+        return obj.job_total
     job_count.short_description = 'Jobs'
+    job_count.admin_order_field = 'job_total'
 
     def projected_earnings_display(self, obj):
         """Display projected earnings from all assigned jobs"""
         if obj.id:
-            total = sum(job.payment for job in obj.jobs.all())
+            total = obj.earnings_total
             # Format the number first, then pass to format_html
             formatted_amount = '${:,.2f}'.format(total)
             return formatted_amount
         return '-'
     projected_earnings_display.short_description = 'Projected Earnings'
+    projected_earnings_display.admin_order_field = 'earnings_total'
 
     def projected_earnings_box(self, obj):
         """Display projected earnings box in detail view"""
         if obj.id:
-            total = sum(job.payment for job in obj.jobs.all())
-            job_count = obj.jobs.count()
+            earnings = InterpreterEarnings.for_interpreter(obj)
+            total = earnings.projected_earnings
+            job_count = earnings.job_count
             return format_html(
                 '<div style="background-color: #d1fae5; border: 2px solid #059669; padding: 15px; border-radius: 8px; text-align: center;">'
                 '<strong style="font-size: 14px; color: #065f46;">Projected Earnings</strong><br>'
@@ -0,0 +1,12 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path('interpreters/<int:interpreter_id>/jobs/', async_views.interpreter_jobs, name='async-interpreter-jobs-api'),
+    path('interpreters/<int:interpreter_id>/available-jobs/', async_views.available_jobs, name='async-available-jobs-api'),
+    path(
+        'interpreters/<int:interpreter_id>/jobs/<int:job_id>/accept/',
+        async_views.accept,
+        name='async-accept-job-api',
+    ),
+]
@@ -0,0 +1,108 @@
+"""
+Async versions of the hot interpreter endpoints, for ASGI deployments.
+
+They return the same JSON as their DRF counterparts in views.py, reading
+through Django's async ORM so a worker keeps serving other requests while
+it waits on the database. laango/urls.py routes the endpoints here instead
+of to views.py when ASYNC_VIEWS is set.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+from rest_framework.utils.urls import replace_query_param
+
+from jobs import assignment
+from jobs.pagination import InvalidCursor, apaginate_jobs
+from jobs.serializers import JobSerializer, job_rows, serialize_job_rows
+from .conditional import aavailable_jobs_validators, aconditional_on, ainterpreter_jobs_validators, arequest_board
+from .earnings import STATUS_FIELDS
+from .models import InterpreterEarnings, InterpreterProfile
+from .views import get_page_size, interpreter_data
+
+# accept_job runs in a transaction, which the async ORM doesn't support
+accept_job = sync_to_async(assignment.accept_job)
+
+ACCEPT_ERRORS = {
+    assignment.TAKEN: ('This job has already been accepted by another interpreter', 409),
+    assignment.CONFLICT: ('This job overlaps another job you have already accepted', 409),
+    assignment.INELIGIBLE: ('You do not meet the language or certification requirements for this job', 403),
+}
+
+
+def not_found(message='Not found.'):
+    return JsonResponse({'detail': message}, status=404)
+
+
+@require_safe
+@aconditional_on(ainterpreter_jobs_validators)
+async def interpreter_jobs(request, interpreter_id):
+    """Async version of InterpreterJobsListView"""
+    interpreter = await InterpreterProfile.objects.select_related('earnings').filter(id=interpreter_id).afirst()
+    if interpreter is None:
+        return not_found('No InterpreterProfile matches the given query.')
+    try:
+        page = await apaginate_jobs(
+            job_rows(interpreter.jobs.all()),
+            request.GET.get('cursor'),
+            get_page_size(request.GET.get('page_size')),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'cursor': [str(e)]}, status=400)
+
+    earnings = InterpreterEarnings.for_interpreter(interpreter)
+
+    next_url = None
+    if page.has_next:
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', page.next_cursor)
+
+    return JsonResponse({
+        'interpreter': interpreter_data(interpreter),
+        'jobs': serialize_job_rows(page.items),
+        'next_cursor': page.next_cursor,
+        'next': next_url,
+        'total_jobs': earnings.job_count,
+        'projected_earnings': earnings.projected_earnings,
+        'earnings_by_status': {
+            key: getattr(earnings, field) for key, field in STATUS_FIELDS.items()
+        }
+    })
+
+
+@require_safe
+@aconditional_on(aavailable_jobs_validators)
+async def available_jobs(request, interpreter_id):
+    """Async version of AvailableJobsListView"""
+    interpreter = await InterpreterProfile.objects.filter(id=interpreter_id).afirst()
+    if interpreter is None:
+        return not_found('No InterpreterProfile matches the given query.')
+
+    jobs = (await arequest_board(request, interpreter)).jobs
+    return JsonResponse({
+        'interpreter': interpreter_data(interpreter),
+        'jobs': JobSerializer(jobs, many=True).data,
+        'total_available': len(jobs),
+    })
+
+
+@csrf_exempt
+@require_POST
+async def accept(request, interpreter_id, job_id):
+    """Async version of AcceptJobView"""
+    interpreter = await InterpreterProfile.objects.filter(id=interpreter_id).afirst()
+    if interpreter is None:
+        return not_found('No InterpreterProfile matches the given query.')
+
+    outcome = await accept_job(job_id, interpreter)
+    if outcome == assignment.NOT_FOUND:
+        return not_found('Job not found')
+    if outcome == assignment.ACCEPTED:
+        return JsonResponse({
+            'success': True,
+            'message': f'Job successfully assigned to {interpreter.first_name} {interpreter.last_name}',
+            'job_id': job_id,
+            'status': 'assigned'
+        })
+
+    error, status = ACCEPT_ERRORS[outcome]
+    return JsonResponse({'success': False, 'error': error, 'job_id': job_id}, status=status)
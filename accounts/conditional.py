@@ -0,0 +1,163 @@
+"""
+Conditional GET support for the interpreter pages and APIs.
+
+Frontends poll these endpoints. Each response gets validators computed
+from one small aggregate query, and requests carrying a matching
+If-None-Match / If-Modified-Since get a 304 before any jobs are loaded or
+serialized.
+
+An interpreter's jobs only get an ETag. The newest updated_at among their
+current jobs goes backwards when a job is deleted or reassigned, so a
+Last-Modified built from it would keep clients on a stale list; the ETag
+also covers the number of jobs, so it changes either way.
+
+The available jobs board is served from jobs.board_cache, which can lag
+the database, so its validators come from the cached board itself and the
+view renders that same board.
+"""
+import hashlib
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from jobs import board_cache
+from .models import InterpreterProfile
+
+VALIDATORS_ATTR = '_conditional_validators'
+BOARD_ATTR = '_available_jobs_board'
+
+
+def _validators(request, parts, last_modified):
+    # The path (with query string) is part of the ETag, since the cursor and
+    # window parameters change the body
+    raw = '|'.join([request.get_full_path(), *(str(part) for part in parts)])
+    etag = hashlib.md5(raw.encode()).hexdigest()
+    return etag, last_modified
+
+
+def _interpreter_jobs_aggregates():
+    return {
+        'updated_at': Max('updated_at'),
+        'jobs_updated': Max('jobs__updated_at'),
+        'jobs_count': Count('jobs'),
+    }
+
+
+def _interpreter_jobs_result(request, row):
+    if row['updated_at'] is None:
+        # Unknown interpreter; let the view 404
+        return None
+    return _validators(request, [row['updated_at'], row['jobs_updated'], row['jobs_count']], None)
+
+
+def interpreter_jobs_validators(request, interpreter_id=None, id=None, **kwargs):
+    """ETag for an interpreter and their assigned jobs, from one query"""
+    row = InterpreterProfile.objects.filter(id=interpreter_id or id).aggregate(**_interpreter_jobs_aggregates())
+    return _interpreter_jobs_result(request, row)
+
+
+async def ainterpreter_jobs_validators(request, interpreter_id=None, id=None, **kwargs):
+    """Async version of interpreter_jobs_validators"""
+    row = await InterpreterProfile.objects.filter(id=interpreter_id or id).aaggregate(
+        **_interpreter_jobs_aggregates()
+    )
+    return _interpreter_jobs_result(request, row)
+
+
+def _board_interpreter(interpreter_id):
+    return InterpreterProfile.objects.filter(id=interpreter_id).only('language_mask', 'dshs_certified', 'updated_at')
+
+
+def request_board(request, interpreter):
+    """The interpreter's cached board, looked up once per request"""
+    if not hasattr(request, BOARD_ATTR):
+        setattr(request, BOARD_ATTR, board_cache.board_for(interpreter))
+    return getattr(request, BOARD_ATTR)
+
+
+async def arequest_board(request, interpreter):
+    """Async version of request_board"""
+    if not hasattr(request, BOARD_ATTR):
+        setattr(request, BOARD_ATTR, await board_cache.aboard_for(interpreter))
+    return getattr(request, BOARD_ATTR)
+
+
+def _available_jobs_result(request, interpreter, board):
+    last_modified = max(filter(None, [interpreter.updated_at, board.loaded_at]))
+    return _validators(request, [interpreter.updated_at, board.digest], last_modified)
+
+
+def available_jobs_validators(request, interpreter_id, **kwargs):
+    """Validators for an interpreter's available jobs board, as cached"""
+    interpreter = _board_interpreter(interpreter_id).first()
+    if interpreter is None:
+        return None
+    return _available_jobs_result(request, interpreter, request_board(request, interpreter))
+
+
+async def aavailable_jobs_validators(request, interpreter_id, **kwargs):
+    """Async version of available_jobs_validators"""
+    interpreter = await _board_interpreter(interpreter_id).afirst()
+    if interpreter is None:
+        return None
+    return _available_jobs_result(request, interpreter, await arequest_board(request, interpreter))
+
+
+def conditional_on(validators_func, pages=False):
+    """
+    Like django.views.decorators.http.condition, computing the ETag and
+    Last-Modified together with a single call to ``validators_func``.
+
+    For template pages (``pages=True``) validators are skipped while flash
+    messages are pending, so a 304 never swallows a message.
+    """
+    def validators(request, *args, **kwargs):
+        if not hasattr(request, VALIDATORS_ATTR):
+            if pages and len(get_messages(request)):
+                value = None
+            else:
+                value = validators_func(request, *args, **kwargs)
+            setattr(request, VALIDATORS_ATTR, value)
+        return getattr(request, VALIDATORS_ATTR)
+
+    def etag(request, *args, **kwargs):
+        value = validators(request, *args, **kwargs)
+        return value[0] if value else None
+
+    def last_modified(request, *args, **kwargs):
+        value = validators(request, *args, **kwargs)
+        return value[1] if value else None
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+def aconditional_on(validators_func):
+    """
+    conditional_on for async views, awaiting the async ``validators_func``.
+
+    Django's condition() supports async views but calls its validator
+    functions synchronously, where the ORM can't be used.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            value = await validators_func(request, *args, **kwargs)
+            etag, last_modified = value if value else (None, None)
+            etag = quote_etag(etag) if etag else None
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                if last_modified and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
@@ -0,0 +1,146 @@
+"""
+Incremental maintenance of InterpreterEarnings.
+
+Each Job contributes (1 job, payment) to the totals of its assigned
+interpreter, in the column for its status. When a job is saved or deleted
+its old contribution is subtracted and its new one added with F()
+expressions, so updates are O(1).
+
+The old contribution is read from the stored row, locked with SELECT ...
+FOR UPDATE in the same transaction as the save or delete, rather than from
+the instance: an instance loaded before another writer changed the row
+would subtract values the totals no longer hold.
+"""
+from django.db.models import Count, F, Subquery, Sum
+
+from jobs.models import Job
+from .models import InterpreterEarnings, InterpreterProfile
+
+STATUS_FIELDS = {key: f'{key}_earnings' for key, _ in Job.STATUS_CHOICES}
+
+SUMMARY_FIELDS = ['job_count', 'projected_earnings', *STATUS_FIELDS.values()]
+
+CONTRIBUTION_FIELDS = ('assigned_interpreter_id', 'status', 'payment')
+
+# What a job that doesn't exist contributes
+NO_CONTRIBUTION = (None, None, 0)
+
+# Attribute on Job instances holding the stored contribution between pre_ and post_ signals
+STORED_ATTR = '_earnings_stored'
+
+
+def job_contribution(job):
+    """The (interpreter_id, status, payment) a job contributes, read without triggering queries"""
+    values = job.__dict__
+    if not all(name in values for name in CONTRIBUTION_FIELDS):
+        # Deferred fields; the contribution isn't known without a query
+        return None
+    return tuple(values[name] for name in CONTRIBUTION_FIELDS)
+
+
+def stored_contribution(job_id, using):
+    """What the stored row contributes, locking it until the transaction ends"""
+    row = Job.objects.using(using).select_for_update().filter(pk=job_id).values_list(*CONTRIBUTION_FIELDS).first()
+    return row or NO_CONTRIBUTION
+
+
+def _apply(interpreter_id, status, payment, sign):
+    updates = {
+        'job_count': F('job_count') + sign,
+        'projected_earnings': F('projected_earnings') + sign * payment,
+    }
+    if status in STATUS_FIELDS:
+        updates[STATUS_FIELDS[status]] = F(STATUS_FIELDS[status]) + sign * payment
+    return InterpreterEarnings.objects.filter(interpreter_id=interpreter_id).update(**updates)
+
+
+def apply_job_change(old, new):
+    """
+    Move a job's contribution from ``old`` to ``new``.
+
+    Both are (interpreter_id, status, payment) tuples.
+    """
+    if old == new:
+        return
+
+    stale = []
+    if old[0] and not _apply(old[0], old[1], old[2], -1):
+        stale.append(old[0])
+    if new[0] and not _apply(new[0], new[1], new[2], +1):
+        stale.append(new[0])
+    if stale:
+        # No summary row yet; build one from the jobs as they are now
+        rebuild_earnings(stale)
+
+
+def add_job(job_id, interpreter_id, status):
+    """
+    Add a job that was assigned with QuerySet.update() to its interpreter's totals.
+
+    The payment is read by a subquery so this is a single UPDATE statement.
+    """
+    payment = Subquery(Job.objects.filter(id=job_id).values('payment')[:1])
+    updates = {
+        'job_count': F('job_count') + 1,
+        'projected_earnings': F('projected_earnings') + payment,
+    }
+    if status in STATUS_FIELDS:
+        updates[STATUS_FIELDS[status]] = F(STATUS_FIELDS[status]) + payment
+    if not InterpreterEarnings.objects.filter(interpreter_id=interpreter_id).update(**updates):
+        rebuild_earnings([interpreter_id])
+
+
+def job_saving(job, using):
+    """Remember what a job contributes before it is saved"""
+    stored = NO_CONTRIBUTION if job._state.adding else stored_contribution(job.pk, using)
+    setattr(job, STORED_ATTR, stored)
+
+
+def job_saved(job, using):
+    old = job.__dict__.pop(STORED_ATTR, NO_CONTRIBUTION)
+    new = job_contribution(job) or stored_contribution(job.pk, using)
+    apply_job_change(old, new)
+
+
+def job_deleting(job, using):
+    setattr(job, STORED_ATTR, stored_contribution(job.pk, using))
+
+
+def job_deleted(job):
+    # Nothing to subtract if another writer deleted the row first
+    apply_job_change(job.__dict__.pop(STORED_ATTR, NO_CONTRIBUTION), NO_CONTRIBUTION)
+
+
+def rebuild_earnings(interpreter_ids=None):
+    """
+    Recompute totals from the jobs table.
+
+    Rebuilds every interpreter when ``interpreter_ids`` is None. Returns the
+    number of summaries written.
+    """
+    interpreters = InterpreterProfile.objects.all()
+    if interpreter_ids is not None:
+        interpreters = interpreters.filter(id__in=interpreter_ids)
+
+    summaries = {pk: InterpreterEarnings(interpreter_id=pk) for pk in interpreters.values_list('id', flat=True)}
+    if not summaries:
+        return 0
+
+    jobs = Job.objects.filter(assigned_interpreter__in=interpreters)
+    rows = jobs.order_by().values('assigned_interpreter', 'status').annotate(count=Count('id'), total=Sum('payment'))
+    for row in rows:
+        summary = summaries[row['assigned_interpreter']]
+        summary.job_count += row['count']
+        summary.projected_earnings += row['total'] or 0
+        if row['status'] in STATUS_FIELDS:
+            field = STATUS_FIELDS[row['status']]
+            setattr(summary, field, getattr(summary, field) + (row['total'] or 0))
+
+    InterpreterEarnings.objects.bulk_create(
+        summaries.values(),
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['interpreter'],
+        update_fields=[*SUMMARY_FIELDS, 'updated_at'],
+    )
+    return len(summaries)
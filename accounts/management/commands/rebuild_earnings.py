@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from accounts.earnings import rebuild_earnings
+
+
+class Command(BaseCommand):
+    help = 'Recompute every interpreter\'s job count and earnings totals from their jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('interpreter_ids', nargs='*', type=int, help='Only rebuild these interpreters')
+
+    def handle(self, *args, **options):
+        count = rebuild_earnings(options['interpreter_ids'] or None)
+        self.stdout.write(f'Rebuilt earnings for {count} interpreter(s)')
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:33
+
+from django.db import migrations, models
+
+LANGUAGE_FIELDS = [
+    "amharic",
+    "farsi",
+    "mandarin",
+    "portuguese",
+    "russian",
+    "somali",
+    "spanish",
+    "tigrinya",
+    "vietnamese",
+]
+
+
+def backfill_language_mask(apps, schema_editor):
+    InterpreterProfile = apps.get_model("accounts", "InterpreterProfile")
+    db_alias = schema_editor.connection.alias
+    profiles = list(InterpreterProfile.objects.using(db_alias).only("id", *LANGUAGE_FIELDS))
+    for profile in profiles:
+        profile.language_mask = sum(
+            1 << bit
+            for bit, field in enumerate(LANGUAGE_FIELDS)
+            if getattr(profile, field)
+        )
+    InterpreterProfile.objects.using(db_alias).bulk_update(profiles, ["language_mask"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_interpreterprofile_dshs_certified"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interpreterprofile",
+            name="language_mask",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Bitmask of the language fields above",
+            ),
+        ),
+        migrations.RunPython(backfill_language_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_interpreterprofile_language_mask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interpreterprofile",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interpreterprofile",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="interpreterprofile",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="interpreter_coords_idx"
+            ),
+        ),
+    ]
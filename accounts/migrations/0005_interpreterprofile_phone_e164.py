@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:37
+
+import logging
+
+from django.db import migrations, models
+
+from accounts.phone import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_phone_e164(apps, schema_editor):
+    InterpreterProfile = apps.get_model("accounts", "InterpreterProfile")
+    db_alias = schema_editor.connection.alias
+    seen = {}
+    duplicates = []
+    profiles = []
+    for profile in InterpreterProfile.objects.using(db_alias).only("id", "phone_number").order_by("id"):
+        phone_e164 = normalize_phone(profile.phone_number)
+        if phone_e164 is None:
+            continue
+        # Leave later duplicates empty so the unique index can be created;
+        # they will need fixing by hand in the admin.
+        if phone_e164 in seen:
+            duplicates.append((profile.id, seen[phone_e164], phone_e164))
+            continue
+        seen[phone_e164] = profile.id
+        profile.phone_e164 = phone_e164
+        profiles.append(profile)
+    InterpreterProfile.objects.using(db_alias).bulk_update(profiles, ["phone_e164"], batch_size=500)
+
+    if duplicates:
+        logger.warning(
+            "%d interpreter profile(s) share a phone number with an earlier one and were left without "
+            "phone_e164; saving them will fail until their phone numbers are changed in the admin:\n%s",
+            len(duplicates),
+            "\n".join(
+                f"  profile {profile_id}: {phone_e164}, same as profile {first_id}"
+                for profile_id, first_id, phone_e164 in duplicates
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_interpreterprofile_latitude_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interpreterprofile",
+            name="phone_e164",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=16,
+                null=True,
+                verbose_name="Phone (E.164)",
+            ),
+        ),
+        migrations.RunPython(backfill_phone_e164, migrations.RunPython.noop),
+    ]
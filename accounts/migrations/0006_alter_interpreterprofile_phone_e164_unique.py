@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_interpreterprofile_phone_e164"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="interpreterprofile",
+            name="phone_e164",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=16,
+                null=True,
+                unique=True,
+                verbose_name="Phone (E.164)",
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_earnings(apps, schema_editor):
+    InterpreterProfile = apps.get_model("accounts", "InterpreterProfile")
+    InterpreterEarnings = apps.get_model("accounts", "InterpreterEarnings")
+    Job = apps.get_model("jobs", "Job")
+    db_alias = schema_editor.connection.alias
+
+    summaries = {
+        pk: InterpreterEarnings(interpreter_id=pk)
+        for pk in InterpreterProfile.objects.using(db_alias).values_list("id", flat=True)
+    }
+    rows = (
+        Job.objects.using(db_alias).filter(assigned_interpreter__isnull=False)
+        .order_by()
+        .values("assigned_interpreter", "status")
+        .annotate(count=Count("id"), total=Sum("payment"))
+    )
+    for row in rows:
+        summary = summaries[row["assigned_interpreter"]]
+        total = row["total"] or 0
+        summary.job_count += row["count"]
+        summary.projected_earnings += total
+        field = f"{row['status']}_earnings"
+        if hasattr(summary, field):
+            setattr(summary, field, getattr(summary, field) + total)
+    InterpreterEarnings.objects.using(db_alias).bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_alter_interpreterprofile_phone_e164_unique"),
+        ("jobs", "0010_job_latitude_job_longitude_job_job_coords_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InterpreterEarnings",
+            fields=[
+                (
+                    "interpreter",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="earnings",
+                        serialize=False,
+                        to="accounts.interpreterprofile",
+                    ),
+                ),
+                ("job_count", models.PositiveIntegerField(default=0)),
+                (
+                    "projected_earnings",
+                    models.IntegerField(
+                        default=0, help_text="Total payment of all assigned jobs"
+                    ),
+                ),
+                ("unassigned_earnings", models.IntegerField(default=0)),
+                ("assigned_earnings", models.IntegerField(default=0)),
+                ("in_progress_earnings", models.IntegerField(default=0)),
+                ("completed_earnings", models.IntegerField(default=0)),
+                ("cancelled_earnings", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Interpreter Earnings",
+                "verbose_name_plural": "Interpreter Earnings",
+            },
+        ),
+        migrations.RunPython(backfill_earnings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_interpreterearnings"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="interpreterprofile",
+            index=models.Index(
+                fields=["last_name", "first_name"], name="interpreter_name_idx"
+            ),
+        ),
+    ]
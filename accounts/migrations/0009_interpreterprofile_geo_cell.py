@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:20
+
+from django.db import migrations, models
+
+from jobs.geo import grid_cell
+
+
+def backfill_geo_cell(apps, schema_editor):
+    InterpreterProfile = apps.get_model("accounts", "InterpreterProfile")
+    db_alias = schema_editor.connection.alias
+    profiles = []
+    located = InterpreterProfile.objects.using(db_alias).filter(latitude__isnull=False, longitude__isnull=False)
+    for profile in located.only("id", "latitude", "longitude").iterator(chunk_size=2000):
+        profile.geo_cell = grid_cell(profile.latitude, profile.longitude)
+        profiles.append(profile)
+    InterpreterProfile.objects.using(db_alias).bulk_update(profiles, ["geo_cell"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="interpreterprofile",
+            name="interpreter_coords_idx",
+        ),
+        migrations.AddField(
+            model_name="interpreterprofile",
+            name="geo_cell",
+            field=models.PositiveIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Grid cell of the coordinates (see jobs.geo)",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interpreterprofile",
+            index=models.Index(
+                fields=["geo_cell", "latitude", "longitude"],
+                name="interpreter_geo_cell_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_geo_cell, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,33 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, router
+from jobs.geo import refresh_location, remember_location
+from jobs.languages import LANGUAGE_FIELDS, compute_language_mask, overlapping_masks
+from .phone import normalize_phone
+
+
+class InterpreterProfileQuerySet(models.QuerySet):
+    def with_phone_numbers(self, phone_numbers):
+        """Interpreters matching any of the numbers, however they were formatted"""
+        normalized = {normalize_phone(number) for number in phone_numbers} - {None}
+        return self.filter(phone_e164__in=normalized)
+
+    def speaking_any(self, job_or_mask):
+        """Interpreters who speak at least one of the job's languages"""
+        mask = getattr(job_or_mask, 'language_mask', job_or_mask)
+        if not mask:
+            return self.none()
+        return self.filter(language_mask__in=overlapping_masks(mask))
+
+    def free_for(self, job):
+        """Interpreters without another active assignment overlapping the job"""
+        from jobs.models import Job
+
+        # An uncorrelated NOT IN is evaluated once (a hashed anti-join), where
+        # NOT EXISTS would probe the schedule index once per interpreter
+        busy = Job.objects.overlapping(job.date, job.time, job.end_time).filter(
+            assigned_interpreter__isnull=False,
+        ).exclude(pk=job.pk).values('assigned_interpreter')
+        return self.exclude(id__in=busy)
 
 
 class InterpreterProfile(models.Model):
@@ -6,6 +35,7 @@ class InterpreterProfile(models.Model):
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     phone_number = models.CharField(max_length=20)
+    phone_e164 = models.CharField(max_length=16, unique=True, null=True, blank=True, editable=False, verbose_name="Phone (E.164)")
     email_address = models.EmailField()
 
     # Address Information
@@ -13,6 +43,9 @@ class InterpreterProfile(models.Model):
     city = models.CharField(max_length=100)
     state = models.CharField(max_length=2, help_text="Two-letter state code (e.g., WA)")
     zip_code = models.CharField(max_length=10)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Grid cell of the coordinates (see jobs.geo)")
 
     # Certification
     dshs_certified = models.BooleanField(default=False, verbose_name="DSHS Certified", help_text="Is this interpreter DSHS certified?")
@@ -27,17 +60,66 @@ class InterpreterProfile(models.Model):
     spanish = models.BooleanField(default=False, verbose_name="Spanish")
     tigrinya = models.BooleanField(default=False, verbose_name="Tigrinya")
     vietnamese = models.BooleanField(default=False, verbose_name="Vietnamese")
+    language_mask = models.PositiveIntegerField(default=0, db_index=True, editable=False, help_text="Bitmask of the language fields above")
 
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = InterpreterProfileQuerySet.as_manager()
+
     class Meta:
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['last_name', 'first_name'], name='interpreter_name_idx'),
+            models.Index(fields=['geo_cell', 'latitude', 'longitude'], name='interpreter_geo_cell_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def clean(self):
+        super().clean()
+        self.check_phone_unique(normalize_phone(self.phone_number))
+
+    def check_phone_unique(self, phone_e164, using=None):
+        """Raise ValidationError if another interpreter has ``phone_e164``"""
+        if not phone_e164:
+            return
+        others = InterpreterProfile.objects.using(using).filter(phone_e164=phone_e164).exclude(pk=self.pk)
+        other = others.order_by().values_list('pk', flat=True).first()
+        if other is not None:
+            raise ValidationError({
+                'phone_number': f'Another interpreter (#{other}) already has the phone number {phone_e164}.'
+            })
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        remember_location(instance)
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.language_mask = compute_language_mask(self)
+        self.phone_e164 = normalize_phone(self.phone_number)
+        update_fields = kwargs.get('update_fields')
+        location_fields = refresh_location(self, update_fields)
+        if update_fields is None or 'phone_number' in update_fields:
+            # Fail with the reason rather than an IntegrityError from the unique index
+            self.check_phone_unique(self.phone_e164, kwargs.get('using') or router.db_for_write(InterpreterProfile))
+        if update_fields is not None:
+            update_fields = set(update_fields) | location_fields
+            if update_fields & set(LANGUAGE_FIELDS):
+                update_fields.add('language_mask')
+            if 'phone_number' in update_fields:
+                update_fields.add('phone_e164')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        remember_location(self, update_fields)
+
+    def get_full_address(self):
+        return f"{self.street_address}, {self.city}, {self.state} {self.zip_code}"
+
     def get_languages(self):
         """Return a list of languages this interpreter speaks"""
         languages = []
@@ -60,3 +142,40 @@ class InterpreterProfile(models.Model):
         if self.vietnamese:
             languages.append('Vietnamese')
         return languages
+
+
+class InterpreterEarnings(models.Model):
+    """
+    Running totals of the jobs assigned to an interpreter.
+
+    Kept current from Job saves and deletes by accounts.earnings, so pages
+    can read an interpreter's totals without loading their jobs. Rebuild
+    with `manage.py rebuild_earnings`.
+    """
+    interpreter = models.OneToOneField(InterpreterProfile, on_delete=models.CASCADE, primary_key=True, related_name='earnings')
+    job_count = models.PositiveIntegerField(default=0)
+    projected_earnings = models.IntegerField(default=0, help_text="Total payment of all assigned jobs")
+
+    # Earnings by job status
+    unassigned_earnings = models.IntegerField(default=0)
+    assigned_earnings = models.IntegerField(default=0)
+    in_progress_earnings = models.IntegerField(default=0)
+    completed_earnings = models.IntegerField(default=0)
+    cancelled_earnings = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Interpreter Earnings"
+        verbose_name_plural = "Interpreter Earnings"
+
+    def __str__(self):
+        return f"Earnings for {self.interpreter_id}"
+
+    @classmethod
+    def for_interpreter(cls, interpreter):
+        """Return the interpreter's totals, or zeroed totals if none are stored yet"""
+        try:
+            return interpreter.earnings
+        except cls.DoesNotExist:
+            return cls(interpreter=interpreter)
@@ -0,0 +1,40 @@
+"""
+Phone number normalization.
+
+Numbers are typed into the admin in whatever format the dispatcher likes
+("(206) 555-0100", "206.555.0100", "+1 206 555 0100", ...). They are
+normalized to E.164 so they can be matched exactly against an index.
+"""
+import re
+
+DEFAULT_COUNTRY_CODE = '1'
+
+NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(raw, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Return ``raw`` in E.164 form (e.g. ``+12065550100``), or None if it
+    can't be a valid number.
+
+    Numbers without a leading ``+`` are assumed to be North American.
+    """
+    if not raw:
+        return None
+    raw = raw.strip()
+    digits = NON_DIGITS.sub('', raw)
+
+    if raw.startswith('+'):
+        pass
+    elif raw.startswith('00'):
+        # International dialing prefix
+        digits = digits[2:]
+    elif len(digits) == 10:
+        digits = country_code + digits
+    elif not (len(digits) == 11 and digits.startswith(country_code)):
+        return None
+
+    # E.164 allows at most 15 digits
+    if not 8 <= len(digits) <= 15:
+        return None
+    return '+' + digits
@@ -1,12 +1,17 @@
 from rest_framework import serializers
-from .models import InterpreterProfile
-from jobs.serializers import JobSerializer
+from .models import InterpreterEarnings, InterpreterProfile
+from jobs.serializers import job_rows, serialize_job_rows
+
+# Default and maximum number of nested jobs in an interpreter payload
+JOBS_LIMIT_DEFAULT = 50
+JOBS_LIMIT_MAX = 200
 
 
 class InterpreterProfileSerializer(serializers.ModelSerializer):
     languages = serializers.SerializerMethodField()
     full_name = serializers.SerializerMethodField()
-    assigned_jobs = JobSerializer(source='jobs', many=True, read_only=True)
+    assigned_jobs = serializers.SerializerMethodField()
+    has_more_jobs = serializers.SerializerMethodField()
     job_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -25,6 +30,7 @@ class InterpreterProfileSerializer(serializers.ModelSerializer):
             'dshs_certified',
             'languages',
             'assigned_jobs',
+            'has_more_jobs',
             'job_count',
             'created_at',
             'updated_at',
@@ -37,5 +43,31 @@ class InterpreterProfileSerializer(serializers.ModelSerializer):
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}"
 
+    def _jobs_window(self, obj):
+        """
+        The interpreter's newest jobs as rows, at most ``jobs_limit`` of them
+        (and only on or after ``jobs_since`` if given).
+
+        One extra row is fetched, and kept in ``windowed_jobs``, so we can tell
+        whether there are more without a COUNT.
+        """
+        limit = self.context.get('jobs_limit', JOBS_LIMIT_DEFAULT)
+        jobs = getattr(obj, 'windowed_jobs', None)
+        if jobs is None:
+            queryset = obj.jobs.order_by('-date', '-time', '-id')
+            since = self.context.get('jobs_since')
+            if since is not None:
+                queryset = queryset.filter(date__gte=since)
+            jobs = obj.windowed_jobs = list(job_rows(queryset)[:limit + 1])
+        return jobs[:limit], len(jobs) > limit
+
+    def get_assigned_jobs(self, obj):
+        jobs, _ = self._jobs_window(obj)
+        return serialize_job_rows(jobs)
+
+    def get_has_more_jobs(self, obj):
+        _, has_more = self._jobs_window(obj)
+        return has_more
+
     def get_job_count(self, obj):
-        return obj.jobs.count()
+        return InterpreterEarnings.for_interpreter(obj).job_count
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from jobs.models import Job
+from . import earnings
+from .models import InterpreterEarnings, InterpreterProfile
+
+
+@receiver(pre_save, sender=Job)
+def remember_stored_earnings(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    earnings.job_saving(instance, using)
+
+
+@receiver(post_save, sender=Job)
+def update_earnings_on_save(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    earnings.job_saved(instance, using)
+
+
+@receiver(pre_delete, sender=Job)
+def remember_deleted_earnings(sender, instance, using=None, **kwargs):
+    earnings.job_deleting(instance, using)
+
+
+@receiver(post_delete, sender=Job)
+def update_earnings_on_delete(sender, instance, **kwargs):
+    earnings.job_deleted(instance)
+
+
+@receiver(post_save, sender=InterpreterProfile)
+def create_earnings_summary(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        InterpreterEarnings.objects.get_or_create(interpreter=instance)
@@ -0,0 +1,686 @@
+import base64
+import datetime
+import json
+import tempfile
+import threading
+from importlib import import_module
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import Q
+from django.test import AsyncRequestFactory, Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from jobs import assignment, board_cache
+from jobs.languages import LANGUAGE_FIELDS
+from jobs.models import Job
+from laango.factories import make_interpreter, make_job
+from laango.replica import PIN_COOKIE, REPLICA_DB_ALIAS
+from . import async_views
+from .admin import InterpreterProfileAdmin
+from .earnings import SUMMARY_FIELDS, rebuild_earnings
+from .models import InterpreterEarnings, InterpreterProfile
+from .phone import normalize_phone
+from .views import get_page_size
+
+
+class PhoneNumberTests(TestCase):
+    def test_normalize_phone(self):
+        cases = {
+            '(206) 555-0100': '+12065550100',
+            '206.555.0100': '+12065550100',
+            ' 1-206-555-0100 ': '+12065550100',
+            '+1 206 555 0100': '+12065550100',
+            '+44 20 7946 0958': '+442079460958',
+            '0044 20 7946 0958': '+442079460958',
+            '555-0100': None,
+            '2206555010': '+12206555010',
+            '22065550100': None,
+            '+1234567': None,
+            '+1234567890123456': None,
+            '': None,
+            None: None,
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(normalize_phone(raw), expected)
+
+    def test_with_phone_numbers_is_one_query(self):
+        first = make_interpreter(1, phone_number='(206) 555-0001')
+        second = make_interpreter(2, phone_number='206.555.0002')
+        make_interpreter(3)
+        with self.assertNumQueries(1):
+            found = set(InterpreterProfile.objects.with_phone_numbers(['+12065550001', '1 206 555 0002', 'junk']))
+        self.assertEqual(found, {first, second})
+
+    def test_duplicate_phone_fails_with_validation_error(self):
+        first = make_interpreter(1)
+        with self.assertRaisesMessage(ValidationError, f'#{first.pk}'):
+            make_interpreter(2, phone_number='(206) 555-0001')
+
+        # Left without phone_e164 by the backfill migration
+        duplicate = make_interpreter(2)
+        InterpreterProfile.objects.filter(pk=duplicate.pk).update(phone_number='206-555-0001', phone_e164=None)
+        duplicate.refresh_from_db()
+        duplicate.save(update_fields=['dshs_certified'])
+        with self.assertRaises(ValidationError):
+            duplicate.save()
+
+    def test_backfill_migration_reports_duplicates(self):
+        first = make_interpreter(1)
+        duplicate = make_interpreter(2)
+        InterpreterProfile.objects.filter(pk=duplicate.pk).update(phone_number='206-555-0001')
+        InterpreterProfile.objects.update(phone_e164=None)
+
+        migration = import_module('accounts.migrations.0005_interpreterprofile_phone_e164')
+        with self.assertLogs(migration.__name__, 'WARNING') as logs:
+            migration.backfill_phone_e164(apps, SimpleNamespace(connection=connection))
+
+        self.assertIn(f'profile {duplicate.pk}: +12065550001, same as profile {first.pk}', logs.output[0])
+        self.assertEqual(
+            dict(InterpreterProfile.objects.values_list('pk', 'phone_e164')),
+            {first.pk: '+12065550001', duplicate.pk: None},
+        )
+
+
+def any_language_of(obj):
+    """The boolean OR that language masks replaced, or None for no languages"""
+    query = None
+    for language in LANGUAGE_FIELDS:
+        if getattr(obj, language):
+            query = Q(**{language: True}) if query is None else query | Q(**{language: True})
+    return query
+
+
+class LanguageMaskTests(TestCase):
+    COMBINATIONS = [
+        [],
+        ['spanish'],
+        ['somali'],
+        ['vietnamese'],
+        ['amharic', 'tigrinya'],
+        ['spanish', 'somali', 'russian'],
+        LANGUAGE_FIELDS,
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreters = []
+        cls.jobs = []
+        for index, languages in enumerate(cls.COMBINATIONS):
+            fields = {language: language in languages for language in LANGUAGE_FIELDS}
+            cls.interpreters.append(make_interpreter(index, **fields))
+            cls.jobs.append(make_job(time=datetime.time(index, 0), **fields))
+
+    def expected(self, queryset, obj):
+        query = any_language_of(obj)
+        return set(queryset.filter(query)) if query else set()
+
+    def test_speaking_any_matches_boolean_or(self):
+        for job in self.jobs:
+            with self.subTest(job=job.pk):
+                self.assertEqual(
+                    set(InterpreterProfile.objects.speaking_any(job)),
+                    self.expected(InterpreterProfile.objects, job),
+                )
+
+    def test_needing_any_matches_boolean_or(self):
+        for interpreter in self.interpreters:
+            with self.subTest(interpreter=interpreter.pk):
+                self.assertEqual(set(Job.objects.needing_any(interpreter)), self.expected(Job.objects, interpreter))
+
+    def test_mask_follows_partial_saves(self):
+        interpreter = self.interpreters[1]
+        interpreter.somali = True
+        interpreter.save(update_fields=['somali'])
+        interpreter.refresh_from_db()
+        self.assertIn(self.jobs[2], Job.objects.needing_any(interpreter))
+        self.assertIn(interpreter, InterpreterProfile.objects.speaking_any(self.jobs[2]))
+
+    def test_backfill_migrations(self):
+        InterpreterProfile.objects.update(language_mask=0)
+        Job.objects.update(language_mask=0)
+        schema_editor = SimpleNamespace(connection=connection)
+        import_module('accounts.migrations.0003_interpreterprofile_language_mask').backfill_language_mask(apps, schema_editor)
+        import_module('jobs.migrations.0009_job_language_mask').backfill_language_mask(apps, schema_editor)
+        for job in Job.objects.all():
+            self.assertEqual(
+                set(InterpreterProfile.objects.speaking_any(job)),
+                self.expected(InterpreterProfile.objects, job),
+            )
+
+
+class InterpreterProfileChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.interpreters = [make_interpreter(i) for i in range(30)]
+        for i, interpreter in enumerate(cls.interpreters):
+            for payment in range(i % 4):
+                make_job(assigned_interpreter=interpreter, payment=100 + payment, status='assigned')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('admin:accounts_interpreterprofile_changelist')
+
+    def count_changelist_queries(self, per_page, **params):
+        original = InterpreterProfileAdmin.list_per_page
+        InterpreterProfileAdmin.list_per_page = per_page
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, params)
+        finally:
+            InterpreterProfileAdmin.list_per_page = original
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_constant_across_page_sizes(self):
+        self.assertEqual(self.count_changelist_queries(5), self.count_changelist_queries(30))
+
+    def test_job_count_and_earnings_columns(self):
+        response = self.client.get(self.url)
+        interpreter = self.interpreters[3]
+        row = next(r for r in response.context['cl'].result_list if r.pk == interpreter.pk)
+        self.assertEqual(row.job_total, 3)
+        self.assertEqual(row.earnings_total, 100 + 101 + 102)
+        self.assertContains(response, '$303.00')
+
+    def test_columns_are_sortable(self):
+        list_display = InterpreterProfileAdmin.list_display
+        for column in ('job_count', 'projected_earnings_display'):
+            with self.subTest(column=column):
+                # The changelist prepends the action checkbox column
+                index = list_display.index(column) + 1
+                response = self.client.get(self.url, {'o': f'-{index}'})
+                result = list(response.context['cl'].result_list)
+                totals = [getattr(r, 'job_total' if column == 'job_count' else 'earnings_total') for r in result]
+                self.assertEqual(totals, sorted(totals, reverse=True))
+
+
+class EarningsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = make_interpreter(1)
+        cls.second = make_interpreter(2)
+
+    def totals(self, interpreter):
+        return InterpreterEarnings.objects.values(*SUMMARY_FIELDS).get(interpreter=interpreter)
+
+    def assertTotalsMatchJobs(self):
+        maintained = {i.pk: self.totals(i) for i in (self.first, self.second)}
+        rebuild_earnings()
+        self.assertEqual({i.pk: self.totals(i) for i in (self.first, self.second)}, maintained)
+
+    def test_reassignment_moves_the_contribution(self):
+        job = make_job(assigned_interpreter=self.first, status='assigned', payment=100)
+        job.assigned_interpreter = self.second
+        job.save()
+        self.assertEqual(self.totals(self.first)['job_count'], 0)
+        self.assertEqual(self.totals(self.second)['assigned_earnings'], 100)
+        self.assertTotalsMatchJobs()
+
+    def test_status_and_payment_changes(self):
+        job = make_job(assigned_interpreter=self.first, status='assigned', payment=100)
+        job.status = 'completed'
+        job.save()
+        job.payment = 250
+        job.save(update_fields=['payment'])
+        totals = self.totals(self.first)
+        self.assertEqual(totals['assigned_earnings'], 0)
+        self.assertEqual(totals['completed_earnings'], 250)
+        self.assertEqual(totals['projected_earnings'], 250)
+        self.assertTotalsMatchJobs()
+
+    def test_delete_subtracts_the_contribution(self):
+        make_job(assigned_interpreter=self.first, status='assigned', payment=100)
+        make_job(assigned_interpreter=self.first, status='assigned', payment=40).delete()
+        self.assertEqual(self.totals(self.first)['job_count'], 1)
+        self.assertEqual(self.totals(self.first)['projected_earnings'], 100)
+        self.assertTotalsMatchJobs()
+
+    def test_stale_instances_use_the_stored_row(self):
+        job = make_job(assigned_interpreter=self.first, status='assigned', payment=100)
+        stale = Job.objects.get(pk=job.pk)
+        job.assigned_interpreter = self.second
+        job.save()
+
+        stale.payment = 120
+        stale.save()
+        self.assertEqual(self.totals(self.first)['job_count'], 1)
+        self.assertEqual(self.totals(self.second)['job_count'], 0)
+        self.assertTotalsMatchJobs()
+
+        stale_copy = Job.objects.get(pk=job.pk)
+        job.delete()
+        stale_copy.delete()
+        self.assertEqual(self.totals(self.first)['job_count'], 0)
+        self.assertTotalsMatchJobs()
+
+    def test_rebuild_reconciles_drifted_totals(self):
+        make_job(assigned_interpreter=self.first, status='completed', payment=80)
+        InterpreterEarnings.objects.filter(interpreter=self.first).update(job_count=5, completed_earnings=0)
+        InterpreterEarnings.objects.filter(interpreter=self.second).delete()
+
+        self.assertEqual(rebuild_earnings(), 2)
+        totals = self.totals(self.first)
+        self.assertEqual((totals['job_count'], totals['completed_earnings']), (1, 80))
+        self.assertEqual(self.totals(self.second)['job_count'], 0)
+
+
+class AcceptJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreter = make_interpreter(1, spanish=True)
+        cls.other = make_interpreter(2, spanish=True)
+
+    def accept_url(self, interpreter, job):
+        return reverse('accounts:accept-job-api', args=[interpreter.id, job.id])
+
+    def test_accept_assigns_open_job(self):
+        job = make_job(payment=150)
+        response = self.client.post(self.accept_url(self.interpreter, job))
+        self.assertEqual(response.status_code, 200)
+        job.refresh_from_db()
+        self.assertEqual(job.assigned_interpreter, self.interpreter)
+        self.assertEqual(job.status, 'assigned')
+        self.interpreter.earnings.refresh_from_db()
+        self.assertEqual(self.interpreter.earnings.job_count, 1)
+        self.assertEqual(self.interpreter.earnings.assigned_earnings, 150)
+
+    def test_second_accept_gets_conflict(self):
+        job = make_job()
+        self.client.post(self.accept_url(self.interpreter, job))
+        response = self.client.post(self.accept_url(self.other, job))
+        self.assertEqual(response.status_code, 409)
+        job.refresh_from_db()
+        self.assertEqual(job.assigned_interpreter, self.interpreter)
+
+    def test_language_mismatch_is_rejected(self):
+        job = make_job(spanish=False, somali=True)
+        response = self.client.post(self.accept_url(self.interpreter, job))
+        self.assertEqual(response.status_code, 403)
+        job.refresh_from_db()
+        self.assertIsNone(job.assigned_interpreter)
+
+    def test_dshs_job_requires_certification(self):
+        job = make_job(requires_dshs_certification=True)
+        response = self.client.post(self.accept_url(self.interpreter, job))
+        self.assertEqual(response.status_code, 403)
+
+        certified = make_interpreter(3, spanish=True, dshs_certified=True)
+        response = self.client.post(self.accept_url(certified, job))
+        self.assertEqual(response.status_code, 200)
+
+    def test_overlapping_accept_is_conflict(self):
+        make_job(assigned_interpreter=self.interpreter, status='assigned', time=datetime.time(9, 0))
+        overlapping = make_job(time=datetime.time(9, 30))
+        response = self.client.post(self.accept_url(self.interpreter, overlapping))
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('overlaps', response.json()['error'])
+
+        back_to_back = make_job(time=datetime.time(10, 0))
+        self.assertEqual(self.client.post(self.accept_url(self.interpreter, back_to_back)).status_code, 200)
+
+    def test_missing_job_is_not_found(self):
+        response = self.client.post(reverse('accounts:accept-job-api', args=[self.interpreter.id, 999999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class JobPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreter = make_interpreter(1)
+        # Same date and time throughout, so only the id orders them
+        cls.jobs = [make_job(assigned_interpreter=cls.interpreter, status='completed') for _ in range(7)]
+
+    def setUp(self):
+        self.url = reverse('accounts:interpreter-jobs-api', args=[self.interpreter.id])
+
+    def test_walk_is_stable_across_identical_date_and_time(self):
+        seen = []
+        params = {'page_size': 3}
+        while True:
+            data = self.client.get(self.url, params).json()
+            seen.extend(job['id'] for job in data['jobs'])
+            if not data['next_cursor']:
+                break
+            params['cursor'] = data['next_cursor']
+        self.assertEqual(seen, sorted((job.id for job in self.jobs), reverse=True))
+
+    def test_invalid_cursor_is_bad_request(self):
+        tampered = base64.urlsafe_b64encode(b'2026-01-01|not-a-time|1').decode()
+        page_url = reverse('accounts:interpreter-jobs-page', args=[self.interpreter.id])
+        for cursor in ['garbage!', tampered]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.json())
+                self.assertEqual(self.client.get(page_url, {'cursor': cursor}).status_code, 400)
+
+    async def test_invalid_cursor_is_bad_request_on_async_view(self):
+        request = AsyncRequestFactory().get(self.url, {'cursor': 'garbage!'})
+        response = await async_views.interpreter_jobs(request, interpreter_id=self.interpreter.id)
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(get_page_size('1000'), 100)
+        self.assertEqual(get_page_size('0'), 1)
+        self.assertEqual(get_page_size('many'), get_page_size(None))
+        self.assertEqual(len(self.client.get(self.url, {'page_size': 0}).json()['jobs']), 1)
+
+    def test_page_links_keep_page_size(self):
+        page_url = reverse('accounts:interpreter-jobs-page', args=[self.interpreter.id])
+        response = self.client.get(page_url, {'page_size': 3})
+        self.assertContains(response, '?page_size=3&amp;cursor=')
+        older = self.client.get(page_url, {'page_size': 3, 'cursor': response.context['next_cursor']})
+        self.assertEqual(len(older.context['jobs']), 3)
+        self.assertContains(older, f'{page_url}?page_size=3"')
+
+
+class InterpreterDetailJobsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreter = make_interpreter(1)
+        cls.today = timezone.localdate()
+        cls.jobs = [
+            make_job(assigned_interpreter=cls.interpreter, status='completed', date=cls.today - datetime.timedelta(days=days))
+            for days in range(5)
+        ]
+        make_job(assigned_interpreter=make_interpreter(2), status='completed')
+
+    def setUp(self):
+        self.url = reverse('accounts:interpreter-detail', args=[self.interpreter.id])
+
+    def job_ids(self, data):
+        return [job['id'] for job in data['assigned_jobs']]
+
+    def test_newest_jobs_first(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(self.job_ids(data), [job.id for job in self.jobs])
+        self.assertFalse(data['has_more_jobs'])
+        self.assertEqual(data['job_count'], 5)
+
+    def test_jobs_limit(self):
+        data = self.client.get(self.url, {'jobs_limit': 2}).json()
+        self.assertEqual(self.job_ids(data), [job.id for job in self.jobs[:2]])
+        self.assertTrue(data['has_more_jobs'])
+        self.assertEqual(data['job_count'], 5)
+
+        data = self.client.get(self.url, {'jobs_limit': 0}).json()
+        self.assertEqual((data['assigned_jobs'], data['has_more_jobs']), ([], True))
+        self.assertEqual(len(self.client.get(self.url, {'jobs_limit': 100000}).json()['assigned_jobs']), 5)
+
+    def test_jobs_since(self):
+        since = self.today - datetime.timedelta(days=2)
+        data = self.client.get(self.url, {'jobs_since': since.isoformat()}).json()
+        self.assertEqual(self.job_ids(data), [job.id for job in self.jobs[:3]])
+        self.assertFalse(data['has_more_jobs'])
+
+        data = self.client.get(self.url, {'jobs_since': since.isoformat(), 'jobs_limit': 2}).json()
+        self.assertEqual(self.job_ids(data), [job.id for job in self.jobs[:2]])
+        self.assertTrue(data['has_more_jobs'])
+
+    def test_bad_parameters(self):
+        for params in [{'jobs_limit': 'ten'}, {'jobs_limit': -1}, {'jobs_since': '2026-13-01'}, {'jobs_since': 'today'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), list(params))
+
+    def test_jobs_fetched_once(self):
+        # The validators, the profile with its earnings, and the window of jobs
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {'jobs_limit': 2})
+
+
+class InterpreterJobsConditionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreter = make_interpreter(1)
+        cls.other = make_interpreter(2)
+        cls.older = make_job(assigned_interpreter=cls.interpreter, status='assigned')
+        cls.newer = make_job(assigned_interpreter=cls.interpreter, status='assigned', time=datetime.time(11, 0))
+
+    def setUp(self):
+        self.url = reverse('accounts:interpreter-jobs-api', args=[self.interpreter.id])
+
+    def fetch(self, url=None):
+        """The response, and an If-Modified-Since header as of when it was fetched"""
+        headers = {'If-Modified-Since': http_date(timezone.now().timestamp())}
+        return self.client.get(url or self.url), headers
+
+    def test_etag_only(self):
+        response, _ = self.fetch()
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': response['ETag']}).status_code, 304)
+
+    def test_deleted_job_is_not_stale(self):
+        response, since = self.fetch()
+        self.newer.delete()
+        fresh = self.client.get(self.url, headers=since)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual([job['id'] for job in fresh.json()['jobs']], [self.older.id])
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': response['ETag']}).status_code, 200)
+
+    def test_reassigned_job_is_not_stale(self):
+        page_url = reverse('accounts:interpreter-jobs-page', args=[self.interpreter.id])
+        response, since = self.fetch()
+        page, _ = self.fetch(page_url)
+        self.newer.assigned_interpreter = self.other
+        self.newer.save()
+
+        fresh = self.client.get(self.url, headers=since)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual([job['id'] for job in fresh.json()['jobs']], [self.older.id])
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': response['ETag']}).status_code, 200)
+        self.assertEqual(self.client.get(page_url, headers=since).status_code, 200)
+        self.assertEqual(self.client.get(page_url, headers={'If-None-Match': page['ETag']}).status_code, 200)
+
+
+class AvailableJobsConditionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreter = make_interpreter(1)
+        cls.job = make_job()
+
+    def setUp(self):
+        board_cache.get_cache().clear()
+        self.url = reverse('accounts:available-jobs-api', args=[self.interpreter.id])
+
+    def test_matching_etag_gets_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['total_available'], 1)
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+        page_url = reverse('accounts:available-jobs-page', args=[self.interpreter.id])
+        page = self.client.get(page_url)
+        self.assertEqual(self.client.get(page_url, headers={'If-None-Match': page['ETag']}).status_code, 304)
+
+    def test_etag_follows_the_cached_body(self):
+        first = self.client.get(self.url)
+        # Assign without signals, leaving the cached board stale
+        Job.objects.filter(id=self.job.id).update(status='assigned', updated_at=timezone.now())
+
+        stale = self.client.get(self.url)
+        self.assertEqual(stale.json()['total_available'], 1)
+        self.assertEqual(stale['ETag'], first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            board_cache.invalidate(self.job.language_mask, False)
+        fresh = self.client.get(self.url, headers={'If-None-Match': stale['ETag']})
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.json()['total_available'], 0)
+
+
+class AsyncViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreter = make_interpreter(1, spanish=True)
+        cls.other = make_interpreter(2, spanish=True)
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        for i in range(5):
+            make_job(assigned_interpreter=cls.interpreter, payment=100 + i, status='assigned', time=datetime.time(9 + i))
+        cls.open_jobs = [make_job(date=tomorrow, time=datetime.time(9 + i)) for i in range(3)]
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    async def test_interpreter_jobs_match_sync_view(self):
+        url = reverse('accounts:interpreter-jobs-api', args=[self.interpreter.id])
+        expected = (await self.async_client.get(url, {'page_size': 2})).json()
+        response = await async_views.interpreter_jobs(
+            self.factory.get(url, {'page_size': 2}), interpreter_id=self.interpreter.id
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), expected)
+
+        not_modified = await async_views.interpreter_jobs(
+            self.factory.get(url, {'page_size': 2}, headers={'If-None-Match': response['ETag']}),
+            interpreter_id=self.interpreter.id,
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    async def test_available_jobs_match_sync_view(self):
+        url = reverse('accounts:available-jobs-api', args=[self.other.id])
+        expected = (await self.async_client.get(url)).json()
+        response = await async_views.available_jobs(self.factory.get(url), interpreter_id=self.other.id)
+        self.assertEqual(json.loads(response.content), expected)
+        self.assertEqual(expected['total_available'], 3)
+
+    async def test_unknown_interpreter_is_not_found(self):
+        for view in (async_views.interpreter_jobs, async_views.available_jobs):
+            with self.subTest(view=view.__name__):
+                response = await view(self.factory.get('/'), interpreter_id=999999)
+                self.assertEqual(response.status_code, 404)
+
+    async def test_accept(self):
+        job = self.open_jobs[0]
+        response = await async_views.accept(self.factory.post('/'), interpreter_id=self.other.id, job_id=job.id)
+        self.assertEqual(response.status_code, 200)
+        response = await async_views.accept(self.factory.post('/'), interpreter_id=self.interpreter.id, job_id=job.id)
+        self.assertEqual(response.status_code, 409)
+        await job.arefresh_from_db()
+        self.assertEqual(job.assigned_interpreter_id, self.other.id)
+
+        response = await async_views.accept(self.factory.get('/'), interpreter_id=self.other.id, job_id=job.id)
+        self.assertEqual(response.status_code, 405)
+
+
+class ConcurrentAcceptJobTests(TransactionTestCase):
+    threads = 20
+
+    def test_exactly_one_interpreter_wins(self):
+        interpreters = [make_interpreter(i, spanish=True) for i in range(self.threads)]
+        job = make_job(payment=120)
+        barrier = threading.Barrier(self.threads)
+        outcomes = []
+
+        def accept(interpreter):
+            try:
+                barrier.wait()
+                outcomes.append(assignment.accept_job(job.id, interpreter))
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=accept, args=(interpreter,)) for interpreter in interpreters]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(len(outcomes), self.threads)
+        self.assertEqual(outcomes.count(assignment.ACCEPTED), 1)
+        self.assertEqual(outcomes.count(assignment.TAKEN), self.threads - 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'assigned')
+        self.assertIsNotNone(job.assigned_interpreter_id)
+        self.assertEqual(
+            InterpreterEarnings.objects.filter(job_count=1).values_list('interpreter_id', flat=True).get(),
+            job.assigned_interpreter_id,
+        )
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    A second SQLite file stands in for the replica. Nothing replicates
+    between the two, so each test can see which database a read used.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        # Replaces the test mirror of the primary if REPLICA_DATABASE_URL is set
+        cls.saved_settings = connections.settings.get(REPLICA_DB_ALIAS)
+        if cls.saved_settings is not None:
+            connections[REPLICA_DB_ALIAS].close()
+            del connections[REPLICA_DB_ALIAS]
+        connections.settings[REPLICA_DB_ALIAS] = connections.configure_settings({
+            'default': connections.settings['default'],
+            REPLICA_DB_ALIAS: {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': str(Path(cls.replica_dir.name) / 'replica.sqlite3'),
+            },
+        })[REPLICA_DB_ALIAS]
+        call_command('migrate', database=REPLICA_DB_ALIAS, verbosity=0)
+        # Set here rather than on the class: the test runner sets up every
+        # alias named in `databases` before this alias exists
+        cls.databases = {'default', REPLICA_DB_ALIAS}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_DB_ALIAS].close()
+        del connections[REPLICA_DB_ALIAS]
+        if cls.saved_settings is None:
+            del connections.settings[REPLICA_DB_ALIAS]
+        else:
+            connections.settings[REPLICA_DB_ALIAS] = cls.saved_settings
+        cls.replica_dir.cleanup()
+
+    def setUp(self):
+        self.interpreter = make_interpreter(1, spanish=True)
+        self.job = make_job(date=timezone.localdate() + datetime.timedelta(days=1))
+        self.client = Client()
+
+    def copy_to_replica(self, *objects):
+        for obj in objects:
+            obj.save(using=REPLICA_DB_ALIAS, force_insert=True)
+
+    def jobs_url(self):
+        return reverse('accounts:interpreter-jobs-api', args=[self.interpreter.id])
+
+    def test_get_requests_read_from_replica(self):
+        self.assertEqual(self.client.get(self.jobs_url()).status_code, 404)
+        self.copy_to_replica(self.interpreter)
+        self.assertEqual(self.client.get(self.jobs_url()).status_code, 200)
+
+    def test_board_cache_is_filled_from_primary(self):
+        self.copy_to_replica(self.interpreter)
+        board_cache.get_cache().clear()
+        response = self.client.get(reverse('accounts:available-jobs-api', args=[self.interpreter.id]))
+        self.assertEqual(response.json()['total_available'], 1)
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertTrue(InterpreterProfile.objects.filter(id=self.interpreter.id).exists())
+
+    def test_writes_pin_the_client_to_primary(self):
+        self.copy_to_replica(self.interpreter, self.job)
+        response = self.client.post(reverse('accounts:accept-job-api', args=[self.interpreter.id, self.job.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], settings.REPLICA_PIN_SECONDS)
+
+        # The replica hasn't seen the assignment, the primary has
+        self.assertEqual(self.client.get(self.jobs_url()).json()['total_jobs'], 1)
+        self.assertEqual(Client().get(self.jobs_url()).json()['total_jobs'], 0)
@@ -4,6 +4,7 @@ from .views import (
     InterpreterDetailView,
     interpreter_jobs_page,
     available_jobs_page,
+    AvailableJobsListView,
     AcceptJobView,
     accept_job
 )
@@ -15,6 +16,7 @@ urlpatterns = [
     path('interpreters/<int:id>/', InterpreterDetailView.as_view(), name='interpreter-detail'),
     path('interpreters/<int:interpreter_id>/jobs/page/', interpreter_jobs_page, name='interpreter-jobs-page'),
     path('interpreters/<int:interpreter_id>/jobs/available/', available_jobs_page, name='available-jobs-page'),
+    path('interpreters/<int:interpreter_id>/available-jobs/', AvailableJobsListView.as_view(), name='available-jobs-api'),
     path('interpreters/<int:interpreter_id>/jobs/<int:job_id>/accept/', AcceptJobView.as_view(), name='accept-job-api'),
     path('interpreters/<int:interpreter_id>/jobs/<int:job_id>/accept/page/', accept_job, name='accept-job'),
 ]
@@ -1,108 +1,252 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
+from django.conf import settings
+from django.http import Http404, HttpResponseBadRequest
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
-from .models import InterpreterProfile
-from .serializers import InterpreterProfileSerializer
-from jobs.models import Job
-from jobs.serializers import JobSerializer
+from .conditional import available_jobs_validators, conditional_on, interpreter_jobs_validators, request_board
+from .earnings import STATUS_FIELDS
+from .models import InterpreterEarnings, InterpreterProfile
+from .serializers import JOBS_LIMIT_DEFAULT, JOBS_LIMIT_MAX, InterpreterProfileSerializer
+from jobs import assignment
+from jobs.pagination import InvalidCursor, paginate_jobs
+from jobs.serializers import JobSerializer, job_rows, serialize_job_rows
+
+MAX_PAGE_SIZE = 100
+
+
+def get_page_size(raw):
+    """Page size from a query parameter, falling back to the REST_FRAMEWORK default"""
+    try:
+        page_size = int(raw)
+    except (TypeError, ValueError):
+        return api_settings.PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def interpreter_data(interpreter):
+    return {
+        'id': interpreter.id,
+        'name': f"{interpreter.first_name} {interpreter.last_name}",
+        'email': interpreter.email_address,
+    }
 
 
 class InterpreterJobsListView(APIView):
     """
-    API endpoint to get all jobs for a specific interpreter
+    API endpoint to get the jobs for a specific interpreter, newest first
+
+    Query parameters:
+        cursor: the next_cursor value from the previous page
+        page_size: jobs per page (default PAGE_SIZE, max 100)
     """
+    @method_decorator(conditional_on(interpreter_jobs_validators))
     def get(self, request, interpreter_id):
-        interpreter = get_object_or_404(InterpreterProfile, id=interpreter_id)
-        jobs = interpreter.jobs.all().order_by('-date', '-time')
-        serializer = JobSerializer(jobs, many=True)
+        interpreter = get_object_or_404(InterpreterProfile.objects.select_related('earnings'), id=interpreter_id)
+        try:
+            page = paginate_jobs(
+                job_rows(interpreter.jobs.all()),
+                request.query_params.get('cursor'),
+                get_page_size(request.query_params.get('page_size')),
+            )
+        except InvalidCursor as e:
+            raise ValidationError({'cursor': str(e)})
+
+        # Job count and projected earnings are maintained incrementally
+        earnings = InterpreterEarnings.for_interpreter(interpreter)
 
-        # Calculate projected earnings
-        projected_earnings = sum(job.payment for job in jobs)
+        next_url = None
+        if page.has_next:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', page.next_cursor)
 
         return Response({
-            'interpreter': {
-                'id': interpreter.id,
-                'name': f"{interpreter.first_name} {interpreter.last_name}",
-                'email': interpreter.email_address,
-            },
-            'jobs': serializer.data,
-            'total_jobs': jobs.count(),
-            'projected_earnings': projected_earnings
+            'interpreter': interpreter_data(interpreter),
+            'jobs': serialize_job_rows(page.items),
+            'next_cursor': page.next_cursor,
+            'next': next_url,
+            'total_jobs': earnings.job_count,
+            'projected_earnings': earnings.projected_earnings,
+            'earnings_by_status': {
+                key: getattr(earnings, field) for key, field in STATUS_FIELDS.items()
+            }
         })
 
 
 class InterpreterDetailView(generics.RetrieveAPIView):
     """
-    API endpoint to get interpreter details including all their jobs
+    API endpoint to get interpreter details including their most recent jobs
+
+    Query parameters:
+        jobs_limit: maximum number of jobs to include (default 50, max 200)
+        jobs_since: only include jobs on or after this date (YYYY-MM-DD)
     """
     queryset = InterpreterProfile.objects.all()
     serializer_class = InterpreterProfileSerializer
     lookup_field = 'id'
 
+    @method_decorator(conditional_on(interpreter_jobs_validators))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_jobs_limit(self):
+        raw = self.request.query_params.get('jobs_limit')
+        if raw is None:
+            return JOBS_LIMIT_DEFAULT
+        try:
+            limit = int(raw)
+        except ValueError:
+            raise ValidationError({'jobs_limit': 'Must be an integer.'})
+        if limit < 0:
+            raise ValidationError({'jobs_limit': 'Must not be negative.'})
+        return min(limit, JOBS_LIMIT_MAX)
+
+    def get_jobs_since(self):
+        raw = self.request.query_params.get('jobs_since')
+        if raw is None:
+            return None
+        try:
+            since = parse_date(raw)
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValidationError({'jobs_since': 'Must be a date in YYYY-MM-DD format.'})
+        return since
+
+    def get_queryset(self):
+        return InterpreterProfile.objects.select_related('earnings')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['jobs_limit'] = self.get_jobs_limit()
+        context['jobs_since'] = self.get_jobs_since()
+        return context
 
+
+@conditional_on(interpreter_jobs_validators, pages=True)
 def interpreter_jobs_page(request, interpreter_id):
     """
     Template view for interpreters to see their jobs
     """
-    interpreter = get_object_or_404(InterpreterProfile, id=interpreter_id)
-    jobs = interpreter.jobs.all().order_by('-date', '-time')
+    interpreter = get_object_or_404(InterpreterProfile.objects.select_related('earnings'), id=interpreter_id)
+    try:
+        page = paginate_jobs(
+            interpreter.jobs.all(),
+            request.GET.get('cursor'),
+            get_page_size(request.GET.get('page_size')),
+        )
+    except InvalidCursor as e:
+        return HttpResponseBadRequest(str(e))
 
-    # Calculate projected earnings
-    projected_earnings = sum(job.payment for job in jobs)
+    # Job count and projected earnings are maintained incrementally
+    earnings = InterpreterEarnings.for_interpreter(interpreter)
+
+    # Page links keep the other query parameters, page_size in particular
+    query = request.GET.copy()
+    query.pop('cursor', None)
+    newest_query = query.urlencode()
+    query['cursor'] = page.next_cursor or ''
 
     context = {
         'interpreter': interpreter,
-        'jobs': jobs,
-        'total_jobs': jobs.count(),
-        'projected_earnings': projected_earnings,
+        'jobs': page.items,
+        'next_cursor': page.next_cursor,
+        'next_query': query.urlencode(),
+        'newest_query': newest_query,
+        'is_first_page': not request.GET.get('cursor'),
+        'total_jobs': earnings.job_count,
+        'projected_earnings': earnings.projected_earnings,
     }
 
     return render(request, 'accounts/interpreter_jobs.html', context)
 
 
+@conditional_on(available_jobs_validators, pages=True)
 def available_jobs_page(request, interpreter_id):
     """
     Template view for interpreters to see available jobs they can accept
     """
     interpreter = get_object_or_404(InterpreterProfile, id=interpreter_id)
 
-    # Get unassigned jobs that match the interpreter's languages
-    interpreter_languages = interpreter.get_languages()
-    available_jobs = Job.objects.filter(status='unassigned').order_by('-date', '-time')
-
-    # Filter jobs that require DSHS certification if interpreter doesn't have it
-    if not interpreter.dshs_certified:
-        available_jobs = available_jobs.filter(requires_dshs_certification=False)
+    # Unassigned upcoming jobs in the interpreter's languages they're certified for,
+    # shared through the cache by every interpreter with the same languages and DSHS status
+    available_jobs = request_board(request, interpreter).jobs
 
     context = {
         'interpreter': interpreter,
         'available_jobs': available_jobs,
-        'total_available': available_jobs.count(),
+        'total_available': len(available_jobs),
+        'fragment_timeout': settings.AVAILABLE_JOBS_CACHE_TIMEOUT,
     }
 
     return render(request, 'accounts/available_jobs.html', context)
 
 
+class AvailableJobsListView(APIView):
+    """
+    API endpoint for the jobs an interpreter can accept, soonest last
+
+    Served from the same cache as the available jobs page.
+    """
+    @method_decorator(conditional_on(available_jobs_validators))
+    def get(self, request, interpreter_id):
+        interpreter = get_object_or_404(InterpreterProfile, id=interpreter_id)
+        jobs = request_board(request, interpreter).jobs
+        return Response({
+            'interpreter': interpreter_data(interpreter),
+            'jobs': JobSerializer(jobs, many=True).data,
+            'total_available': len(jobs),
+        })
+
+
 class AcceptJobView(APIView):
     """
     API endpoint for an interpreter to accept a job
+
+    Only the first eligible interpreter to accept an open job gets it; later
+    attempts, and accepts overlapping the interpreter's other jobs, receive
+    409 Conflict.
     """
     def post(self, request, interpreter_id, job_id):
         interpreter = get_object_or_404(InterpreterProfile, id=interpreter_id)
-        job = get_object_or_404(Job, id=job_id)
 
-        # Assign the interpreter to the job
-        job.assigned_interpreter = interpreter
-        job.status = 'assigned'
-        job.save()
+        # Assign the interpreter to the job if it's still open
+        outcome = assignment.accept_job(job_id, interpreter)
+
+        if outcome == assignment.NOT_FOUND:
+            raise NotFound('Job not found')
+
+        if outcome == assignment.TAKEN:
+            return Response({
+                'success': False,
+                'error': 'This job has already been accepted by another interpreter',
+                'job_id': job_id,
+            }, status=status.HTTP_409_CONFLICT)
+
+        if outcome == assignment.CONFLICT:
+            return Response({
+                'success': False,
+                'error': 'This job overlaps another job you have already accepted',
+                'job_id': job_id,
+            }, status=status.HTTP_409_CONFLICT)
+
+        if outcome == assignment.INELIGIBLE:
+            return Response({
+                'success': False,
+                'error': 'You do not meet the language or certification requirements for this job',
+                'job_id': job_id,
+            }, status=status.HTTP_403_FORBIDDEN)
 
         return Response({
             'success': True,
             'message': f'Job successfully assigned to {interpreter.first_name} {interpreter.last_name}',
-            'job_id': job.id,
-            'status': job.status
+            'job_id': job_id,
+            'status': 'assigned'
         }, status=status.HTTP_200_OK)
 
 
@@ -112,12 +256,24 @@ def accept_job(request, interpreter_id, job_id):
     """
     if request.method == 'POST':
         interpreter = get_object_or_404(InterpreterProfile, id=interpreter_id)
-        job = get_object_or_404(Job, id=job_id)
 
-        # Assign the interpreter to the job
-        job.assigned_interpreter = interpreter
-        job.status = 'assigned'
-        job.save()
+        # Assign the interpreter to the job if it's still open
+        outcome = assignment.accept_job(job_id, interpreter)
+
+        if outcome == assignment.NOT_FOUND:
+            raise Http404('Job not found')
+
+        if outcome == assignment.TAKEN:
+            messages.error(request, 'Sorry, this job has already been accepted by another interpreter.')
+            return redirect('accounts:available-jobs-page', interpreter_id=interpreter_id)
+
+        if outcome == assignment.CONFLICT:
+            messages.error(request, 'This job overlaps another job you have already accepted.')
+            return redirect('accounts:available-jobs-page', interpreter_id=interpreter_id)
+
+        if outcome == assignment.INELIGIBLE:
+            messages.error(request, 'You do not meet the language or certification requirements for this job.')
+            return redirect('accounts:available-jobs-page', interpreter_id=interpreter_id)
 
         messages.success(request, f'You have successfully accepted the job!')
         return redirect('accounts:interpreter-jobs-page', interpreter_id=interpreter_id)
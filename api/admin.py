@@ -1,3 +1,26 @@
 from django.contrib import admin
+from .models import OutboundSMS, SMSBatch
 
-# Register your models here.
+
+class OutboundSMSInline(admin.TabularInline):
+    model = OutboundSMS
+    extra = 0
+    can_delete = False
+    fields = ['phone_number', 'status', 'attempts', 'sid', 'twilio_status', 'error', 'updated_at']
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SMSBatch)
+class SMSBatchAdmin(admin.ModelAdmin):
+    list_display = ['id', 'job', 'created_at']
+    date_hierarchy = 'created_at'
+    ordering = ['-created_at']
+    readonly_fields = ['job', 'message', 'created_at']
+    inlines = [OutboundSMSInline]
+
+    def has_add_permission(self, request):
+        # Batches are created when messages are sent from the Job admin
+        return False
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path('health/', async_views.health, name='async-health-check'),
+    path('send-sms/', async_views.send_sms, name='async-send-sms'),
+]
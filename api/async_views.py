@@ -0,0 +1,91 @@
+"""
+Async versions of the hot API endpoints, for ASGI deployments.
+
+laango/urls.py routes the endpoints here instead of to views.py when
+ASYNC_VIEWS is set. Responses match their DRF counterparts.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+
+from jobs.models import Job
+from .outbox import enqueue_batch, recipient_numbers
+from .sms import twilio_configured
+
+
+@require_safe
+async def health(request):
+    """Async version of HealthCheckView"""
+    return JsonResponse({
+        'status': 'ok',
+        'message': 'Laango API is running'
+    })
+
+
+def request_data(request):
+    """The JSON or form body of a POST, like DRF's request.data"""
+    if request.content_type == 'application/json':
+        data = json.loads(request.body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError('Expected a JSON object')
+        return data
+    return {
+        'phone_numbers': request.POST.getlist('phone_numbers'),
+        **{key: value for key, value in request.POST.items() if key != 'phone_numbers'},
+    }
+
+
+def error(message, status):
+    return JsonResponse({'success': False, 'error': message}, status=status)
+
+
+@csrf_exempt
+@require_POST
+async def send_sms(request):
+    """Async version of SendSMSView"""
+    try:
+        data = request_data(request)
+    except ValueError as e:
+        return error(str(e), 400)
+
+    phone_numbers = data.get('phone_numbers', [])
+    message_text = data.get('message', '')
+    job_id = data.get('job_id')
+
+    if not phone_numbers:
+        return error('No phone numbers provided', 400)
+    try:
+        phone_numbers = recipient_numbers(phone_numbers)
+    except ValueError as e:
+        return error(str(e), 400)
+    if not message_text:
+        return error('No message provided', 400)
+    if not job_id:
+        return error('No job ID provided', 400)
+
+    try:
+        job = await Job.objects.filter(id=job_id).afirst()
+    except (TypeError, ValueError):
+        job = None
+    if job is None:
+        return error('Job not found', 404)
+
+    if not twilio_configured():
+        return error(
+            'Twilio credentials not configured. Please add TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, '
+            'and TWILIO_PHONE_NUMBER to your .env file.',
+            500,
+        )
+
+    # enqueue_batch writes in a transaction, which the async ORM doesn't support
+    batch = await sync_to_async(enqueue_batch)(job, message_text, phone_numbers)
+    return JsonResponse({
+        'success': True,
+        'batch_id': batch.id,
+        'queued': len(phone_numbers),
+        'status_url': reverse('sms-batch-detail', kwargs={'batch_id': batch.id})
+    }, status=202)
@@ -0,0 +1,189 @@
+"""
+Twilio delivery-status callbacks.
+
+Twilio calls back for every status change of every message (queued, sent,
+delivered, ...), so a large broadcast produces a storm of callbacks within
+seconds. The webhook only inserts each one into DeliveryStatusCallback
+before acknowledging it. The stored callbacks are folded into the contacts
+and outbox rows SMS_STATUS_FLUSH_SECONDS after they start arriving (and by
+every sms_worker round), SMS_STATUS_FLUSH_SIZE at a time, keeping the
+furthest status seen per SID and issuing one UPDATE per status per table.
+
+Statuses only move forward: a late "sent" never overwrites "delivered".
+
+A callback can arrive before the send it reports on has been recorded.
+Callbacks for unknown SIDs are kept and retried until they are
+SMS_STATUS_ORPHAN_SECONDS old, then logged and dropped.
+"""
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from job_requests.models import InterpreterContact
+from .models import DeliveryStatusCallback, OutboundSMS
+
+logger = logging.getLogger(__name__)
+
+# How far along each Twilio message status is. Callbacks can arrive out of
+# order, so a status is only applied over one with a lower rank.
+STATUS_RANKS = {
+    'accepted': 0,
+    'scheduled': 0,
+    'queued': 0,
+    'sending': 1,
+    'sent': 2,
+    'delivered': 3,
+    'undelivered': 3,
+    'failed': 3,
+    'canceled': 3,
+    'read': 4,
+}
+
+FINAL_STATUSES = {'delivered', 'undelivered', 'failed', 'canceled', 'read'}
+
+
+@dataclass
+class StatusUpdate:
+    status: str
+    error_code: str
+    received_at: object
+
+
+def _lower_statuses(status):
+    """Stored statuses that ``status`` may replace, including none yet"""
+    rank = STATUS_RANKS[status]
+    return [''] + [other for other, other_rank in STATUS_RANKS.items() if other_rank < rank]
+
+
+def apply_updates(updates):
+    """
+    Write ``{sid: StatusUpdate}`` to InterpreterContact and OutboundSMS.
+
+    SIDs that share a status and error code go out in one UPDATE per table,
+    so the cost depends on the number of distinct statuses, not SIDs.
+    """
+    groups = defaultdict(list)
+    for sid, update in updates.items():
+        groups[update.status, update.error_code].append((sid, update.received_at))
+
+    with transaction.atomic(savepoint=False):
+        for (status, error_code), received in groups.items():
+            sids = [sid for sid, _ in received]
+            received_at = max(at for _, at in received)
+            lower = _lower_statuses(status)
+            InterpreterContact.objects.filter(sid__in=sids, delivery_status__in=lower).update(
+                delivery_status=status,
+                delivery_error_code=error_code,
+                delivery_updated_at=received_at,
+            )
+            OutboundSMS.objects.filter(sid__in=sids, twilio_status__in=lower).update(
+                twilio_status=status,
+                updated_at=received_at,
+            )
+
+
+def record_callback(sid, status, error_code=''):
+    """Store a callback for the next fold; returns False for statuses we don't track"""
+    if not sid or status not in STATUS_RANKS:
+        return False
+    DeliveryStatusCallback.objects.create(sid=sid, status=status, error_code=error_code or '')
+    fold_timer.start()
+    return True
+
+
+def coalesce(callbacks):
+    """``{sid: StatusUpdate}`` holding the furthest status of each SID in ``callbacks``"""
+    updates = {}
+    for callback in callbacks:
+        current = updates.get(callback.sid)
+        if current is None or STATUS_RANKS[callback.status] > STATUS_RANKS[current.status]:
+            updates[callback.sid] = StatusUpdate(callback.status, callback.error_code, callback.received_at)
+    return updates
+
+
+def _fold_batch(after_id, batch_size, orphaned_before):
+    with transaction.atomic():
+        callbacks = DeliveryStatusCallback.objects.filter(id__gt=after_id).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            # Another process folding at the same time takes the next rows
+            callbacks = callbacks.select_for_update(skip_locked=True)
+        callbacks = list(callbacks[:batch_size])
+        if not callbacks:
+            return None, 0, False
+
+        updates = coalesce(callbacks)
+        known = set(InterpreterContact.objects.filter(sid__in=list(updates)).values_list('sid', flat=True))
+        known.update(OutboundSMS.objects.filter(sid__in=list(updates)).values_list('sid', flat=True))
+        apply_updates({sid: update for sid, update in updates.items() if sid in known})
+
+        orphans = {c.sid for c in callbacks if c.sid not in known and c.received_at < orphaned_before}
+        if orphans:
+            logger.warning('Dropping status callbacks for unknown message SIDs: %s', ', '.join(sorted(orphans)))
+        done = [c.id for c in callbacks if c.sid in known or c.sid in orphans]
+        DeliveryStatusCallback.objects.filter(id__in=done).delete()
+    return callbacks[-1].id, len(done), len(callbacks) == batch_size
+
+
+def fold_callbacks(batch_size=None):
+    """Apply stored callbacks, ``batch_size`` per transaction; returns how many were consumed"""
+    if batch_size is None:
+        batch_size = settings.SMS_STATUS_FLUSH_SIZE
+    orphaned_before = timezone.now() - timedelta(seconds=settings.SMS_STATUS_ORPHAN_SECONDS)
+    consumed = 0
+    last_id = 0
+    more = True
+    while more:
+        last_id, done, more = _fold_batch(last_id, batch_size, orphaned_before)
+        consumed += done
+    return consumed
+
+
+class FoldTimer:
+    """Folds stored callbacks SMS_STATUS_FLUSH_SECONDS after the first one in a burst"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def start(self):
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(settings.SMS_STATUS_FLUSH_SECONDS, self._fold)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _fold(self):
+        with self._lock:
+            self._timer = None
+        try:
+            fold_callbacks()
+        except Exception:
+            # The callbacks are still stored; the next fold picks them up
+            logger.exception('Folding delivery status callbacks failed')
+        finally:
+            connection.close()
+
+
+fold_timer = FoldTimer()
+
+
+def delivery_stats(job):
+    """Contacts for ``job`` by delivery status, from one aggregate query"""
+    return InterpreterContact.objects.filter(job=job).aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=~Q(delivery_status__in=FINAL_STATUSES)),
+        **{status: Count('id', filter=Q(delivery_status=status)) for status in sorted(FINAL_STATUSES)},
+    )
@@ -0,0 +1,178 @@
+"""
+Streaming exports for payroll and compliance.
+
+Each export is a values_list() query read with ``iterator(chunk_size=...)``
+and written out a chunk at a time, so memory stays flat however many rows
+there are (on Postgres the iterator uses a server-side cursor).
+"""
+import csv
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from accounts.earnings import STATUS_FIELDS, SUMMARY_FIELDS
+from job_requests.models import InterpreterContact
+from jobs.languages import LANGUAGE_NAMES_BY_MASK
+from jobs.models import Job
+
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _day_bounds(start, end):
+    """Aware datetimes for the start of ``start`` and the end of ``end`` (exclusive)"""
+    bounds = {}
+    if start is not None:
+        bounds['gte'] = timezone.make_aware(datetime.datetime.combine(start, datetime.time.min))
+    if end is not None:
+        bounds['lt'] = timezone.make_aware(datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time.min))
+    return bounds
+
+
+def _date_filter(field, start, end):
+    q = Q()
+    if start is not None:
+        q &= Q(**{f'{field}__gte': start})
+    if end is not None:
+        q &= Q(**{f'{field}__lte': end})
+    return q
+
+
+def _name(first_name, last_name):
+    return f"{first_name} {last_name}" if first_name is not None else ''
+
+
+def job_rows(start=None, end=None):
+    """Jobs on dates in [start, end], with languages and full address"""
+    header = [
+        'id', 'date', 'time', 'end_time', 'duration_minutes', 'job_type', 'status', 'languages',
+        'full_address', 'street_address', 'city', 'state', 'zip_code', 'requires_dshs_certification',
+        'payment', 'mileage_included', 'assigned_interpreter_id', 'assigned_interpreter_name',
+    ]
+    rows = Job.objects.filter(_date_filter('date', start, end)).order_by('date', 'time', 'id').values_list(
+        'id', 'date', 'time', 'end_time', 'duration_minutes', 'job_type', 'status', 'language_mask',
+        'street_address', 'city', 'state', 'zip_code', 'requires_dshs_certification', 'payment',
+        'mileage_included', 'assigned_interpreter', 'assigned_interpreter__first_name',
+        'assigned_interpreter__last_name',
+    )
+
+    def generate():
+        for (
+            pk, date, time, end_time, duration, job_type, status, language_mask, street_address, city,
+            state, zip_code, dshs, payment, mileage, interpreter_id, first_name, last_name,
+        ) in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield [
+                pk, date, time, end_time, duration, job_type, status,
+                ', '.join(LANGUAGE_NAMES_BY_MASK[language_mask]),
+                f"{street_address}, {city}, {state} {zip_code}",
+                street_address, city, state, zip_code, dshs, payment, mileage, interpreter_id,
+                _name(first_name, last_name),
+            ]
+
+    return header, generate()
+
+
+def earnings_rows(start=None, end=None):
+    """Per-interpreter job counts and earnings from jobs on dates in [start, end]"""
+    header = ['interpreter_id', 'interpreter_name', *SUMMARY_FIELDS]
+    rows = (
+        Job.objects.filter(_date_filter('date', start, end), assigned_interpreter__isnull=False)
+        .order_by('assigned_interpreter')
+        .values_list('assigned_interpreter', 'assigned_interpreter__first_name', 'assigned_interpreter__last_name')
+        .annotate(
+            job_count=Count('id'),
+            projected_earnings=Sum('payment', default=0),
+            **{
+                field: Sum('payment', filter=Q(status=status), default=0)
+                for status, field in STATUS_FIELDS.items()
+            },
+        )
+    )
+
+    def generate():
+        for interpreter_id, first_name, last_name, *totals in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield [interpreter_id, _name(first_name, last_name), *totals]
+
+    return header, generate()
+
+
+def contact_rows(start=None, end=None):
+    """Interpreter contacts made on days in [start, end]"""
+    header = [
+        'id', 'contacted_at', 'job_id', 'job_date', 'interpreter_id', 'interpreter_name',
+        'phone_number', 'message_sent',
+    ]
+    bounds = {f'contacted_at__{lookup}': value for lookup, value in _day_bounds(start, end).items()}
+    rows = InterpreterContact.objects.filter(**bounds).order_by('contacted_at', 'id').values_list(
+        'id', 'contacted_at', 'job', 'job__date', 'interpreter', 'interpreter__first_name',
+        'interpreter__last_name', 'phone_number', 'message_sent',
+    )
+
+    def generate():
+        for (
+            pk, contacted_at, job_id, job_date, interpreter_id, first_name, last_name, phone_number, message,
+        ) in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield [
+                pk, contacted_at, job_id, job_date, interpreter_id, _name(first_name, last_name),
+                phone_number, message,
+            ]
+
+    return header, generate()
+
+
+EXPORTS = {
+    'jobs': job_rows,
+    'earnings': earnings_rows,
+    'contacts': contact_rows,
+}
+
+
+class _Line:
+    """File-like object that hands back what csv.writer writes to it"""
+    def write(self, value):
+        return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
+
+
+def _ndjson_lines(header, rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + '\n'
+
+
+def stream(name, file_format, start=None, end=None):
+    """
+    Yield export ``name`` in ``file_format`` ('csv' or 'ndjson') as text chunks
+    of up to CHUNK_SIZE rows each.
+    """
+    header, rows = EXPORTS[name](start, end)
+    lines = _csv_lines(header, rows) if file_format == 'csv' else _ndjson_lines(header, rows)
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def filename(name, file_format, start=None, end=None):
+    parts = [name]
+    if start is not None:
+        parts.append(f'from-{start.isoformat()}')
+    if end is not None:
+        parts.append(f'to-{end.isoformat()}')
+    return '-'.join(parts) + f'.{file_format}'
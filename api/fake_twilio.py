@@ -0,0 +1,129 @@
+"""
+A local stand-in for the Twilio Messages API.
+
+Used to benchmark and exercise SMS sending offline. Point
+TWILIO_API_BASE_URL at the server and any credentials are accepted.
+Failures can be injected at random (``failure_rate``) or for particular
+numbers (``fail_next``).
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+MESSAGES_PATH = re.compile(r'^/2010-04-01/Accounts/(?P<account_sid>[^/]+)/Messages\.json$')
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        match = MESSAGES_PATH.match(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+
+        if not match:
+            return self.send_json(404, {'code': 20404, 'message': 'The requested resource was not found', 'status': 404})
+
+        to = form.get('To', [''])[0]
+        with self.server.in_flight():
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            scripted = self.server.scripted_status(to)
+
+        if scripted:
+            return self.send_json(scripted, {'code': 20000 + scripted, 'message': 'Scripted failure', 'status': scripted})
+        if self.server.failure_rate and random.random() < self.server.failure_rate:
+            return self.send_json(503, {'code': 20503, 'message': 'Service unavailable', 'status': 503})
+
+        self.server.record(form)
+        self.send_json(201, {
+            'sid': 'SM' + uuid.uuid4().hex,
+            'account_sid': match.group('account_sid'),
+            'to': to,
+            'from': form.get('From', [''])[0],
+            'body': form.get('Body', [''])[0],
+            'status': 'queued',
+            'num_segments': '1',
+            'direction': 'outbound-api',
+        })
+
+    def send_json(self, status_code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FakeTwilioServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, failure_rate=0.0, verbose=False):
+        super().__init__(address, FakeTwilioHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.verbose = verbose
+        self.messages = []
+        # Status codes to answer with, in turn, before accepting messages to a number
+        self.failures = {}
+        # Most requests handled at the same time
+        self.max_concurrency = 0
+        self._concurrency = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up before the reply; that's expected
+        if self.verbose:
+            super().handle_error(request, client_address)
+
+    def reset(self):
+        with self._lock:
+            self.messages.clear()
+            self.failures.clear()
+            self.max_concurrency = 0
+
+    def fail_next(self, to, *statuses):
+        """Answer the next messages to ``to`` with these status codes"""
+        with self._lock:
+            self.failures.setdefault(to, []).extend(statuses)
+
+    def scripted_status(self, to):
+        with self._lock:
+            statuses = self.failures.get(to)
+            return statuses.pop(0) if statuses else None
+
+    @contextmanager
+    def in_flight(self):
+        with self._lock:
+            self._concurrency += 1
+            self.max_concurrency = max(self.max_concurrency, self._concurrency)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._concurrency -= 1
+
+    def record(self, form):
+        with self._lock:
+            self.messages.append(form)
+
+    def start(self):
+        """Serve from a background thread and return the server"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
@@ -0,0 +1,148 @@
+"""
+Inbound SMS replies to job offers.
+
+Broadcasts ask interpreters to "respond YES to accept this job". A YES is
+matched to the most recent offer sent to that number (one index probe on
+InterpreterContact's phone number and contact time), and accepted with
+jobs.assignment.accept_job, whose conditional UPDATE lets exactly one
+reply win however many arrive at once.
+
+Confirmations and "already taken" replies are sent from a background pool
+after the transaction commits, so the webhook answers Twilio without waiting
+on an outbound API call.
+"""
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.phone import normalize_phone
+from jobs import assignment
+from jobs.models import Job
+from jobs.schedule import ACTIVE_STATUSES
+from job_requests.models import InterpreterContact
+from .sms import get_twilio_client, send_sms
+
+logger = logging.getLogger(__name__)
+
+ACCEPT_WORDS = {'yes', 'y'}
+
+FIRST_WORD = re.compile(r'[a-z]+')
+
+IGNORED = 'ignored'
+NO_OFFER = 'no_offer'
+
+REPLIES = {
+    assignment.ACCEPTED: (
+        'Confirmed! The {date} {time} job at {address} is yours. '
+        'To cancel, YOU MUST CALL THE AGENCY DIRECTLY.'
+    ),
+    assignment.TAKEN: 'Sorry, the {date} {time} job at {address} has already been taken.',
+    assignment.CONFLICT: (
+        'Sorry, we could not assign the {date} {time} job at {address} '
+        'because it overlaps another job you have.'
+    ),
+    assignment.INELIGIBLE: (
+        'Sorry, the {date} {time} job at {address} needs a language or certification '
+        'we do not have on file for you. Please call the agency.'
+    ),
+    assignment.NOT_FOUND: 'Sorry, that job is no longer available.',
+}
+
+
+def is_acceptance(body):
+    """True for "YES", "yes!", "Y please", ..."""
+    match = FIRST_WORD.match((body or '').strip().lower())
+    return match is not None and match.group() in ACCEPT_WORDS
+
+
+def latest_offer(phone_e164, now=None):
+    """
+    The most recent open offer to ``phone_e164``: a contact within
+    SMS_REPLY_WINDOW_HOURS for a job that hasn't happened yet.
+    """
+    if now is None:
+        now = timezone.now()
+    return (
+        InterpreterContact.objects
+        .filter(
+            phone_number=phone_e164,
+            contacted_at__gte=now - timedelta(hours=settings.SMS_REPLY_WINDOW_HOURS),
+            job__date__gte=timezone.localdate(now),
+        )
+        .select_related('interpreter', 'job')
+        .only(
+            'job', 'interpreter', 'job__date', 'job__time', 'job__street_address', 'job__city',
+            'job__status', 'job__assigned_interpreter',
+            'interpreter__language_mask', 'interpreter__dshs_certified',
+        )
+        .order_by('-contacted_at')
+        .first()
+    )
+
+
+def reply_text(outcome, job):
+    return REPLIES[outcome].format(
+        date=job.date.strftime('%m/%d'),
+        time=job.time.strftime('%I:%M %p'),
+        address=f'{job.street_address}, {job.city}',
+    )
+
+
+def handle_reply(from_number, body):
+    """
+    Act on an inbound message and queue the answer to send.
+
+    Returns IGNORED for anything but a YES, NO_OFFER when there is no open
+    offer to this number, or the accept_job outcome.
+    """
+    if not is_acceptance(body):
+        return IGNORED
+    phone_e164 = normalize_phone(from_number)
+    contact = latest_offer(phone_e164) if phone_e164 else None
+    if contact is None:
+        return NO_OFFER
+
+    job = contact.job
+    if job.status == 'unassigned' and job.assigned_interpreter_id is None:
+        outcome = assignment.accept_job(job.id, contact.interpreter)
+        if outcome == assignment.TAKEN:
+            job.status, job.assigned_interpreter_id = (
+                Job.objects.filter(id=job.id).values_list('status', 'assigned_interpreter').get()
+            )
+    else:
+        # Most of a burst arrives after the job is gone; answer those from
+        # the row we already read instead of queueing for the write lock
+        outcome = assignment.TAKEN
+    if outcome == assignment.TAKEN and _is_assigned(job, contact.interpreter_id):
+        # Twilio retries a webhook it didn't hear back from; the interpreter
+        # already won, so confirm again rather than tell them it's taken
+        outcome = assignment.ACCEPTED
+    send_reply_later(phone_e164, reply_text(outcome, job))
+    return outcome
+
+
+def _is_assigned(job, interpreter_id):
+    return job.status in ACTIVE_STATUSES and job.assigned_interpreter_id == interpreter_id
+
+
+@lru_cache(maxsize=None)
+def _reply_executor():
+    return ThreadPoolExecutor(max_workers=max(settings.SMS_SEND_CONCURRENCY, 1), thread_name_prefix='sms-reply')
+
+
+def _send_reply(phone_number, message_text):
+    try:
+        send_sms(get_twilio_client(), phone_number, message_text)
+    except Exception:
+        logger.exception('Could not send reply to %s', phone_number)
+
+
+def send_reply_later(phone_number, message_text):
+    """Send an SMS from the background pool once the current transaction commits"""
+    transaction.on_commit(lambda: _reply_executor().submit(_send_reply, phone_number, message_text))
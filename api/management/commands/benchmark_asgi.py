@@ -0,0 +1,154 @@
+import asyncio
+import datetime
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.models import InterpreterProfile
+from jobs.models import Job
+
+SERVERS = {
+    'wsgi': ['laango.wsgi:application'],
+    'asgi': ['-c', 'laango/gunicorn_asgi.py', 'laango.asgi:application'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def load(url, requests, concurrency):
+    """GET ``url`` ``requests`` times, ``concurrency`` at once; returns (seconds, latencies, errors)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def fetch(session):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch(session) for _ in range(requests)))
+        return time.perf_counter() - start, latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark concurrent-request throughput of the hot endpoints served by sync gunicorn '
+        'workers (laango.wsgi) and by uvicorn workers (laango.asgi with ASYNC_VIEWS). '
+        'The synthetic data is deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint per server')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once')
+        parser.add_argument('--workers', type=int, default=2, help='Gunicorn workers per server')
+        parser.add_argument('--jobs', type=int, default=60, help='Jobs to create for the benchmark interpreter')
+        parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=['wsgi', 'asgi'])
+
+    def handle(self, *args, **options):
+        interpreters = InterpreterProfile.objects.filter(email_address__endswith='@benchmark.invalid')
+        jobs = Job.objects.filter(street_address='1 Benchmark Way')
+        try:
+            interpreter = self.seed(options['jobs'])
+            paths = {
+                'health': '/api/health/',
+                'interpreter jobs': f'/interpreters/{interpreter.id}/jobs/',
+                'available jobs': f'/interpreters/{interpreter.id}/available-jobs/',
+            }
+            for name in options['servers']:
+                self.bench(name, paths, options)
+        finally:
+            jobs.delete()
+            interpreters.delete()
+
+    def seed(self, count):
+        interpreter = InterpreterProfile.objects.create(
+            first_name='Bench',
+            last_name='Interpreter',
+            phone_number='+12069990000',
+            email_address='bench@benchmark.invalid',
+            street_address='',
+            city='Seattle',
+            state='WA',
+            zip_code='',
+            spanish=True,
+        )
+        # Created one by one so the earnings and board cache stay current
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        for i in range(count):
+            assigned = i % 3 != 0
+            Job.objects.create(
+                date=tomorrow + datetime.timedelta(days=i % 14),
+                time=datetime.time(8 + i % 9, 0),
+                spanish=True,
+                street_address='1 Benchmark Way',
+                city='Seattle',
+                state='WA',
+                assigned_interpreter=interpreter if assigned else None,
+                status='assigned' if assigned else 'unassigned',
+            )
+        return interpreter
+
+    def bench(self, name, paths, options):
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        env = {**os.environ, 'DEBUG': 'False', 'ASYNC_VIEWS': str(name == 'asgi')}
+        command = [
+            sys.executable, '-m', 'gunicorn', *SERVERS[name],
+            '--bind', f'127.0.0.1:{port}', '--workers', str(options['workers']), '--log-level', 'warning',
+        ]
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            self.wait_until_up(server, base_url + '/api/health/')
+            for label, path in paths.items():
+                elapsed, latencies, errors = asyncio.run(
+                    load(base_url + path, options['requests'], options['concurrency'])
+                )
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                self.stdout.write(
+                    f'{name} {label:<16}: {options["requests"] / elapsed:7.0f} req/s, '
+                    f'p50 {statistics.median(latencies) * 1000:6.1f}ms, p95 {p95 * 1000:6.1f}ms, {errors} errors'
+                )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    def wait_until_up(self, server, url, timeout=30):
+        async def ping():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    return response.status
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'Server exited with status {server.returncode}')
+            try:
+                if asyncio.run(ping()) == 200:
+                    return
+            except aiohttp.ClientError:
+                pass
+            time.sleep(0.2)
+        raise CommandError(f'Server did not start within {timeout}s')
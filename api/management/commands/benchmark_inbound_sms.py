@@ -0,0 +1,101 @@
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import InterpreterProfile
+from api.fake_twilio import FakeTwilioServer
+from job_requests.models import InterpreterContact
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark a burst of YES replies to one broadcast through the inbound SMS webhook, '
+        'with replies sent to a local fake Twilio server. The synthetic data is deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replies', type=int, default=300)
+        parser.add_argument('--concurrency', type=int, default=16, help='Webhook requests in flight at once')
+        parser.add_argument('--latency', type=float, default=0.2, help='Simulated Twilio round-trip in seconds')
+
+    def handle(self, *args, **options):
+        server = FakeTwilioServer(('127.0.0.1', 0), latency=options['latency']).start()
+        interpreters = InterpreterProfile.objects.filter(email_address__endswith='@benchmark.invalid')
+        jobs = Job.objects.filter(street_address='1 Benchmark Way')
+        try:
+            self.run(options, server, interpreters)
+        finally:
+            server.shutdown()
+            server.server_close()
+            jobs.delete()
+            interpreters.delete()
+
+    def run(self, options, server, interpreters):
+        count = options['replies']
+        job = Job.objects.create(
+            date=timezone.localdate() + datetime.timedelta(days=1),
+            time=datetime.time(9, 0),
+            spanish=True,
+            street_address='1 Benchmark Way',
+            city='Seattle',
+            state='WA',
+        )
+        InterpreterProfile.objects.bulk_create([
+            InterpreterProfile(
+                first_name='Bench',
+                last_name=f'Interpreter {i}',
+                phone_number=f'+1206999{i:04d}',
+                phone_e164=f'+1206999{i:04d}',
+                email_address=f'bench{i}@benchmark.invalid',
+                street_address='',
+                city='',
+                state='WA',
+                zip_code='',
+                spanish=True,
+                language_mask=job.language_mask,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        InterpreterContact.objects.bulk_create([
+            InterpreterContact(job=job, interpreter_id=pk, phone_number=phone, message_sent='Benchmark offer')
+            for pk, phone in interpreters.values_list('id', 'phone_e164')
+        ], batch_size=1000)
+        phone_numbers = list(interpreters.values_list('phone_e164', flat=True))
+
+        def reply(phone_number):
+            try:
+                return Client(HTTP_HOST='localhost').post(
+                    reverse('sms-inbound'), {'From': phone_number, 'Body': 'YES'}
+                ).status_code
+            finally:
+                connection.close()
+
+        with override_settings(
+            TWILIO_ACCOUNT_SID='ACbenchmark',
+            TWILIO_AUTH_TOKEN='benchmark',
+            TWILIO_PHONE_NUMBER='+12065550000',
+            TWILIO_API_BASE_URL=server.base_url,
+            TWILIO_VALIDATE_WEBHOOKS=False,
+        ):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                statuses = list(executor.map(reply, phone_numbers))
+            handled = time.perf_counter() - start
+            while len(server.messages) < count and time.perf_counter() - start < 60:
+                time.sleep(0.01)
+            delivered = time.perf_counter() - start
+
+        job.refresh_from_db()
+        self.stdout.write(
+            f'{count} replies: {statuses.count(200)} answered in {handled:.2f}s '
+            f'({count / handled:.0f} replies/s), {len(server.messages)} SMS answers sent by {delivered:.2f}s'
+        )
+        winners = sum(body.startswith('Confirmed!') for message in server.messages for body in message['Body'])
+        self.stdout.write(f'job {job.status}, {winners} confirmation(s)')
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from api.fake_twilio import FakeTwilioServer
+from api.sms import asend_sms, get_async_twilio_client, send_bulk_sms, get_twilio_client
+
+
+async def asend_all(phone_numbers, message_text, concurrency):
+    """Send over aiohttp with at most ``concurrency`` requests in flight"""
+    client = get_async_twilio_client()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(phone_number):
+        async with semaphore:
+            try:
+                return await asend_sms(client, phone_number, message_text)
+            except Exception:
+                return None
+
+    try:
+        messages = await asyncio.gather(*(send(phone_number) for phone_number in phone_numbers))
+    finally:
+        await client.http_client.close()
+    return sum(message is not None for message in messages)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark serial vs concurrent SMS fan-out against a local fake Twilio server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=50)
+        parser.add_argument('--latency', type=float, default=0.2, help='Simulated Twilio round-trip in seconds')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 16])
+
+    def handle(self, *args, **options):
+        server = FakeTwilioServer(('127.0.0.1', 0), latency=options['latency']).start()
+        phone_numbers = [f'+1206555{i:04d}' for i in range(options['messages'])]
+
+        try:
+            for concurrency in options['concurrency']:
+                with override_settings(
+                    TWILIO_ACCOUNT_SID='ACbenchmark',
+                    TWILIO_AUTH_TOKEN='benchmark',
+                    TWILIO_PHONE_NUMBER='+12065550000',
+                    TWILIO_API_BASE_URL=server.base_url,
+                    SMS_SEND_CONCURRENCY=concurrency,
+                ):
+                    client = get_twilio_client()
+                    start = time.perf_counter()
+                    results, errors = send_bulk_sms(phone_numbers, 'Benchmark message', client=client)
+                    elapsed = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    sent = asyncio.run(asend_all(phone_numbers, 'Benchmark message', concurrency))
+                    async_elapsed = time.perf_counter() - start
+
+                self.stdout.write(
+                    f'concurrency {concurrency:>3}: {len(results)} sent, {len(errors)} failed '
+                    f'in {elapsed:.2f}s ({len(results) / elapsed:.1f} msg/s)'
+                )
+                self.stdout.write(
+                    f'      async {concurrency:>3}: {sent} sent, {len(phone_numbers) - sent} failed '
+                    f'in {async_elapsed:.2f}s ({sent / async_elapsed:.1f} msg/s)'
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,33 @@
+import argparse
+import datetime
+from django.core.management.base import BaseCommand
+from api import exports
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid date {value!r}, expected YYYY-MM-DD')
+
+
+class Command(BaseCommand):
+    help = 'Export jobs, per-interpreter earnings or contact history as CSV or NDJSON, streaming rows from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(exports.EXPORTS))
+        parser.add_argument('--format', dest='file_format', choices=sorted(exports.FORMATS), default='csv')
+        parser.add_argument('--start', type=parse_date, help='First date to include (YYYY-MM-DD)')
+        parser.add_argument('--end', type=parse_date, help='Last date to include (YYYY-MM-DD)')
+        parser.add_argument('--output', '-o', help='File to write (default: stdout)')
+
+    def handle(self, *args, **options):
+        chunks = exports.stream(options['name'], options['file_format'], options['start'], options['end'])
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from api.fake_twilio import FakeTwilioServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake Twilio Messages API for offline testing and benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.2, help='Seconds to wait before answering each message')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of messages answered with a 503')
+
+    def handle(self, *args, **options):
+        server = FakeTwilioServer(
+            (options['host'], options['port']),
+            latency=options['latency'],
+            failure_rate=options['failure_rate'],
+            verbose=True,
+        )
+        self.stdout.write(f'Fake Twilio listening on {server.base_url}')
+        self.stdout.write(f'Set TWILIO_API_BASE_URL={server.base_url} to send messages here')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from api.delivery import fold_callbacks
+from api.outbox import adeliver, claim_messages, deliver
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver queued SMS messages from the outbox and apply stored delivery-status callbacks. '
+        'Run as many workers as needed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.SMS_OUTBOX_BATCH_SIZE, help='Messages to claim per round')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the outbox is drained instead of polling')
+        parser.add_argument('--async', dest='use_async', action='store_true', help='Send over aiohttp from an event loop instead of a thread pool')
+
+    def handle(self, *args, **options):
+        delivered = 0
+        try:
+            if options['use_async']:
+                delivered = asyncio.run(self.arun(options))
+            else:
+                delivered = self.run(options)
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(f'Processed {delivered} message(s) in total')
+
+    def run(self, options):
+        delivered = 0
+        while True:
+            # Drop connections that broke or outlived CONN_MAX_AGE, as a request would
+            close_old_connections()
+            try:
+                messages = claim_messages(options['batch_size'])
+                deliver(messages)
+                # Status callbacks the web processes haven't folded yet
+                fold_callbacks()
+            except Exception:
+                self.round_failed(options)
+                time.sleep(options['poll_interval'])
+                continue
+
+            if not messages:
+                if options['once']:
+                    return delivered
+                time.sleep(options['poll_interval'])
+                continue
+            delivered += len(messages)
+            self.report(messages, options)
+
+    async def arun(self, options):
+        delivered = 0
+        while True:
+            await sync_to_async(close_old_connections)()
+            try:
+                messages = await sync_to_async(claim_messages)(options['batch_size'])
+                await adeliver(messages)
+                await sync_to_async(fold_callbacks)()
+            except Exception:
+                self.round_failed(options)
+                await asyncio.sleep(options['poll_interval'])
+                continue
+
+            if not messages:
+                if options['once']:
+                    return delivered
+                await asyncio.sleep(options['poll_interval'])
+                continue
+            delivered += len(messages)
+            self.report(messages, options)
+
+    def round_failed(self, options):
+        if options['once']:
+            raise
+        # Claimed messages are picked up again when their lease expires
+        logger.exception('SMS outbox round failed')
+
+    def report(self, messages, options):
+        if options['verbosity'] > 1:
+            self.stdout.write(f'Processed {len(messages)} message(s)')
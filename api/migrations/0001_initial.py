@@ -0,0 +1,111 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("jobs", "0010_job_latitude_job_longitude_job_job_coords_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SMSBatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("message", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sms_batches",
+                        to="jobs.job",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "SMS Batch",
+                "verbose_name_plural": "SMS Batches",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="OutboundSMS",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("phone_number", models.CharField(max_length=20)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Earliest time the message may be (re)tried",
+                    ),
+                ),
+                (
+                    "lease_token",
+                    models.UUIDField(blank=True, editable=False, null=True),
+                ),
+                ("leased_until", models.DateTimeField(blank=True, null=True)),
+                ("sid", models.CharField(blank=True, max_length=64)),
+                ("twilio_status", models.CharField(blank=True, max_length=20)),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="messages",
+                        to="api.smsbatch",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Outbound SMS",
+                "verbose_name_plural": "Outbound SMS",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at"], name="outbox_claim_idx"
+                    ),
+                    models.Index(fields=["lease_token"], name="outbox_lease_idx"),
+                ],
+            },
+        ),
+    ]
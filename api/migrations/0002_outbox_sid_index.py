@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="outboundsms",
+            index=models.Index(fields=["sid"], name="outbox_sid_idx"),
+        ),
+    ]
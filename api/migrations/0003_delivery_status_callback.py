@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_outbox_sid_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeliveryStatusCallback",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sid", models.CharField(max_length=64)),
+                ("status", models.CharField(max_length=20)),
+                ("error_code", models.CharField(blank=True, max_length=10)),
+                (
+                    "received_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+    ]
@@ -1,3 +1,83 @@
 from django.db import models
+from django.utils import timezone
+from jobs.models import Job
 
-# Create your models here.
+
+class SMSBatch(models.Model):
+    """
+    One broadcast of a message to a group of interpreters for a job
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='sms_batches')
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "SMS Batch"
+        verbose_name_plural = "SMS Batches"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"SMS batch {self.id} for {self.job}"
+
+
+class OutboundSMS(models.Model):
+    """
+    A single message waiting in (or sent from) the SMS outbox.
+
+    Rows are claimed by `manage.py sms_worker` with a lease, so a crashed
+    worker's messages become claimable again once the lease expires.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    batch = models.ForeignKey(SMSBatch, on_delete=models.CASCADE, related_name='messages')
+    phone_number = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the message may be (re)tried")
+    lease_token = models.UUIDField(null=True, blank=True, editable=False)
+    leased_until = models.DateTimeField(null=True, blank=True)
+
+    # Twilio outcome
+    sid = models.CharField(max_length=64, blank=True)
+    twilio_status = models.CharField(max_length=20, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Outbound SMS"
+        verbose_name_plural = "Outbound SMS"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_claim_idx'),
+            models.Index(fields=['lease_token'], name='outbox_lease_idx'),
+            models.Index(fields=['sid'], name='outbox_sid_idx'),
+        ]
+
+    def __str__(self):
+        return f"SMS to {self.phone_number} ({self.status})"
+
+
+class DeliveryStatusCallback(models.Model):
+    """
+    A Twilio status callback waiting to be applied.
+
+    The webhook only inserts these; api.delivery folds them into the
+    contacts and outbox rows in batches and deletes them.
+    """
+    sid = models.CharField(max_length=64)
+    status = models.CharField(max_length=20)
+    error_code = models.CharField(max_length=10, blank=True)
+    received_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.sid} {self.status}"
@@ -0,0 +1,267 @@
+"""
+Durable SMS outbox.
+
+SendSMSView only records a batch and its recipients. `manage.py sms_worker`
+claims rows under a lease and delivers them through Twilio; any number of
+workers can run side by side.
+"""
+import asyncio
+import uuid
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from twilio.base.exceptions import TwilioRestException
+
+from accounts.models import InterpreterProfile
+from accounts.phone import normalize_phone
+from job_requests.models import InterpreterContact
+from .models import OutboundSMS, SMSBatch
+from .sms import asend_sms, get_async_twilio_client, get_twilio_client, is_retryable, send_sms
+
+
+def recipient_numbers(phone_numbers):
+    """
+    ``phone_numbers`` in E.164 form, each number once however it was typed.
+
+    Raises ValueError listing any that can't be valid numbers.
+    """
+    numbers = []
+    invalid = []
+    for raw in phone_numbers:
+        phone_e164 = normalize_phone(raw) if isinstance(raw, str) else None
+        if phone_e164 is None:
+            invalid.append(str(raw))
+        else:
+            numbers.append(phone_e164)
+    if invalid:
+        raise ValueError(f'Invalid phone numbers: {", ".join(invalid)}')
+    return list(dict.fromkeys(numbers))
+
+
+def enqueue_batch(job, message_text, phone_numbers):
+    """
+    Persist a broadcast and one outbox row per recipient, stored (and so
+    sent) in E.164 form. Raises ValueError for invalid numbers.
+    """
+    phone_numbers = recipient_numbers(phone_numbers)
+    with transaction.atomic():
+        batch = SMSBatch.objects.create(job=job, message=message_text)
+        OutboundSMS.objects.bulk_create(
+            [OutboundSMS(batch=batch, phone_number=phone_number) for phone_number in phone_numbers],
+            batch_size=500,
+        )
+    return batch
+
+
+def claimable(now):
+    """Pending rows that are due, plus rows whose worker lease expired with attempts to spare"""
+    return OutboundSMS.objects.filter(
+        Q(status='pending', available_at__lte=now)
+        | Q(status='sending', leased_until__lt=now, attempts__lt=settings.SMS_OUTBOX_MAX_ATTEMPTS)
+    )
+
+
+def fail_abandoned(now):
+    """Fail rows whose last allowed attempt never reported back"""
+    return OutboundSMS.objects.filter(
+        status='sending', leased_until__lt=now, attempts__gte=settings.SMS_OUTBOX_MAX_ATTEMPTS,
+    ).update(
+        status='failed',
+        error='Worker lease expired on the last attempt',
+        lease_token=None,
+        leased_until=None,
+        updated_at=now,
+    )
+
+
+def claim_messages(limit, lease_seconds=None):
+    """
+    Lease up to ``limit`` messages to this worker and return them.
+
+    On Postgres the candidate rows are locked with FOR UPDATE SKIP LOCKED so
+    concurrent workers never wait on (or take) each other's rows. The lease
+    token makes the claim safe on backends without SKIP LOCKED as well: only
+    rows this worker actually updated are returned.
+    """
+    if lease_seconds is None:
+        lease_seconds = settings.SMS_OUTBOX_LEASE_SECONDS
+    now = timezone.now()
+    token = uuid.uuid4()
+
+    with transaction.atomic():
+        fail_abandoned(now)
+        candidates = claimable(now).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+        claimable(now).filter(id__in=ids).update(
+            status='sending',
+            lease_token=token,
+            leased_until=now + timedelta(seconds=lease_seconds),
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+
+    return list(OutboundSMS.objects.filter(lease_token=token, status='sending').select_related('batch'))
+
+
+def deliver(messages, concurrency=None, client=None):
+    """
+    Send claimed messages and record each outcome.
+
+    Failures Twilio can't have accepted go back to pending with exponential
+    backoff until SMS_OUTBOX_MAX_ATTEMPTS is reached. Everything else fails,
+    since sending again might text the interpreter twice.
+    """
+    if not messages:
+        return
+    if concurrency is None:
+        concurrency = settings.SMS_SEND_CONCURRENCY
+    if client is None:
+        client = get_twilio_client()
+
+    def send(outbound):
+        try:
+            return outbound, send_sms(client, outbound.phone_number, outbound.batch.message, max_retries=0), None
+        except Exception as e:
+            return outbound, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(messages)))) as executor:
+        outcomes = list(executor.map(send, messages))
+
+    record_outcomes(outcomes)
+
+
+async def adeliver(messages, concurrency=None, client=None):
+    """
+    deliver() from an event loop, sending over aiohttp.
+
+    ``concurrency`` bounds the messages in flight at once; no threads are
+    used for the sends, only to record the outcomes.
+    """
+    if not messages:
+        return
+    if concurrency is None:
+        concurrency = settings.SMS_SEND_CONCURRENCY
+    if client is None:
+        client = get_async_twilio_client()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def send(outbound):
+        async with semaphore:
+            try:
+                return outbound, await asend_sms(client, outbound.phone_number, outbound.batch.message, max_retries=0), None
+            except Exception as e:
+                return outbound, None, e
+
+    outcomes = await asyncio.gather(*(send(outbound) for outbound in messages))
+    await sync_to_async(record_outcomes)(outcomes)
+
+
+def record_outcomes(outcomes):
+    """
+    Save ``(outbound, message, error)`` send results and log the contacts.
+
+    Only rows still leased to this worker are written. If a lease expired
+    mid-send another worker may have claimed the row again, and its outcome
+    wins.
+    """
+    now = timezone.now()
+    tokens = {outbound.lease_token for outbound, _, _ in outcomes}
+
+    with transaction.atomic():
+        held = set(
+            OutboundSMS.objects.select_for_update().filter(
+                id__in=[outbound.id for outbound, _, _ in outcomes], lease_token__in=tokens,
+            ).values_list('id', 'lease_token')
+        )
+        messages = []
+        sent = []
+        for outbound, message, error in outcomes:
+            if (outbound.id, outbound.lease_token) not in held:
+                continue
+            messages.append(outbound)
+            outbound.lease_token = None
+            outbound.leased_until = None
+            outbound.updated_at = now
+            if error is None:
+                outbound.status = 'sent'
+                outbound.sid = message.sid
+                outbound.twilio_status = message.status or ''
+                outbound.error = ''
+                sent.append(outbound)
+            elif is_retryable(error) and outbound.attempts < settings.SMS_OUTBOX_MAX_ATTEMPTS:
+                outbound.status = 'pending'
+                outbound.available_at = now + timedelta(seconds=settings.SMS_SEND_RETRY_BACKOFF * (2 ** outbound.attempts))
+                outbound.error = str(error)
+            elif _may_have_been_sent(error):
+                outbound.status = 'failed'
+                outbound.error = f'Not retried, Twilio may have accepted it: {error}'
+            else:
+                outbound.status = 'failed'
+                outbound.error = str(error)
+
+        # Filtered on the tokens too, for backends where the SELECT above takes no row locks
+        OutboundSMS.objects.filter(lease_token__in=tokens).bulk_update(
+            messages,
+            ['status', 'sid', 'twilio_status', 'error', 'available_at', 'lease_token', 'leased_until', 'updated_at'],
+        )
+        log_contacts(sent)
+
+
+def _may_have_been_sent(error):
+    """Whether a send failed ambiguously (a timeout, a dropped connection, a 5xx, ...)"""
+    if is_retryable(error):
+        return False
+    return not (isinstance(error, TwilioRestException) and error.status < 500)
+
+
+def log_contacts(sent):
+    """
+    Record delivered messages against the interpreters they were sent to.
+
+    Recipients are resolved with one query on the normalized phone column and
+    the contacts are written with one bulk insert. Numbers that don't belong
+    to an interpreter are skipped; the outbox row still records the send.
+    """
+    if not sent:
+        return
+    interpreter_ids = dict(
+        InterpreterProfile.objects.with_phone_numbers(
+            outbound.phone_number for outbound in sent
+        ).values_list('phone_e164', 'id')
+    )
+
+    contacts = []
+    for outbound in sent:
+        phone_e164 = normalize_phone(outbound.phone_number)
+        interpreter_id = interpreter_ids.get(phone_e164)
+        if interpreter_id is None:
+            continue
+        contacts.append(InterpreterContact(
+            job_id=outbound.batch.job_id,
+            interpreter_id=interpreter_id,
+            message_sent=outbound.batch.message,
+            phone_number=phone_e164,
+            sid=outbound.sid,
+            delivery_status=outbound.twilio_status,
+            delivery_updated_at=outbound.updated_at,
+        ))
+    InterpreterContact.objects.bulk_create(contacts)
+
+
+def batch_progress(batch):
+    """Counts per status for a batch, from a single aggregate query"""
+    counts = batch.messages.aggregate(
+        total=Count('id'),
+        **{key: Count('id', filter=Q(status=key)) for key, _ in OutboundSMS.STATUS_CHOICES},
+    )
+    counts['complete'] = counts['pending'] + counts['sending'] == 0
+    return counts
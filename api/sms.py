@@ -0,0 +1,235 @@
+"""
+Twilio SMS dispatch.
+
+A single Twilio client (and its pooled HTTP session) is reused per process,
+and broadcasts fan out over a bounded thread pool so a request waits for the
+slowest message instead of the sum of every round-trip.
+
+The ``a``-prefixed functions do the same over aiohttp, for code running in
+an event loop: one client per loop, with concurrency bounded by a semaphore
+instead of threads.
+"""
+import asyncio
+import random
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import aiohttp
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+from twilio.base.exceptions import TwilioRestException
+from twilio.http.async_http_client import AsyncTwilioHttpClient
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+from laango.metrics import timed
+
+TWILIO_API_HOST = 'https://api.twilio.com'
+
+# Twilio rejects the whole request for rate limiting and when it's
+# unavailable, so these are safe to retry. Other 5xx responses may come after
+# the message was accepted, and 4xx errors (bad number, unverified sender,
+# ...) fail the same way every time.
+RETRYABLE_STATUSES = {429, 503}
+
+
+class PooledTwilioHttpClient(TwilioHttpClient):
+    """
+    TwilioHttpClient with a connection pool sized for concurrent sends.
+
+    If ``base_url`` is given, requests for api.twilio.com are sent there
+    instead, which lets the fake_twilio server stand in for Twilio.
+    """
+    def __init__(self, pool_size, base_url=None, timeout=None):
+        super().__init__(pool_connections=True, timeout=timeout)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.base_url = base_url.rstrip('/') if base_url else None
+
+    def request(self, method, url, *args, **kwargs):
+        if self.base_url and url.startswith(TWILIO_API_HOST):
+            url = self.base_url + url[len(TWILIO_API_HOST):]
+        return super().request(method, url, *args, **kwargs)
+
+
+class AsyncPooledTwilioHttpClient(AsyncTwilioHttpClient):
+    """PooledTwilioHttpClient for asyncio, sending through one aiohttp session"""
+    def __init__(self, pool_size, base_url=None, timeout=None):
+        super().__init__(pool_connections=False)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+        self.base_url = base_url.rstrip('/') if base_url else None
+
+    async def request(self, method, url, *args, **kwargs):
+        if self.base_url and url.startswith(TWILIO_API_HOST):
+            url = self.base_url + url[len(TWILIO_API_HOST):]
+        return await super().request(method, url, *args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _build_client(account_sid, auth_token, base_url, pool_size, timeout):
+    http_client = PooledTwilioHttpClient(pool_size, base_url=base_url, timeout=timeout)
+    return Client(account_sid, auth_token, http_client=http_client)
+
+
+def get_twilio_client():
+    """Return the shared Twilio client for the current settings"""
+    return _build_client(
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN,
+        settings.TWILIO_API_BASE_URL or None,
+        max(settings.SMS_SEND_CONCURRENCY, 1),
+        settings.TWILIO_TIMEOUT,
+    )
+
+
+# An aiohttp session belongs to the event loop it was created in
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_twilio_client():
+    """Return the Twilio client for the current settings and event loop"""
+    key = (
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN,
+        settings.TWILIO_API_BASE_URL or None,
+        max(settings.SMS_SEND_CONCURRENCY, 1),
+        settings.TWILIO_TIMEOUT,
+    )
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    if key not in clients:
+        account_sid, auth_token, base_url, pool_size, timeout = key
+        http_client = AsyncPooledTwilioHttpClient(pool_size, base_url=base_url, timeout=timeout)
+        clients[key] = Client(account_sid, auth_token, http_client=http_client)
+    return clients[key]
+
+
+def twilio_configured():
+    return bool(settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN and settings.TWILIO_PHONE_NUMBER)
+
+
+def is_retryable(error):
+    """
+    Whether Twilio certainly didn't accept the message, so sending it again
+    can't deliver it twice.
+
+    Only failures to connect qualify. A read timeout or a dropped connection
+    may come after Twilio accepted the message, so those are not retried.
+    """
+    if isinstance(error, TwilioRestException):
+        return error.status in RETRYABLE_STATUSES
+    if isinstance(error, (requests.ConnectTimeout, aiohttp.ClientConnectorError)):
+        return True
+    if isinstance(error, requests.ConnectionError):
+        # requests also raises ConnectionError for connections dropped
+        # mid-request; urllib3's reason tells them apart (NewConnectionError,
+        # for refused connections and failed DNS lookups, is a ConnectTimeoutError)
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, ConnectTimeoutError)
+    return False
+
+
+def _message_params(phone_number, message_text):
+    params = {
+        'body': message_text,
+        'from_': settings.TWILIO_PHONE_NUMBER,
+        'to': phone_number,
+    }
+    if settings.TWILIO_STATUS_CALLBACK_URL:
+        params['status_callback'] = settings.TWILIO_STATUS_CALLBACK_URL
+    return params
+
+
+def _retry_delay(attempt, backoff):
+    # Full jitter keeps a burst of retries from hitting Twilio in lockstep
+    return random.uniform(0, backoff * (2 ** attempt))
+
+
+def send_sms(client, phone_number, message_text, max_retries=None, backoff=None):
+    """
+    Send one SMS, retrying transient failures with exponential backoff.
+
+    Returns the Twilio message; raises the last error if every attempt fails.
+    """
+    if max_retries is None:
+        max_retries = settings.SMS_SEND_MAX_RETRIES
+    if backoff is None:
+        backoff = settings.SMS_SEND_RETRY_BACKOFF
+
+    attempt = 0
+    while True:
+        try:
+            with timed('sms'):
+                return client.messages.create(**_message_params(phone_number, message_text))
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            time.sleep(_retry_delay(attempt, backoff))
+            attempt += 1
+
+
+async def asend_sms(client, phone_number, message_text, max_retries=None, backoff=None):
+    """send_sms for an async client (see get_async_twilio_client)"""
+    if max_retries is None:
+        max_retries = settings.SMS_SEND_MAX_RETRIES
+    if backoff is None:
+        backoff = settings.SMS_SEND_RETRY_BACKOFF
+
+    attempt = 0
+    while True:
+        try:
+            with timed('sms'):
+                return await client.messages.create_async(**_message_params(phone_number, message_text))
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(_retry_delay(attempt, backoff))
+            attempt += 1
+
+
+def send_bulk_sms(phone_numbers, message_text, concurrency=None, client=None):
+    """
+    Send the same message to many numbers concurrently.
+
+    Returns ``(results, errors)`` in the order of ``phone_numbers``, using
+    the per-number shapes SendSMSView has always returned.
+    """
+    if concurrency is None:
+        concurrency = settings.SMS_SEND_CONCURRENCY
+    if client is None:
+        client = get_twilio_client()
+
+    def send(phone_number):
+        try:
+            return phone_number, send_sms(client, phone_number, message_text), None
+        except Exception as e:
+            return phone_number, None, e
+
+    if concurrency <= 1 or len(phone_numbers) <= 1:
+        outcomes = map(send, phone_numbers)
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(phone_numbers))) as executor:
+            outcomes = list(executor.map(send, phone_numbers))
+
+    results = []
+    errors = []
+    for phone_number, message, error in outcomes:
+        if error is not None:
+            errors.append({
+                'phone_number': phone_number,
+                'error': str(error)
+            })
+        else:
+            results.append({
+                'phone_number': phone_number,
+                'sid': message.sid,
+                'status': message.status
+            })
+    return results, errors
@@ -1,3 +1,837 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+import json
+import socket
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import aiohttp
+import requests
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncRequestFactory, Client, TestCase, TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from twilio.base.exceptions import TwilioRestException
+from twilio.request_validator import RequestValidator
+
+from accounts.models import InterpreterProfile
+from job_requests.models import InterpreterContact
+from jobs import assignment
+from jobs.models import Job
+from laango import metrics
+from laango.factories import make_interpreter, make_job
+from . import async_views, delivery, exports, inbound, sms
+from .fake_twilio import FakeTwilioServer
+from .models import DeliveryStatusCallback, OutboundSMS, SMSBatch
+from .outbox import adeliver, claim_messages, enqueue_batch, log_contacts, record_outcomes
+
+
+def offer(job, interpreter):
+    return InterpreterContact.objects.create(
+        job=job,
+        interpreter=interpreter,
+        message_sent='Please respond YES to accept this job.',
+        phone_number=interpreter.phone_e164,
+    )
+
+
+class FakeTwilioMixin:
+    """Sends replies to a local fake Twilio server and waits for them to arrive"""
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeTwilioServer(('127.0.0.1', 0)).start()
+        cls.twilio_settings = override_settings(
+            TWILIO_ACCOUNT_SID='ACtest',
+            TWILIO_AUTH_TOKEN='test-token',
+            TWILIO_PHONE_NUMBER='+12065550000',
+            TWILIO_API_BASE_URL=cls.server.base_url,
+            SMS_SEND_RETRY_BACKOFF=0,
+        )
+        cls.twilio_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.twilio_settings.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.server.reset()
+        self.client = Client(HTTP_HOST='localhost')
+
+    def reply(self, from_number, body, client=None):
+        url = reverse('sms-inbound')
+        params = {'From': from_number, 'Body': body, 'MessageSid': 'SMtest'}
+        signature = RequestValidator('test-token').compute_signature(f'http://localhost{url}', params)
+        return (client or self.client).post(url, params, HTTP_X_TWILIO_SIGNATURE=signature)
+
+    def wait_for_replies(self, count, timeout=10):
+        deadline = time.monotonic() + timeout
+        while len(self.server.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return {(message['To'][0], message['Body'][0]) for message in self.server.messages}
+
+
+class InboundSMSTests(FakeTwilioMixin, TestCase):
+    def test_yes_accepts_latest_offer(self):
+        interpreter = make_interpreter(1)
+        older = make_job(time=datetime.time(8, 0))
+        latest = make_job()
+        offer(older, interpreter)
+        offer(latest, interpreter)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.reply('+12065550001', 'Yes!')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/xml')
+        latest.refresh_from_db()
+        older.refresh_from_db()
+        self.assertEqual(latest.assigned_interpreter_id, interpreter.id)
+        self.assertEqual(latest.status, 'assigned')
+        self.assertIsNone(older.assigned_interpreter_id)
+        ((to, body),) = self.wait_for_replies(1)
+        self.assertEqual(to, '+12065550001')
+        self.assertTrue(body.startswith('Confirmed!'))
+
+    def test_second_yes_is_told_job_is_taken(self):
+        first, second = make_interpreter(1), make_interpreter(2)
+        job = make_job()
+        offer(job, first)
+        offer(job, second)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reply('+12065550001', 'YES')
+            self.reply('+12065550002', 'yes')
+
+        job.refresh_from_db()
+        self.assertEqual(job.assigned_interpreter_id, first.id)
+        replies = dict(self.wait_for_replies(2))
+        self.assertTrue(replies['+12065550001'].startswith('Confirmed!'))
+        self.assertIn('already been taken', replies['+12065550002'])
+
+    def test_repeated_yes_from_winner_is_confirmed_again(self):
+        interpreter = make_interpreter(1)
+        offer(make_job(), interpreter)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(inbound.handle_reply('+12065550001', 'yes'), assignment.ACCEPTED)
+            self.assertEqual(inbound.handle_reply('+12065550001', 'yes'), assignment.ACCEPTED)
+        # Let both answers arrive before the next test clears the server
+        self.wait_for_replies(2)
+
+    def test_other_messages_and_unknown_numbers_are_ignored(self):
+        interpreter = make_interpreter(1)
+        job = make_job()
+        offer(job, interpreter)
+
+        self.assertEqual(inbound.handle_reply('+12065550001', 'Yesterday was fine'), inbound.IGNORED)
+        self.assertEqual(inbound.handle_reply('+12065550001', 'no thanks'), inbound.IGNORED)
+        self.assertEqual(inbound.handle_reply('+12065559999', 'YES'), inbound.NO_OFFER)
+        job.refresh_from_db()
+        self.assertIsNone(job.assigned_interpreter_id)
+
+    def test_expired_offer_is_not_accepted(self):
+        interpreter = make_interpreter(1)
+        offer(make_job(date=timezone.localdate() - datetime.timedelta(days=1)), interpreter)
+        self.assertEqual(inbound.handle_reply('+12065550001', 'YES'), inbound.NO_OFFER)
+
+    def test_lookup_is_one_query(self):
+        interpreter = make_interpreter(1)
+        offer(make_job(), interpreter)
+        with self.assertNumQueries(1):
+            contact = inbound.latest_offer('+12065550001')
+            contact.job.date, contact.interpreter.language_mask
+
+    def test_unsigned_request_is_rejected(self):
+        response = self.client.post(reverse('sms-inbound'), {'From': '+12065550001', 'Body': 'YES'})
+        self.assertEqual(response.status_code, 403)
+
+
+class SendSMSTests(FakeTwilioMixin, TestCase):
+    numbers = ['+12065550101', '+12065550102', '+12065550103']
+
+    def sent_to(self):
+        return [message['To'][0] for message in self.server.messages]
+
+    def test_bulk_results_and_errors_keep_their_shape(self):
+        self.server.fail_next(self.numbers[1], 400)
+        results, errors = sms.send_bulk_sms(self.numbers, 'Job offer')
+        self.assertEqual([result['phone_number'] for result in results], [self.numbers[0], self.numbers[2]])
+        self.assertEqual(set(results[0]), {'phone_number', 'sid', 'status'})
+        self.assertTrue(results[0]['sid'].startswith('SM'))
+        self.assertEqual(results[0]['status'], 'queued')
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(set(errors[0]), {'phone_number', 'error'})
+        self.assertEqual(errors[0]['phone_number'], self.numbers[1])
+        self.assertIn('Scripted failure', errors[0]['error'])
+
+    @override_settings(SMS_SEND_CONCURRENCY=3)
+    def test_bulk_sends_concurrently(self):
+        self.server.latency = 0.05
+        self.addCleanup(setattr, self.server, 'latency', 0)
+        numbers = [f'+1206555{index:04d}' for index in range(9)]
+        results, errors = sms.send_bulk_sms(numbers, 'Job offer')
+        self.assertEqual(([result['phone_number'] for result in results], errors), (numbers, []))
+        self.assertGreater(self.server.max_concurrency, 1)
+        self.assertLessEqual(self.server.max_concurrency, 3)
+
+    @override_settings(SMS_SEND_MAX_RETRIES=2, SMS_SEND_RETRY_BACKOFF=0.5)
+    def test_retry_then_success(self):
+        self.server.fail_next(self.numbers[0], 503, 429)
+        with mock.patch('api.sms.time.sleep') as sleep:
+            message = sms.send_sms(sms.get_twilio_client(), self.numbers[0], 'Job offer')
+        self.assertEqual(message.status, 'queued')
+        self.assertEqual(self.sent_to(), [self.numbers[0]])
+        # Full jitter up to 0.5s, then up to 1s
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertLessEqual(delays[0], 0.5)
+        self.assertLessEqual(delays[1], 1.0)
+
+    @override_settings(SMS_SEND_MAX_RETRIES=2)
+    def test_failures_that_are_not_retried(self):
+        client = sms.get_twilio_client()
+        for statuses, attempts in [((503, 503, 503, 503), 3), ((400, 400), 1), ((500, 500), 1)]:
+            self.server.fail_next(self.numbers[0], *statuses)
+            with self.subTest(statuses=statuses):
+                with self.assertRaises(TwilioRestException) as failed:
+                    sms.send_sms(client, self.numbers[0], 'Job offer')
+                self.assertEqual(failed.exception.status, statuses[0])
+                self.assertEqual(len(self.server.failures[self.numbers[0]]), len(statuses) - attempts)
+            self.server.failures.clear()
+        self.assertEqual(self.server.messages, [])
+
+    async def test_async_retry_then_success(self):
+        self.server.fail_next(self.numbers[0], 503)
+        message = await sms.asend_sms(sms.get_async_twilio_client(), self.numbers[0], 'Job offer')
+        self.assertEqual(message.status, 'queued')
+        self.assertEqual(self.sent_to(), [self.numbers[0]])
+
+        self.server.fail_next(self.numbers[1], 502, 502)
+        with self.assertRaises(TwilioRestException):
+            await sms.asend_sms(sms.get_async_twilio_client(), self.numbers[1], 'Job offer')
+        self.assertEqual(self.server.failures[self.numbers[1]], [502])
+
+
+class InboundSMSBurstTests(FakeTwilioMixin, TransactionTestCase):
+    replies = 50
+
+    def test_burst_of_replies_assigns_exactly_once(self):
+        interpreters = [make_interpreter(i) for i in range(self.replies)]
+        job = make_job()
+        for interpreter in interpreters:
+            offer(job, interpreter)
+        barrier = threading.Barrier(self.replies)
+        statuses = []
+
+        def reply(interpreter):
+            try:
+                barrier.wait()
+                statuses.append(self.reply(interpreter.phone_e164, 'YES', Client(HTTP_HOST='localhost')).status_code)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=reply, args=(interpreter,)) for interpreter in interpreters]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(statuses, [200] * self.replies)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'assigned')
+
+        replies = dict(self.wait_for_replies(self.replies))
+        self.assertEqual(len(replies), self.replies)
+        confirmed = [to for to, body in replies.items() if body.startswith('Confirmed!')]
+        self.assertEqual(confirmed, [InterpreterProfile.objects.get(id=job.assigned_interpreter_id).phone_e164])
+        self.assertEqual(sum('already been taken' in body for body in replies.values()), self.replies - 1)
+
+
+def closed_port_url():
+    """A local URL nothing is listening on"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{sock.getsockname()[1]}/'
+
+
+class RetryableTests(TestCase):
+    def test_twilio_statuses(self):
+        for status_code, retryable in [(429, True), (503, True), (500, False), (502, False), (504, False), (400, False)]:
+            with self.subTest(status=status_code):
+                self.assertIs(sms.is_retryable(TwilioRestException(status_code, '/Messages')), retryable)
+
+    def test_only_failed_connections_are_retryable(self):
+        with self.assertRaises(requests.ConnectionError) as refused:
+            requests.post(closed_port_url(), timeout=5)
+        self.assertTrue(sms.is_retryable(refused.exception))
+        self.assertTrue(sms.is_retryable(requests.ConnectTimeout()))
+
+        server = FakeTwilioServer(('127.0.0.1', 0), latency=0.5).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        # The server gets the message; only the reply is late
+        with self.assertRaises(requests.ReadTimeout) as late:
+            requests.post(server.base_url + '/2010-04-01/Accounts/ACtest/Messages.json', timeout=0.1)
+        self.assertFalse(sms.is_retryable(late.exception))
+        self.assertFalse(sms.is_retryable(requests.ConnectionError('Connection aborted.')))
+
+    async def test_only_failed_connections_are_retryable_async(self):
+        async with aiohttp.ClientSession() as session:
+            with self.assertRaises(aiohttp.ClientConnectorError) as refused:
+                await session.post(closed_port_url())
+        self.assertTrue(sms.is_retryable(refused.exception))
+        self.assertFalse(sms.is_retryable(TimeoutError()))
+        self.assertFalse(sms.is_retryable(aiohttp.ServerDisconnectedError()))
+
+
+@override_settings(SMS_OUTBOX_MAX_ATTEMPTS=3, SMS_OUTBOX_LEASE_SECONDS=60, SMS_SEND_RETRY_BACKOFF=10)
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.interpreter = make_interpreter(1)
+        self.batch = enqueue_batch(make_job(), 'Offer', [self.interpreter.phone_number, '+12065559998', '+12065559999'])
+
+    def expire_leases(self):
+        OutboundSMS.objects.filter(status='sending').update(leased_until=timezone.now() - datetime.timedelta(seconds=1))
+
+    def make_due(self):
+        OutboundSMS.objects.filter(status='pending').update(available_at=timezone.now())
+
+    def sent(self, sid):
+        return SimpleNamespace(sid=sid, status='queued')
+
+    def test_log_contacts_resolves_recipients_in_one_query(self):
+        other = make_interpreter(2)
+        now = timezone.now()
+        sent = [
+            OutboundSMS(batch=self.batch, phone_number=number, sid=f'SM{i}', twilio_status='queued', updated_at=now)
+            for i, number in enumerate(['(206) 555-0001', '206.555.0002', '+12065559999'])
+        ]
+        # One SELECT for the recipients, one INSERT for the contacts
+        with self.assertNumQueries(2):
+            log_contacts(sent)
+        self.assertEqual(
+            set(InterpreterContact.objects.values_list('interpreter_id', 'phone_number', 'sid')),
+            {(self.interpreter.id, '+12065550001', 'SM0'), (other.id, '+12065550002', 'SM1')},
+        )
+
+    def test_claims_do_not_overlap(self):
+        first, second = claim_messages(2), claim_messages(2)
+        self.assertEqual((len(first), len(second)), (2, 1))
+        self.assertFalse({m.id for m in first} & {m.id for m in second})
+        self.assertEqual(claim_messages(2), [])
+        self.assertEqual({m.attempts for m in first + second}, {1})
+
+    def test_expired_lease_is_claimed_again(self):
+        claimed = claim_messages(10)
+        self.expire_leases()
+        reclaimed = claim_messages(10)
+        self.assertEqual({m.id for m in reclaimed}, {m.id for m in claimed})
+        self.assertEqual({m.attempts for m in reclaimed}, {2})
+
+    def test_expired_lease_does_not_overwrite_the_new_claim(self):
+        (stale,) = claim_messages(1)
+        self.expire_leases()
+        (current,) = claim_messages(1)
+        self.assertEqual(current.id, stale.id)
+
+        record_outcomes([(current, self.sent('SMcurrent'), None)])
+        record_outcomes([(stale, self.sent('SMstale'), None)])
+        self.assertEqual(OutboundSMS.objects.get(id=stale.id).sid, 'SMcurrent')
+        self.assertEqual(list(InterpreterContact.objects.values_list('sid', flat=True)), ['SMcurrent'])
+
+    def test_retryable_errors_back_off(self):
+        (outbound,) = claim_messages(1)
+        record_outcomes([(outbound, None, TwilioRestException(503, '/Messages'))])
+        outbound.refresh_from_db()
+        self.assertEqual(outbound.status, 'pending')
+        delay = (outbound.available_at - outbound.updated_at).total_seconds()
+        self.assertEqual(delay, 10 * 2 ** 1)
+        self.assertNotIn(outbound.id, [m.id for m in claim_messages(10)])
+
+        (other,) = OutboundSMS.objects.filter(status='sending')[:1]
+        record_outcomes([(other, None, TwilioRestException(400, '/Messages'))])
+        self.assertEqual(OutboundSMS.objects.get(id=other.id).status, 'failed')
+
+    def test_ambiguous_errors_are_not_resent(self):
+        claimed = claim_messages(3)
+        errors = [requests.ReadTimeout('Read timed out.'), TwilioRestException(500, '/Messages'), TimeoutError()]
+        record_outcomes(list(zip(claimed, [None] * 3, errors)))
+        self.make_due()
+        self.assertEqual(claim_messages(10), [])
+        for outbound in OutboundSMS.objects.all():
+            self.assertEqual(outbound.status, 'failed')
+            self.assertTrue(outbound.error.startswith('Not retried, Twilio may have accepted it'))
+
+    def test_attempts_are_capped(self):
+        (outbound,) = claim_messages(1)
+        for _ in range(2):
+            record_outcomes([(outbound, None, TwilioRestException(503, '/Messages'))])
+            self.make_due()
+            (outbound,) = claim_messages(1)
+        self.assertEqual(outbound.attempts, 3)
+        record_outcomes([(outbound, None, TwilioRestException(503, '/Messages'))])
+        self.assertEqual(OutboundSMS.objects.get(id=outbound.id).status, 'failed')
+
+    def test_abandoned_last_attempt_fails(self):
+        for _ in range(3):
+            claim_messages(10)
+            self.expire_leases()
+        self.assertEqual(claim_messages(10), [])
+        self.assertEqual(set(OutboundSMS.objects.values_list('status', flat=True)), {'failed'})
+
+
+class SMSBatchViewsTests(TestCase):
+    numbers = ['+12065550101', '+12065550102', '+12065550103']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = make_job()
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def send(self, **data):
+        return self.client.post(
+            reverse('send-sms'),
+            {'phone_numbers': self.numbers, 'message': 'Job offer', 'job_id': self.job.id, **data},
+            content_type='application/json',
+        )
+
+    @override_settings(TWILIO_ACCOUNT_SID='ACtest', TWILIO_AUTH_TOKEN='test-token', TWILIO_PHONE_NUMBER='+12065550000')
+    def test_send_queues_a_batch(self):
+        # The job, then the batch and all its rows in one transaction
+        with self.assertNumQueries(5):
+            response = self.send()
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        batch = SMSBatch.objects.get()
+        self.assertEqual((data['batch_id'], data['queued']), (batch.id, 3))
+        self.assertEqual(data['status_url'], reverse('sms-batch-detail', kwargs={'batch_id': batch.id}))
+        self.assertEqual((batch.job, batch.message), (self.job, 'Job offer'))
+        self.assertEqual(
+            list(batch.messages.values_list('phone_number', 'status')),
+            [(number, 'pending') for number in self.numbers],
+        )
+
+    @override_settings(TWILIO_ACCOUNT_SID='ACtest', TWILIO_AUTH_TOKEN='test-token', TWILIO_PHONE_NUMBER='+12065550000')
+    def test_send_rejects_bad_requests(self):
+        self.assertEqual(self.send(phone_numbers=[]).status_code, 400)
+        self.assertEqual(self.send(message='').status_code, 400)
+        self.assertEqual(self.send(job_id=None).status_code, 400)
+        self.assertEqual(self.send(job_id=999999).status_code, 404)
+        response = self.send(phone_numbers=['206-555-0101', '555-0102', 12065550103])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Invalid phone numbers: 555-0102, 12065550103')
+        self.assertFalse(SMSBatch.objects.exists())
+
+    @override_settings(TWILIO_ACCOUNT_SID='ACtest', TWILIO_AUTH_TOKEN='test-token', TWILIO_PHONE_NUMBER='+12065550000')
+    def test_send_normalizes_numbers(self):
+        response = self.send(phone_numbers=['(206) 555-0101', '+1 206 555 0101', '206.555.0102'])
+        self.assertEqual(response.json()['queued'], 2)
+        self.assertEqual(
+            list(SMSBatch.objects.get().messages.values_list('phone_number', flat=True)),
+            ['+12065550101', '+12065550102'],
+        )
+
+    @override_settings(TWILIO_ACCOUNT_SID='')
+    def test_send_needs_twilio(self):
+        self.assertEqual(self.send().status_code, 500)
+        self.assertFalse(SMSBatch.objects.exists())
+
+    def test_batch_progress(self):
+        batch = enqueue_batch(self.job, 'Job offer', self.numbers)
+        claimed = claim_messages(2)
+        record_outcomes([
+            (claimed[0], SimpleNamespace(sid='SMone', status='queued'), None),
+            (claimed[1], None, TwilioRestException(400, '/Messages', msg='Invalid number')),
+        ])
+        url = reverse('sms-batch-detail', kwargs={'batch_id': batch.id})
+
+        self.client.force_login(self.admin)
+        data = self.client.get(url).json()
+        self.assertEqual(
+            {key: data[key] for key in ('batch_id', 'job_id', 'complete', 'total', 'pending', 'sent', 'failed')},
+            {'batch_id': batch.id, 'job_id': self.job.id, 'complete': False, 'total': 3, 'pending': 1, 'sent': 1, 'failed': 1},
+        )
+        self.assertEqual(data['results'], [{'phone_number': self.numbers[0], 'sid': 'SMone', 'status': 'queued'}])
+        self.assertEqual(data['errors'][0]['phone_number'], self.numbers[1])
+        self.assertIn('Invalid number', data['errors'][0]['error'])
+
+        record_outcomes([(claim_messages(1)[0], SimpleNamespace(sid='SMthree', status='queued'), None)])
+        data = self.client.get(url).json()
+        self.assertEqual((data['complete'], data['pending'], data['sent']), (True, 0, 2))
+        self.assertEqual(self.client.get(reverse('sms-batch-detail', kwargs={'batch_id': 999999})).status_code, 404)
+
+    def test_batch_progress_is_staff_only(self):
+        batch = enqueue_batch(self.job, 'Job offer', self.numbers)
+        url = reverse('sms-batch-detail', kwargs={'batch_id': batch.id})
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(User.objects.create_user('interpreter', password='password'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(TWILIO_AUTH_TOKEN='test-token', TWILIO_VALIDATE_WEBHOOKS=True)
+class TwilioSignatureTests(TestCase):
+    def post_signed(self, name, params):
+        url = reverse(name)
+        # Twilio signs the public https URL; the proxy forwards plain http
+        signature = RequestValidator('test-token').compute_signature(f'https://laango.example.com{url}', params)
+        return Client(HTTP_HOST='laango.example.com').post(
+            url, params, HTTP_X_TWILIO_SIGNATURE=signature, HTTP_X_FORWARDED_PROTO='https',
+        )
+
+    @override_settings(ALLOWED_HOSTS=['laango.example.com'], SECURE_PROXY_SSL_HEADER=('HTTP_X_FORWARDED_PROTO', 'https'))
+    def test_https_signature_behind_proxy(self):
+        response = self.post_signed('sms-inbound', {'From': '+12065550001', 'Body': 'YES'})
+        self.assertEqual(response.status_code, 200)
+        response = self.post_signed('sms-status', {'MessageSid': 'SM' + '0' * 32, 'MessageStatus': 'delivered'})
+        self.assertEqual(response.status_code, 204)
+        delivery.fold_timer.cancel()
+
+    @override_settings(ALLOWED_HOSTS=['laango.example.com'], SECURE_PROXY_SSL_HEADER=None)
+    def test_forwarded_proto_ignored_without_proxy(self):
+        # The client's X-Forwarded-Proto can't turn a plain http request into https
+        response = self.post_signed('sms-inbound', {'From': '+12065550001', 'Body': 'YES'})
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(SMS_STATUS_FLUSH_SIZE=1000, SMS_STATUS_FLUSH_SECONDS=60, TWILIO_VALIDATE_WEBHOOKS=False)
+class DeliveryStatusTests(TestCase):
+    def setUp(self):
+        self.job = make_job()
+        self.contacts = [
+            InterpreterContact.objects.create(
+                job=self.job,
+                interpreter=make_interpreter(i),
+                message_sent='Offer',
+                phone_number=f'+1206555{i:04d}',
+                sid=f'SM{i:032d}',
+                delivery_status='queued',
+            )
+            for i in range(6)
+        ]
+        self.client = Client(HTTP_HOST='localhost')
+
+    def tearDown(self):
+        delivery.fold_timer.cancel()
+
+    def callback(self, sid, message_status, error_code=''):
+        return self.client.post(
+            reverse('sms-status'),
+            {'MessageSid': sid, 'MessageStatus': message_status, 'ErrorCode': error_code},
+        )
+
+    def test_callbacks_are_stored_and_coalesced_per_sid(self):
+        sid = self.contacts[0].sid
+        for message_status in ['sending', 'delivered', 'sent']:
+            self.assertEqual(self.callback(sid, message_status).status_code, 204)
+
+        self.assertEqual(DeliveryStatusCallback.objects.count(), 3)
+        self.assertEqual(InterpreterContact.objects.get(sid=sid).delivery_status, 'queued')
+        self.assertEqual(delivery.fold_callbacks(), 3)
+        self.assertEqual(InterpreterContact.objects.get(sid=sid).delivery_status, 'delivered')
+        self.assertFalse(DeliveryStatusCallback.objects.exists())
+
+    def test_status_never_moves_backwards(self):
+        sid = self.contacts[0].sid
+        self.callback(sid, 'delivered')
+        delivery.fold_callbacks()
+        self.callback(sid, 'sent')
+        delivery.fold_callbacks()
+        self.assertEqual(InterpreterContact.objects.get(sid=sid).delivery_status, 'delivered')
+
+    def test_fold_is_one_update_per_status(self):
+        for contact in self.contacts[:3]:
+            self.callback(contact.sid, 'delivered')
+        for contact in self.contacts[3:]:
+            self.callback(contact.sid, 'undelivered', '30003')
+
+        # Savepoint, callbacks, known SIDs from both tables, contacts and outbox
+        # UPDATEs for each of the two statuses, delete, release
+        with self.assertNumQueries(10):
+            delivery.fold_callbacks()
+
+        self.assertEqual(
+            InterpreterContact.objects.filter(delivery_status='undelivered', delivery_error_code='30003').count(), 3
+        )
+
+    def test_callbacks_for_unknown_sids_wait_then_are_dropped(self):
+        self.callback('SMlater', 'delivered')
+        self.assertEqual(delivery.fold_callbacks(), 0)
+
+        # The send is recorded after its callback arrived
+        InterpreterContact.objects.filter(pk=self.contacts[0].pk).update(sid='SMlater')
+        self.assertEqual(delivery.fold_callbacks(), 1)
+        self.assertEqual(InterpreterContact.objects.get(sid='SMlater').delivery_status, 'delivered')
+
+        self.callback('SMunknown', 'delivered')
+        DeliveryStatusCallback.objects.update(received_at=timezone.now() - datetime.timedelta(hours=1))
+        with self.assertLogs('api.delivery', 'WARNING') as logs:
+            self.assertEqual(delivery.fold_callbacks(), 1)
+        self.assertIn('SMunknown', logs.output[0])
+        self.assertFalse(DeliveryStatusCallback.objects.exists())
+
+    def test_fold_in_batches_past_waiting_callbacks(self):
+        self.callback('SMlater', 'sent')
+        for contact in self.contacts:
+            self.callback(contact.sid, 'delivered')
+        self.assertEqual(delivery.fold_callbacks(batch_size=2), 6)
+        self.assertEqual(InterpreterContact.objects.filter(delivery_status='delivered').count(), 6)
+        self.assertEqual(list(DeliveryStatusCallback.objects.values_list('sid', flat=True)), ['SMlater'])
+
+    def test_unknown_statuses_are_ignored(self):
+        self.callback(self.contacts[0].sid, 'bogus')
+        self.callback('', 'delivered')
+        self.assertFalse(DeliveryStatusCallback.objects.exists())
+
+    def test_job_delivery_stats(self):
+        self.callback(self.contacts[0].sid, 'delivered')
+        self.callback(self.contacts[1].sid, 'failed', '30006')
+        delivery.fold_callbacks()
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('job-delivery-stats', kwargs={'job_id': self.job.id}))
+
+        data = response.json()
+        self.assertEqual(data['total'], 6)
+        self.assertEqual(data['delivered'], 1)
+        self.assertEqual(data['failed'], 1)
+        self.assertEqual(data['pending'], 4)
+
+
+class AsyncViewsTests(FakeTwilioMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+
+    async def test_health(self):
+        response = await async_views.health(self.factory.get('/api/health/'))
+        self.assertEqual(json.loads(response.content)['status'], 'ok')
+
+    async def test_send_sms_queues_batch(self):
+        job = await Job.objects.acreate(date=timezone.localdate(), time=datetime.time(9, 0), spanish=True)
+        request = self.factory.post(
+            '/api/send-sms/',
+            {'phone_numbers': ['+12065550001', '+12065550002'], 'message': 'Offer', 'job_id': job.id},
+            content_type='application/json',
+        )
+        response = await async_views.send_sms(request)
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.content)
+        self.assertEqual(data['queued'], 2)
+        self.assertEqual(await OutboundSMS.objects.filter(batch_id=data['batch_id']).acount(), 2)
+
+    async def test_send_sms_errors(self):
+        cases = [
+            ({'message': 'Offer', 'job_id': 1}, 400),
+            ({'phone_numbers': ['+12065550001'], 'job_id': 1}, 400),
+            ({'phone_numbers': ['+12065550001'], 'message': 'Offer', 'job_id': 999999}, 404),
+            ({'phone_numbers': ['555-0001'], 'message': 'Offer', 'job_id': 1}, 400),
+        ]
+        for data, status_code in cases:
+            with self.subTest(data=data):
+                request = self.factory.post('/api/send-sms/', data, content_type='application/json')
+                self.assertEqual((await async_views.send_sms(request)).status_code, status_code)
+
+    async def test_adeliver_sends_over_aiohttp(self):
+        interpreter = await sync_to_async(make_interpreter)(1)
+        job = await sync_to_async(make_job)()
+        # Sent to the normalized number, however it was typed
+        await sync_to_async(enqueue_batch)(job, 'Offer', [interpreter.phone_number, '(206) 555-9999'])
+        messages = await sync_to_async(claim_messages)(10)
+
+        await adeliver(messages)
+
+        self.assertEqual({to for to, _ in self.wait_for_replies(2)}, {interpreter.phone_number, '+12065559999'})
+        self.assertEqual(await OutboundSMS.objects.filter(status='sent').acount(), 2)
+        contact = await InterpreterContact.objects.aget(job=job)
+        self.assertEqual(contact.interpreter_id, interpreter.id)
+        self.assertTrue(contact.sid)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.client = Client(HTTP_HOST='localhost')
+        self.interpreter = make_interpreter(1)
+        self.job = make_job(assigned_interpreter=self.interpreter, status='assigned')
+
+    def timing(self, response):
+        return {part.split(';')[0]: part for part in response['Server-Timing'].split(', ')}
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        url = reverse('accounts:interpreter-jobs-api', args=[self.interpreter.id])
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        timing = self.timing(response)
+        self.assertIn('desc="3 queries"', timing['db'])
+        self.assertIn('serialize', timing)
+        self.assertNotIn('template', timing)
+
+        page = self.client.get(reverse('accounts:interpreter-jobs-page', args=[self.interpreter.id]))
+        self.assertIn('template', self.timing(page))
+
+    @override_settings(SERVER_TIMING=True)
+    async def test_server_timing_header_on_async_requests(self):
+        response = await self.async_client.get(reverse('health-check'))
+        self.assertIn('total', self.timing(response))
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_header_off(self):
+        response = self.client.get(reverse('accounts:interpreter-jobs-api', args=[self.interpreter.id]))
+        self.assertNotIn('Server-Timing', response.headers)
+
+    @override_settings(METRICS_TOKEN='scrape-token')
+    def test_metrics_endpoint(self):
+        url = reverse('accounts:interpreter-jobs-api', args=[self.interpreter.id])
+        self.client.get(url)
+
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE laango_request_duration_seconds histogram', body)
+        self.assertIn(f'laango_request_db_queries_sum{{view="{resolve(url).view_name}"}} 3', body)
+        self.assertIn('laango_board_cache_total{result="hits"}', body)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram('test_seconds', 'Test.', (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe('view', value)
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{view="view",le="0.1"} 2', lines)
+        self.assertIn('test_seconds_bucket{view="view",le="1.0"} 3', lines)
+        self.assertIn('test_seconds_bucket{view="view",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_count{view="view"} 4', lines)
+
+
+class JobMatchesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = make_job(somali=True)
+        cls.partial = make_interpreter(1)
+        cls.full = make_interpreter(2, somali=True, dshs_certified=True)
+        cls.busy = make_interpreter(3, somali=True)
+        make_job(assigned_interpreter=cls.busy, status='assigned')
+        make_interpreter(4, spanish=False, russian=True)
+        cls.url = reverse('job-matches', kwargs={'job_id': cls.job.id})
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+    def test_best_match_first(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['sort'], 'score')
+        self.assertEqual(data['total'], 2)
+        self.assertIsNone(data['next_offset'])
+        self.assertEqual([match['id'] for match in data['results']], [self.full.id, self.partial.id])
+        self.assertEqual(data['results'][0]['languages'], ['Somali', 'Spanish'])
+        self.assertEqual(data['results'][0]['score'], 60)
+        self.assertEqual(data['results'][1]['language_overlap'], 0.5)
+
+    def test_pages(self):
+        data = self.client.get(self.url, {'limit': 1}).json()
+        self.assertEqual([match['id'] for match in data['results']], [self.full.id])
+        self.assertEqual(data['next_offset'], 1)
+        data = self.client.get(self.url, {'limit': 1, 'offset': 1}).json()
+        self.assertEqual([match['id'] for match in data['results']], [self.partial.id])
+        self.assertIsNone(data['next_offset'])
+
+    def test_bad_parameters(self):
+        # The job has no coordinates, so can't be sorted by distance
+        self.assertEqual(self.client.get(self.url, {'sort': 'distance'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'limit': 'all'}).status_code, 400)
+
+    def test_staff_only(self):
+        self.client.logout()
+        self.client.force_login(User.objects.create_user('dispatcher', password='password'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interpreter = make_interpreter(1, first_name='Ana', last_name='Lopez')
+        cls.days = [datetime.date(2026, 3, day) for day in (1, 2, 3)]
+        cls.jobs = [
+            make_job(date=cls.days[0], payment=100, status='completed', assigned_interpreter=cls.interpreter),
+            make_job(date=cls.days[1], payment=50, status='assigned', assigned_interpreter=cls.interpreter,
+                     street_address='1 Pike St, Suite "B"', state='WA', zip_code='98101'),
+            make_job(date=cls.days[2], payment=70, spanish=False, somali=True),
+        ]
+        for job, day in zip(cls.jobs, cls.days):
+            contact = offer(job, cls.interpreter)
+            InterpreterContact.objects.filter(pk=contact.pk).update(
+                contacted_at=timezone.make_aware(datetime.datetime.combine(day, datetime.time(23, 30))),
+            )
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+    def export(self, name, file_format, **params):
+        response = self.client.get(reverse('export', kwargs={'name': name, 'file_format': file_format}), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_jobs_csv_between_dates(self):
+        response, body = self.export('jobs', 'csv', start='2026-03-02', end='2026-03-03')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="jobs-from-2026-03-02-to-2026-03-03.csv"',
+        )
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([int(row['id']) for row in rows], [self.jobs[1].id, self.jobs[2].id])
+        self.assertEqual(rows[0]['full_address'], '1 Pike St, Suite "B", Seattle, WA 98101')
+        self.assertEqual(rows[0]['assigned_interpreter_name'], 'Ana Lopez')
+        self.assertEqual(rows[0]['time'], '09:00:00')
+        self.assertEqual((rows[1]['languages'], rows[1]['assigned_interpreter_name']), ('Somali', ''))
+
+    def test_earnings_ndjson(self):
+        response, body = self.export('earnings', 'ndjson', end='2026-03-01')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['interpreter_name'], 'Ana Lopez')
+        self.assertEqual((rows[0]['job_count'], rows[0]['completed_earnings']), (1, 100))
+
+        _, body = self.export('earnings', 'ndjson')
+        totals = json.loads(body)
+        self.assertEqual((totals['job_count'], totals['projected_earnings'], totals['assigned_earnings']), (2, 150, 50))
+
+    def test_contacts_by_local_day(self):
+        _, body = self.export('contacts', 'ndjson', start='2026-03-02', end='2026-03-02')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['job_id'] for row in rows], [self.jobs[1].id])
+        self.assertEqual(rows[0]['job_date'], '2026-03-02')
+
+    def test_streamed_in_chunks(self):
+        with mock.patch.object(exports, 'CHUNK_SIZE', 2):
+            chunks = list(exports.stream('jobs', 'csv'))
+        # The header and three rows
+        self.assertEqual([chunk.count('\r\n') for chunk in chunks], [2, 2])
+        self.assertTrue(chunks[0].startswith('id,date,time,'))
+
+    def test_bad_requests(self):
+        url = reverse('export', kwargs={'name': 'jobs', 'file_format': 'csv'})
+        self.assertEqual(self.client.get(url, {'start': '2026-02-30'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'end': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export', kwargs={'name': 'jobs', 'file_format': 'xml'})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('export', kwargs={'name': 'users', 'file_format': 'csv'})).status_code, 404)
+
+        self.client.logout()
+        self.client.force_login(User.objects.create_user('dispatcher', password='password'))
+        self.assertEqual(self.client.get(url).status_code, 403)
@@ -1,7 +1,18 @@
 from django.urls import path
-from .views import HealthCheckView, SendSMSView
+from .views import (
+    ExportView, HealthCheckView, InboundSMSView, JobDeliveryStatsView, JobImportView, JobMatchesView, MetricsView,
+    SendSMSView, SMSBatchDetailView, SMSStatusCallbackView,
+)
 
 urlpatterns = [
     path('health/', HealthCheckView.as_view(), name='health-check'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     path('send-sms/', SendSMSView.as_view(), name='send-sms'),
+    path('sms/inbound/', InboundSMSView.as_view(), name='sms-inbound'),
+    path('sms/status/', SMSStatusCallbackView.as_view(), name='sms-status'),
+    path('sms-batches/<int:batch_id>/', SMSBatchDetailView.as_view(), name='sms-batch-detail'),
+    path('jobs/import/', JobImportView.as_view(), name='job-import'),
+    path('jobs/<int:job_id>/delivery/', JobDeliveryStatsView.as_view(), name='job-delivery-stats'),
+    path('jobs/<int:job_id>/matches/', JobMatchesView.as_view(), name='job-matches'),
+    path('exports/<slug:name>.<slug:file_format>', ExportView.as_view(), name='export'),
 ]
@@ -1,12 +1,22 @@
+import hmac
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import AllowAny, BasePermission, IsAdminUser
 from django.conf import settings
-from twilio.rest import Client
-from job_requests.models import InterpreterContact
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
+from django.urls import reverse
+from jobs import matching
+from jobs.importing import ImportFileError, import_jobs, read_file, read_json
 from jobs.models import Job
-from accounts.models import InterpreterProfile
-import json
+from laango import metrics
+from twilio.request_validator import RequestValidator
+from . import delivery, exports, inbound
+from .models import SMSBatch
+from .outbox import batch_progress, enqueue_batch, recipient_numbers
+from .sms import twilio_configured
 
 
 class HealthCheckView(APIView):
@@ -22,7 +32,7 @@ class HealthCheckView(APIView):
 
 class SendSMSView(APIView):
     """
-    API endpoint to send SMS messages to interpreters via Twilio
+    API endpoint to queue SMS messages to interpreters for delivery via Twilio
     """
     def post(self, request):
         try:
@@ -37,6 +47,14 @@ class SendSMSView(APIView):
                     'error': 'No phone numbers provided'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
+            try:
+                phone_numbers = recipient_numbers(phone_numbers)
+            except ValueError as e:
+                return Response({
+                    'success': False,
+                    'error': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+
             if not message_text:
                 return Response({
                     'success': False,
@@ -59,61 +77,267 @@ class SendSMSView(APIView):
                 }, status=status.HTTP_404_NOT_FOUND)
 
             # Check if Twilio credentials are configured
-            if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN or not settings.TWILIO_PHONE_NUMBER:
+            if not twilio_configured():
                 return Response({
                     'success': False,
                     'error': 'Twilio credentials not configured. Please add TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, and TWILIO_PHONE_NUMBER to your .env file.'
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-            # Initialize Twilio client
-            client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-
-            # Send SMS to each phone number
-            results = []
-            errors = []
-
-            for phone_number in phone_numbers:
-                try:
-                    message = client.messages.create(
-                        body=message_text,
-                        from_=settings.TWILIO_PHONE_NUMBER,
-                        to=phone_number
-                    )
-                    results.append({
-                        'phone_number': phone_number,
-                        'sid': message.sid,
-                        'status': message.status
-                    })
-
-                    # Log the contact in the database
-                    try:
-                        interpreter = InterpreterProfile.objects.get(phone_number=phone_number)
-                        InterpreterContact.objects.create(
-                            job=job,
-                            interpreter=interpreter,
-                            message_sent=message_text,
-                            phone_number=phone_number
-                        )
-                    except InterpreterProfile.DoesNotExist:
-                        # If interpreter not found by phone number, still record that we sent the message
-                        pass
-
-                except Exception as e:
-                    errors.append({
-                        'phone_number': phone_number,
-                        'error': str(e)
-                    })
+            # Queue the messages; `manage.py sms_worker` delivers them
+            batch = enqueue_batch(job, message_text, phone_numbers)
 
             return Response({
                 'success': True,
-                'sent': len(results),
-                'failed': len(errors),
-                'results': results,
-                'errors': errors
-            }, status=status.HTTP_200_OK)
+                'batch_id': batch.id,
+                'queued': len(phone_numbers),
+                'status_url': reverse('sms-batch-detail', kwargs={'batch_id': batch.id})
+            }, status=status.HTTP_202_ACCEPTED)
 
         except Exception as e:
             return Response({
                 'success': False,
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class SMSBatchDetailView(APIView):
+    """
+    API endpoint to check the delivery progress of a queued SMS batch
+    """
+    # Lists recipients' phone numbers, so dispatchers only
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, batch_id):
+        batch = get_object_or_404(SMSBatch, id=batch_id)
+        progress = batch_progress(batch)
+
+        results = []
+        errors = []
+        for outbound in batch.messages.filter(status__in=['sent', 'failed']):
+            if outbound.status == 'sent':
+                results.append({
+                    'phone_number': outbound.phone_number,
+                    'sid': outbound.sid,
+                    'status': outbound.twilio_status
+                })
+            else:
+                errors.append({
+                    'phone_number': outbound.phone_number,
+                    'error': outbound.error
+                })
+
+        return Response({
+            'batch_id': batch.id,
+            'job_id': batch.job_id,
+            'created_at': batch.created_at,
+            'complete': progress['complete'],
+            'total': progress['total'],
+            'pending': progress['pending'] + progress['sending'],
+            'sent': progress['sent'],
+            'failed': progress['failed'],
+            'results': results,
+            'errors': errors
+        }, status=status.HTTP_200_OK)
+
+
+class JobMatchesView(APIView):
+    """
+    API endpoint to rank the interpreters matching a job, best first
+
+    Query parameters:
+        sort: 'score' (default), 'distance' (geocoded jobs only) or 'name'
+        offset: number of interpreters to skip
+        limit: interpreters per page (default 15, max 100)
+    """
+    # Lists interpreters' contact details, so dispatchers only
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(Job, id=job_id)
+        try:
+            sort, offset, limit = matching.page_params(job, request.query_params)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        page = matching.match_page(job, sort, offset, limit)
+        return Response({
+            'success': True,
+            'job_id': job.id,
+            'sort': sort,
+            'results': [matching.match_data(job, *item) for item in page.items],
+            'total': page.total,
+            'next_offset': page.next_offset,
+        }, status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    """
+    API endpoint to download jobs, earnings or contact history as CSV or NDJSON
+
+    The file is streamed as it is read from the database.
+
+    Query parameters:
+        start: first date to include (YYYY-MM-DD)
+        end: last date to include (YYYY-MM-DD)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, name, file_format):
+        if name not in exports.EXPORTS or file_format not in exports.FORMATS:
+            return Response({
+                'success': False,
+                'error': f'Unknown export {name}.{file_format}'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        bounds = {}
+        for param in ('start', 'end'):
+            raw = request.query_params.get(param)
+            try:
+                bounds[param] = parse_date(raw) if raw else None
+            except ValueError:
+                bounds[param] = None
+            if raw and bounds[param] is None:
+                return Response({
+                    'success': False,
+                    'error': f'{param} must be a date in YYYY-MM-DD format'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            exports.stream(name, file_format, **bounds),
+            content_type=exports.FORMATS[file_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{exports.filename(name, file_format, **bounds)}"'
+        return response
+
+
+class JobImportView(APIView):
+    """
+    API endpoint to create many unassigned jobs at once from a facility schedule
+
+    Accepts a multipart upload in ``file`` (.csv or .json) or a JSON body
+    (a list of jobs, or {"jobs": [...]}). Rows that fail validation or
+    duplicate an existing job are reported by row number and skipped; the
+    rest are created.
+
+    Query parameters:
+        dry_run: validate and report without creating anything
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                rows = read_file(upload.name, upload.read())
+            else:
+                rows = read_json(request.data)
+        except ImportFileError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        result = import_jobs(rows, dry_run=dry_run)
+        return Response({
+            'success': True,
+            'dry_run': dry_run,
+            'rows': len(rows),
+            **result.as_dict(),
+        }, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+
+def twilio_signature_error(request):
+    """A 403 response if the request isn't signed by Twilio, else None"""
+    if not (settings.TWILIO_VALIDATE_WEBHOOKS and settings.TWILIO_AUTH_TOKEN):
+        return None
+    validator = RequestValidator(settings.TWILIO_AUTH_TOKEN)
+    signature = request.headers.get('X-Twilio-Signature', '')
+    if validator.validate(request.build_absolute_uri(), request.POST.dict(), signature):
+        return None
+    return Response({
+        'success': False,
+        'error': 'Invalid Twilio signature'
+    }, status=status.HTTP_403_FORBIDDEN)
+
+
+class InboundSMSView(APIView):
+    """
+    Twilio webhook for messages sent to TWILIO_PHONE_NUMBER
+
+    A YES accepts the latest job offered to the sender. The answer is sent
+    as a separate message, so the response is always empty TwiML.
+    """
+    # Called by Twilio, which signs the request instead of logging in
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        error = twilio_signature_error(request)
+        if error is not None:
+            return error
+
+        inbound.handle_reply(request.POST.get('From', ''), request.POST.get('Body', ''))
+        return HttpResponse('<?xml version="1.0" encoding="UTF-8"?><Response></Response>', content_type='text/xml')
+
+
+class SMSStatusCallbackView(APIView):
+    """
+    Twilio status callback for messages we send (TWILIO_STATUS_CALLBACK_URL)
+
+    Callbacks are stored and folded in batches, so the status may take
+    up to SMS_STATUS_FLUSH_SECONDS to show up.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        error = twilio_signature_error(request)
+        if error is not None:
+            return error
+
+        delivery.record_callback(
+            request.POST.get('MessageSid', ''),
+            request.POST.get('MessageStatus', ''),
+            request.POST.get('ErrorCode', ''),
+        )
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+class JobDeliveryStatsView(APIView):
+    """
+    API endpoint to count a job's offers by Twilio delivery status
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(Job.objects.only('id'), id=job_id)
+        return Response({
+            'success': True,
+            'job_id': job.id,
+            **delivery.delivery_stats(job),
+        }, status=status.HTTP_200_OK)
+
+
+class CanReadMetrics(BasePermission):
+    """Staff users, or a scraper sending METRICS_TOKEN as a bearer token"""
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class MetricsView(APIView):
+    """
+    Request latency histograms per URL name, in the Prometheus text format
+
+    Figures cover the requests served by the worker process that answers.
+    """
+    permission_classes = [CanReadMetrics]
+
+    def get(self, request):
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
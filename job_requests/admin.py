@@ -4,13 +4,16 @@ from .models import InterpreterContact
 
 @admin.register(InterpreterContact)
 class InterpreterContactAdmin(admin.ModelAdmin):
-    list_display = ['job', 'interpreter', 'contacted_at', 'phone_number']
-    list_filter = ['contacted_at', 'job__date', 'job__status']
+    list_display = ['job', 'interpreter', 'contacted_at', 'phone_number', 'delivery_status']
+    list_filter = ['contacted_at', 'delivery_status', 'job__date', 'job__status']
     search_fields = ['interpreter__first_name', 'interpreter__last_name', 'job__street_address', 'job__city', 'phone_number']
     date_hierarchy = 'contacted_at'
     ordering = ['-contacted_at']
 
-    readonly_fields = ['job', 'interpreter', 'contacted_at', 'message_sent', 'phone_number']
+    readonly_fields = [
+        'job', 'interpreter', 'contacted_at', 'message_sent', 'phone_number',
+        'sid', 'delivery_status', 'delivery_error_code', 'delivery_updated_at',
+    ]
 
     fieldsets = (
         ('Contact Details', {
@@ -19,6 +22,9 @@ class InterpreterContactAdmin(admin.ModelAdmin):
         ('Message', {
             'fields': ('message_sent',)
         }),
+        ('Delivery', {
+            'fields': ('sid', 'delivery_status', 'delivery_error_code', 'delivery_updated_at')
+        }),
     )
 
     def has_add_permission(self, request):
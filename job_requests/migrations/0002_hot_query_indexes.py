@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_hot_query_indexes"),
+        ("job_requests", "0001_initial"),
+        ("jobs", "0013_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="interpretercontact",
+            index=models.Index(fields=["-contacted_at"], name="contact_recent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="interpretercontact",
+            index=models.Index(
+                fields=["job", "-contacted_at"], name="contact_job_recent_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:06
+
+from django.db import migrations, models
+
+from accounts.phone import normalize_phone
+
+
+def normalize_contact_phones(apps, schema_editor):
+    """Store contact numbers in E.164, as log_contacts now does"""
+    InterpreterContact = apps.get_model("job_requests", "InterpreterContact")
+    db_alias = schema_editor.connection.alias
+    changed = []
+    for contact in InterpreterContact.objects.using(db_alias).only("id", "phone_number").iterator():
+        phone_e164 = normalize_phone(contact.phone_number)
+        if phone_e164 and phone_e164 != contact.phone_number:
+            contact.phone_number = phone_e164
+            changed.append(contact)
+    InterpreterContact.objects.using(db_alias).bulk_update(changed, ["phone_number"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_hot_query_indexes"),
+        ("job_requests", "0002_hot_query_indexes"),
+        ("jobs", "0014_job_schedule"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="interpretercontact",
+            index=models.Index(
+                fields=["phone_number", "-contacted_at"],
+                name="contact_phone_recent_idx",
+            ),
+        ),
+        migrations.RunPython(normalize_contact_phones, migrations.RunPython.noop),
+    ]
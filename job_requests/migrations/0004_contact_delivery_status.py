@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_hot_query_indexes"),
+        ("job_requests", "0003_contact_phone_index"),
+        ("jobs", "0014_job_schedule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interpretercontact",
+            name="delivery_error_code",
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name="interpretercontact",
+            name="delivery_status",
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name="interpretercontact",
+            name="delivery_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="interpretercontact",
+            name="sid",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="Message SID"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interpretercontact",
+            index=models.Index(fields=["sid"], name="contact_sid_idx"),
+        ),
+    ]
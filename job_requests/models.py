@@ -11,12 +11,26 @@ class InterpreterContact(models.Model):
     interpreter = models.ForeignKey(InterpreterProfile, on_delete=models.CASCADE, related_name='job_contacts')
     contacted_at = models.DateTimeField(auto_now_add=True)
     message_sent = models.TextField()
+    # E.164 where the number could be normalized, so inbound replies match it exactly
     phone_number = models.CharField(max_length=20)
 
+    # Twilio delivery outcome, kept current by status callbacks
+    sid = models.CharField(max_length=64, blank=True, verbose_name="Message SID")
+    delivery_status = models.CharField(max_length=20, blank=True)
+    delivery_error_code = models.CharField(max_length=10, blank=True)
+    delivery_updated_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         verbose_name = "Interpreter Contact"
         verbose_name_plural = "Interpreter Contacts"
         ordering = ['-contacted_at']
+        indexes = [
+            models.Index(fields=['-contacted_at'], name='contact_recent_idx'),
+            models.Index(fields=['job', '-contacted_at'], name='contact_job_recent_idx'),
+            # Resolves an inbound reply to the offer it answers
+            models.Index(fields=['phone_number', '-contacted_at'], name='contact_phone_recent_idx'),
+            models.Index(fields=['sid'], name='contact_sid_idx'),
+        ]
 
     def __str__(self):
         return f"{self.interpreter} contacted for {self.job} on {self.contacted_at.strftime('%m/%d/%Y %I:%M %p')}"
@@ -1,5 +1,10 @@
 from django.contrib import admin
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
+from . import matching
 from .models import Job
 
 
@@ -12,13 +17,15 @@ class JobAdmin(admin.ModelAdmin):
     ordering = ['-date', '-time']
 
     readonly_fields = ['available_interpreters_display']
+    # A plain select would load every interpreter into the change form
+    autocomplete_fields = ['assigned_interpreter']
 
     fieldsets = (
         ('Job Details', {
-            'fields': ('job_type', 'date', 'time', 'status')
+            'fields': ('job_type', 'date', 'time', 'duration_minutes', 'status')
         }),
         ('Location', {
-            'fields': ('street_address', 'city', 'state', 'zip_code')
+            'fields': ('street_address', 'city', 'state', 'zip_code', 'latitude', 'longitude')
         }),
         ('Languages Needed', {
             'fields': ('amharic', 'farsi', 'mandarin', 'portuguese', 'russian', 'somali', 'spanish', 'tigrinya', 'vietnamese'),
@@ -47,47 +54,56 @@ class JobAdmin(admin.ModelAdmin):
         return ', '.join(languages) if languages else 'None'
     languages_needed.short_description = 'Languages'
 
+    def get_urls(self):
+        urls = [
+            path(
+                '<path:object_id>/matching-interpreters/',
+                self.admin_site.admin_view(self.matching_interpreters_view),
+                name='jobs_job_matching_interpreters',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def matching_interpreters_view(self, request, object_id):
+        """
+        JSON page of interpreters matching a job, for the change form widget
+
+        Query parameters:
+            sort: 'score' (default), 'distance' (geocoded jobs only) or 'name'
+            offset: number of interpreters already loaded
+            limit: interpreters per page (default 15, max 100)
+        """
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            return JsonResponse({'success': False, 'error': 'Job not found'}, status=404)
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+
+        try:
+            sort, offset, limit = matching.page_params(obj, request.GET)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+        page = matching.match_page(obj, sort, offset, limit)
+        return JsonResponse({
+            'success': True,
+            'sort': sort,
+            'results': [matching.match_data(obj, *item) for item in page.items],
+            'total': page.total,
+            'next_offset': page.next_offset,
+        })
+
     def available_interpreters_display(self, obj):
-        """Display available interpreters who match this job's requirements"""
+        """Widget that loads interpreters matching this job's requirements after the page renders"""
         if not obj.id:
             return '-'
 
-        from accounts.models import InterpreterProfile
-
         # Get job's required languages
         job_languages = set(obj.get_languages())
 
         if not job_languages:
             return 'No languages specified for this job'
 
-        # Start with all interpreters
-        interpreters = InterpreterProfile.objects.all()
-
-        # Filter by DSHS certification if required
-        if obj.requires_dshs_certification:
-            interpreters = interpreters.filter(dshs_certified=True)
-
-        # Find interpreters who speak required languages
-        # NOTE: Distance filtering temporarily disabled for performance
-        matching_interpreters = []
-        for interpreter in interpreters:
-            interpreter_languages = set(interpreter.get_languages())
-
-            # Check if interpreter speaks any of the required languages
-            if job_languages.intersection(interpreter_languages):
-                matching_languages = job_languages.intersection(interpreter_languages)
-                matching_interpreters.append({
-                    'interpreter': interpreter,
-                    'languages': matching_languages,
-                    'distance': 0  # Distance calculation disabled temporarily
-                })
-
-        if not matching_interpreters:
-            return 'No matching interpreters found'
-
-        # Sort by interpreter name
-        matching_interpreters.sort(key=lambda x: (x['interpreter'].last_name, x['interpreter'].first_name))
-
         # Generate sample message
         languages_str = ', '.join(sorted(job_languages))
         sample_message = f"""Hello,
@@ -107,39 +123,26 @@ Please respond YES to accept this job. In the event that you need to cancel, YOU
 
 Thank you!"""
 
-        # Format as HTML with checkboxes
-        html = '<div style="margin-top: 10px;" id="interpreter-selector">'
-        html += f'<p style="margin-bottom: 8px; font-weight: bold;">Found {len(matching_interpreters)} matching interpreter(s):</p>'
+        # Interpreters are fetched from matching_interpreters_view once the page has loaded
+        url = reverse('admin:jobs_job_matching_interpreters', args=[obj.pk])
+        sort_options = ''.join(
+            f'<option value="{sort}"{" selected" if sort == matching.default_sort(obj) else ""}>Sort by {sort}</option>'
+            for sort in matching.available_sorts(obj)
+        )
+
+        html = f'<div style="margin-top: 10px;" id="interpreter-selector" data-url="{url}" data-page-size="{matching.PAGE_SIZE_DEFAULT}">'
+        html += '<p style="margin-bottom: 8px; font-weight: bold;"><span id="matching-summary">Loading matching interpreters...</span>'
+        html += f' <select id="matching-sort" style="margin-left: 10px;">{sort_options}</select></p>'
 
         # Select All checkbox
         html += '<div style="margin-bottom: 10px; padding: 10px; background-color: #f3f4f6; border-radius: 4px;">'
         html += '<label style="cursor: pointer;"><input type="checkbox" id="select-all-interpreters" style="margin-right: 8px;"> <strong>Select All</strong></label>'
         html += '</div>'
 
-        # Interpreter list with checkboxes
+        # Interpreter list with checkboxes, filled in page by page
         html += '<div style="max-height: 400px; overflow-y: auto; border: 1px solid #e5e7eb; border-radius: 4px; padding: 10px;">'
-
-        for item in matching_interpreters[:15]:  # Limit to 15
-            interp = item['interpreter']
-            langs = ', '.join(sorted(item['languages']))
-
-            html += f'<div style="margin-bottom: 8px; padding: 8px; border-bottom: 1px solid #e5e7eb;">'
-            html += f'<label style="cursor: pointer; display: flex; align-items: center;">'
-            html += f'<input type="checkbox" class="interpreter-checkbox" '
-            html += f'data-name="{interp.first_name} {interp.last_name}" '
-            html += f'data-email="{interp.email_address}" '
-            html += f'data-phone="{interp.phone_number}" '
-            html += f'style="margin-right: 8px;">'
-            html += f'<span><strong>{interp.first_name} {interp.last_name}</strong> - {langs}'
-            if interp.dshs_certified:
-                html += ' <span style="color: #059669; font-weight: bold;">(DSHS)</span>'
-            html += f' - {interp.city}, {interp.state}'
-            html += f'<br><span style="color: #6B7280; font-size: 0.9em;">📧 {interp.email_address} | 📞 {interp.phone_number}</span>'
-            html += '</span></label></div>'
-
-        if len(matching_interpreters) > 15:
-            html += f'<div style="color: #666; padding: 8px;">...and {len(matching_interpreters) - 15} more</div>'
-
+        html += '<div id="matching-interpreters"></div>'
+        html += '<button type="button" id="load-more-interpreters" style="display: none; padding: 6px 14px; border: 1px solid #d1d5db; border-radius: 6px; background: white; cursor: pointer;">Load more</button>'
         html += '</div>'
 
         # Send Message button
@@ -159,45 +162,124 @@ Thank you!"""
         html += '''
         <script>
         (function() {
-            // Use setTimeout to ensure elements are rendered
-            setTimeout(function() {
-                const selectAll = document.getElementById('select-all-interpreters');
-                const checkboxes = document.querySelectorAll('.interpreter-checkbox');
-                const selectedCount = document.getElementById('selected-count');
-
-                console.log('Initializing interpreter selector');
-                console.log('Select All:', selectAll);
-                console.log('Checkboxes found:', checkboxes.length);
-                console.log('Selected Count:', selectedCount);
-
-                if (!selectAll || !selectedCount) {
-                    console.error('Required elements not found');
-                    return;
+            const selector = document.getElementById('interpreter-selector');
+            const list = document.getElementById('matching-interpreters');
+            const summary = document.getElementById('matching-summary');
+            const sortSelect = document.getElementById('matching-sort');
+            const loadMore = document.getElementById('load-more-interpreters');
+            const selectAll = document.getElementById('select-all-interpreters');
+            const selectedCount = document.getElementById('selected-count');
+            let nextOffset = 0;
+            let total = null;
+            // Bumped when the sort changes so responses for the old order are dropped
+            let generation = 0;
+
+            function updateCount() {
+                const checkboxes = list.querySelectorAll('.interpreter-checkbox');
+                const count = list.querySelectorAll('.interpreter-checkbox:checked').length;
+                selectedCount.textContent = count + ' interpreter' + (count !== 1 ? 's' : '') + ' selected';
+                selectAll.checked = checkboxes.length > 0 && count === checkboxes.length;
+            }
+
+            function addRow(interp) {
+                const row = document.createElement('div');
+                row.style.cssText = 'margin-bottom: 8px; padding: 8px; border-bottom: 1px solid #e5e7eb;';
+                const label = document.createElement('label');
+                label.style.cssText = 'cursor: pointer; display: flex; align-items: center;';
+
+                const checkbox = document.createElement('input');
+                checkbox.type = 'checkbox';
+                checkbox.className = 'interpreter-checkbox';
+                checkbox.dataset.name = interp.name;
+                checkbox.dataset.email = interp.email;
+                checkbox.dataset.phone = interp.phone;
+                checkbox.style.marginRight = '8px';
+
+                const text = document.createElement('span');
+                const name = document.createElement('strong');
+                name.textContent = interp.name;
+                text.appendChild(name);
+                text.appendChild(document.createTextNode(' - ' + interp.languages.join(', ')));
+                if (interp.dshs_certified) {
+                    const dshs = document.createElement('span');
+                    dshs.style.cssText = 'color: #059669; font-weight: bold;';
+                    dshs.textContent = ' (DSHS)';
+                    text.appendChild(dshs);
                 }
-
-                function updateCount() {
-                    const count = document.querySelectorAll('.interpreter-checkbox:checked').length;
-                    console.log('Updating count:', count);
-                    selectedCount.textContent = count + ' interpreter' + (count !== 1 ? 's' : '') + ' selected';
+                let place = ' - ' + interp.city + ', ' + interp.state;
+                if (interp.distance_miles !== null) {
+                    place += ' (' + interp.distance_miles.toFixed(1) + ' mi)';
                 }
-
-                selectAll.addEventListener('change', function() {
-                    console.log('Select all changed:', this.checked);
-                    checkboxes.forEach(cb => cb.checked = this.checked);
-                    updateCount();
+                text.appendChild(document.createTextNode(place));
+                if (interp.score !== undefined) {
+                    const score = document.createElement('span');
+                    score.style.cssText = 'color: #6B7280;';
+                    score.textContent = ' · score ' + interp.score;
+                    text.appendChild(score);
+                }
+                text.appendChild(document.createElement('br'));
+                const contact = document.createElement('span');
+                contact.style.cssText = 'color: #6B7280; font-size: 0.9em;';
+                contact.textContent = '📧 ' + interp.email + ' | 📞 ' + interp.phone;
+                text.appendChild(contact);
+
+                label.appendChild(checkbox);
+                label.appendChild(text);
+                row.appendChild(label);
+                list.appendChild(row);
+            }
+
+            function loadPage() {
+                const requested = generation;
+                loadMore.disabled = true;
+                const params = new URLSearchParams({
+                    sort: sortSelect.value,
+                    offset: nextOffset,
+                    limit: selector.dataset.pageSize
                 });
-
-                checkboxes.forEach(cb => {
-                    cb.addEventListener('change', function() {
-                        console.log('Checkbox changed');
-                        selectAll.checked = Array.from(checkboxes).every(cb => cb.checked);
+                fetch(selector.dataset.url + '?' + params, {credentials: 'same-origin'})
+                    .then(response => response.json())
+                    .then(data => {
+                        if (requested !== generation) {
+                            return;
+                        }
+                        if (!data.success) {
+                            summary.textContent = 'Error: ' + data.error;
+                            return;
+                        }
+                        if (data.total !== null) {
+                            total = data.total;
+                        }
+                        data.results.forEach(addRow);
+                        nextOffset = data.next_offset;
+                        const shown = list.querySelectorAll('.interpreter-checkbox').length;
+                        summary.textContent = total
+                            ? 'Found ' + total + ' matching interpreter(s), showing ' + shown + ':'
+                            : 'No matching interpreters found';
+                        loadMore.style.display = nextOffset !== null ? 'inline-block' : 'none';
+                        loadMore.disabled = false;
                         updateCount();
+                    })
+                    .catch(error => {
+                        summary.textContent = 'Error loading interpreters: ' + error.message;
                     });
-                });
+            }
 
-                // Initial count update
+            selectAll.addEventListener('change', function() {
+                list.querySelectorAll('.interpreter-checkbox').forEach(cb => cb.checked = this.checked);
                 updateCount();
-            }, 100);
+            });
+            list.addEventListener('change', updateCount);
+            loadMore.addEventListener('click', loadPage);
+            sortSelect.addEventListener('change', function() {
+                generation += 1;
+                list.innerHTML = '';
+                nextOffset = 0;
+                total = null;
+                loadPage();
+            });
+
+            loadPage();
 
             window.openMessageDialog = function(sampleMessage, jobId) {
                 const selected = Array.from(document.querySelectorAll('.interpreter-checkbox:checked'));
@@ -263,7 +345,7 @@ Thank you!"""
                 .then(response => response.json())
                 .then(data => {
                     if (data.success) {
-                        alert('Success!\\n\\nMessages sent: ' + data.sent + '\\nFailed: ' + data.failed);
+                        alert('Success!\\n\\nMessages queued: ' + data.queued);
                         // Close dialog
                         document.querySelector('[style*="position: fixed"]').remove();
                     } else {
@@ -0,0 +1,90 @@
+"""
+Job acceptance.
+
+Several interpreters are often offered the same job at once, so accepting
+is a single conditional UPDATE: it only succeeds while the job is still
+open and the interpreter is eligible for it, and the database decides the
+winner. Nobody can overwrite an assignment someone else already won, and
+nobody can accept a job overlapping one they already hold.
+"""
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import board_cache
+from .languages import overlapping_masks
+from .models import Job
+from .schedule import ACTIVE_STATUSES
+
+ACCEPTED = 'accepted'
+NOT_FOUND = 'not_found'
+TAKEN = 'taken'
+INELIGIBLE = 'ineligible'
+CONFLICT = 'conflict'
+
+
+def eligible_jobs(interpreter):
+    """Jobs the interpreter has the languages and certification for"""
+    jobs = Job.objects.filter(language_mask__in=overlapping_masks(interpreter.language_mask))
+    if not interpreter.dshs_certified:
+        jobs = jobs.filter(requires_dshs_certification=False)
+    return jobs
+
+
+def open_jobs():
+    return Job.objects.filter(status='unassigned', assigned_interpreter__isnull=True)
+
+
+def free_jobs(interpreter):
+    """Jobs that don't overlap any of the interpreter's active assignments"""
+    conflicts = Job.objects.filter(
+        assigned_interpreter=interpreter,
+        status__in=ACTIVE_STATUSES,
+        date=OuterRef('date'),
+        time__lt=OuterRef('end_time'),
+        end_time__gt=OuterRef('time'),
+    ).exclude(pk=OuterRef('pk'))
+    return Job.objects.exclude(Exists(conflicts))
+
+
+def accept_job(job_id, interpreter):
+    """
+    Assign the job to the interpreter if it is still open and they are eligible.
+
+    Returns ACCEPTED, NOT_FOUND, TAKEN, INELIGIBLE or CONFLICT. Only ACCEPTED
+    changes anything, and only one caller can ever get it for a given job.
+    """
+    from accounts.earnings import add_job
+    from accounts.models import InterpreterProfile
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update:
+            # Lock the interpreter so two of their accepts for overlapping jobs
+            # can't both pass the conflict check. SQLite has no row locks, but
+            # it only runs one write at a time, so the check can't race there.
+            list(InterpreterProfile.objects.select_for_update().filter(pk=interpreter.pk).values_list('pk'))
+        updated = (open_jobs() & eligible_jobs(interpreter) & free_jobs(interpreter)).filter(id=job_id).update(
+            assigned_interpreter=interpreter,
+            status='assigned',
+            updated_at=timezone.now(),
+        )
+        if updated:
+            # QuerySet.update() skips the Job signals that keep earnings and the
+            # available jobs board current
+            add_job(job_id, interpreter.id, 'assigned')
+
+    if updated:
+        job = Job.objects.filter(id=job_id).values('language_mask', 'requires_dshs_certification').first()
+        if job is not None:
+            board_cache.invalidate(job['language_mask'], job['requires_dshs_certification'])
+        return ACCEPTED
+
+    # Lost: work out why, for the response
+    job = Job.objects.filter(id=job_id).first()
+    if job is None:
+        return NOT_FOUND
+    if job.status != 'unassigned' or job.assigned_interpreter_id is not None:
+        return TAKEN
+    if job.conflicting_assignments(interpreter).exists():
+        return CONFLICT
+    return INELIGIBLE
@@ -0,0 +1,206 @@
+"""
+Cache for the available jobs board.
+
+Every interpreter with the same languages and DSHS status sees the same
+available jobs, so results are cached per (language mask, DSHS flag)
+bucket. Each bucket key embeds a version token for every language it
+covers; when a job changes, only the tokens for that job's languages are
+replaced (and only in the DSHS namespace if the job requires it), so
+exactly the buckets that could show the job stop matching.
+
+Entries are filled from the primary database. They are shared by every
+client and keyed by versions bumped when primary writes commit, so a fill
+from a lagging replica would be served to everyone until it expired.
+
+Each entry carries a digest of its jobs and the time they were read, so
+conditional GETs can be answered from what the cache actually holds.
+
+Tokens are replaced when the change commits. A board read between the
+write and its commit would otherwise cache the old list under the new
+tokens and serve it until the entry expired.
+"""
+import hashlib
+import threading
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from .languages import ALL_LANGUAGES_MASK, LANGUAGE_BITS
+from .models import Job
+
+KEY_PREFIX = 'available-jobs'
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+@dataclass
+class Board:
+    jobs: list
+    # md5 of the jobs' ids and update times
+    digest: str
+    loaded_at: object = None
+
+
+def _board(jobs):
+    raw = '|'.join(f'{job.id}:{job.updated_at.isoformat()}' for job in jobs)
+    return Board(jobs, hashlib.md5(raw.encode()).hexdigest(), timezone.now())
+
+
+EMPTY_BOARD = Board([], hashlib.md5(b'').hexdigest())
+
+
+def get_cache():
+    return caches[settings.AVAILABLE_JOBS_CACHE]
+
+
+def _bits(mask):
+    return [bit for bit in LANGUAGE_BITS.values() if mask & bit]
+
+
+def _version_key(dshs, bit):
+    return f'{KEY_PREFIX}:version:{int(dshs)}:{bit}'
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def stats():
+    """Hit/miss/invalidation counts for this process"""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def bucket_key(language_mask, dshs_certified, today=None):
+    """Cache key for a bucket, including the current version of each of its languages"""
+    if today is None:
+        today = timezone.localdate()
+    cache = get_cache()
+    version_keys = [_version_key(dshs_certified, bit) for bit in _bits(language_mask)]
+    versions = cache.get_many(version_keys)
+
+    # A version that was never set (or was evicted) gets a fresh token, which
+    # makes any data cached under the old one unreachable
+    missing = {key: uuid.uuid4().hex for key in version_keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+
+    tokens = '.'.join(versions[key] for key in version_keys)
+    return f'{KEY_PREFIX}:board:{today.isoformat()}:{language_mask}:{int(dshs_certified)}:{tokens}'
+
+
+async def abucket_key(language_mask, dshs_certified, today=None):
+    """Async version of bucket_key"""
+    if today is None:
+        today = timezone.localdate()
+    cache = get_cache()
+    version_keys = [_version_key(dshs_certified, bit) for bit in _bits(language_mask)]
+    versions = await cache.aget_many(version_keys)
+
+    missing = {key: uuid.uuid4().hex for key in version_keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        versions.update(missing)
+
+    tokens = '.'.join(versions[key] for key in version_keys)
+    return f'{KEY_PREFIX}:board:{today.isoformat()}:{language_mask}:{int(dshs_certified)}:{tokens}'
+
+
+def _available_jobs(interpreter):
+    return Job.objects.using(DEFAULT_DB_ALIAS).available_to(interpreter).order_by('-date', '-time')
+
+
+def board_for(interpreter):
+    """The interpreter's available jobs Board, from the cache when possible"""
+    if not interpreter.language_mask:
+        return EMPTY_BOARD
+
+    cache = get_cache()
+    key = bucket_key(interpreter.language_mask, interpreter.dshs_certified)
+    board = cache.get(key)
+    if board is not None:
+        _count('hits')
+        return board
+
+    _count('misses')
+    board = _board(list(_available_jobs(interpreter)))
+    cache.set(key, board, settings.AVAILABLE_JOBS_CACHE_TIMEOUT)
+    return board
+
+
+async def aboard_for(interpreter):
+    """Async version of board_for, sharing its cache entries"""
+    if not interpreter.language_mask:
+        return EMPTY_BOARD
+
+    cache = get_cache()
+    key = await abucket_key(interpreter.language_mask, interpreter.dshs_certified)
+    board = await cache.aget(key)
+    if board is not None:
+        _count('hits')
+        return board
+
+    _count('misses')
+    board = _board([job async for job in _available_jobs(interpreter)])
+    await cache.aset(key, board, settings.AVAILABLE_JOBS_CACHE_TIMEOUT)
+    return board
+
+
+def available_jobs_for(interpreter):
+    """The interpreter's available jobs, from the cache when possible"""
+    return board_for(interpreter).jobs
+
+
+def invalidate(language_mask, requires_dshs_certification, using=DEFAULT_DB_ALIAS):
+    """
+    Evict every bucket that could list a job with these requirements, once
+    the current transaction on ``using`` commits (immediately outside one).
+    """
+    if not language_mask:
+        return
+    # DSHS-only jobs are never shown to uncertified interpreters
+    namespaces = [True] if requires_dshs_certification else [True, False]
+    version_keys = [_version_key(dshs, bit) for dshs in namespaces for bit in _bits(language_mask)]
+
+    def replace_versions():
+        get_cache().set_many({key: uuid.uuid4().hex for key in version_keys}, timeout=None)
+        _count('invalidations')
+
+    transaction.on_commit(replace_versions, using=using)
+
+
+def board_state(job):
+    """(status, language_mask, requires_dshs_certification) as loaded, without triggering queries"""
+    values = job.__dict__
+    if not all(name in values for name in ('status', 'language_mask', 'requires_dshs_certification')):
+        return None
+    return values['status'], values['language_mask'], values['requires_dshs_certification']
+
+
+def job_changed(old, new, using=DEFAULT_DB_ALIAS):
+    """
+    Invalidate for a job moving from board state ``old`` to ``new``, saved on ``using``.
+
+    Only jobs that are (or were) unassigned can be on the board, but any
+    change to such a job invalidates its buckets since they hold its data.
+    An unknown old state (deferred fields) is treated as visible everywhere.
+    """
+    if old is None:
+        invalidate(ALL_LANGUAGES_MASK, False, using)
+    elif old[0] == 'unassigned':
+        invalidate(old[1], old[2], using)
+    if new is not None and new[0] == 'unassigned' and (old is None or old[0] != 'unassigned' or old[1:] != new[1:]):
+        invalidate(new[1], new[2], using)
@@ -0,0 +1,178 @@
+"""
+Distance helpers for matching interpreters to jobs.
+
+Both Job and InterpreterProfile store latitude/longitude plus ``geo_cell``,
+the cell of a fixed GRID_DEGREES grid the point falls in, indexed together
+with the coordinates. A radius search looks up the handful of cells its
+bounding box covers (an index lookup per cell, where a (latitude, longitude)
+index could only range-scan a band of latitude across the whole map), then
+ranks only those candidates by great-circle distance.
+
+Coordinates belong to an address, so saving a new address without new
+coordinates clears them (geocode_addresses fills them in again).
+"""
+import heapq
+from math import asin, cos, floor, radians, sin, sqrt
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Miles per degree of latitude (roughly constant everywhere)
+MILES_PER_DEGREE_LAT = 69.0
+
+# Grid cells are this many degrees on a side, about 17 miles north to south
+GRID_DEGREES = 0.25
+GRID_COLUMNS = round(360 / GRID_DEGREES)
+# Bounding boxes covering more cells than this only use the coordinate ranges
+MAX_GRID_CELLS = 400
+
+ADDRESS_FIELDS = ('street_address', 'city', 'state', 'zip_code')
+COORDINATE_FIELDS = ('latitude', 'longitude')
+LOADED_LOCATION_ATTR = '_loaded_location'
+
+
+def haversine_miles(lat1, lng1, lat2, lng2):
+    """Great-circle distance in miles between two points"""
+    lat1, lng1, lat2, lng2 = map(radians, (lat1, lng1, lat2, lng2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * asin(sqrt(a))
+
+
+def bounding_box(latitude, longitude, radius_miles):
+    """Return (min_lat, max_lat, min_lng, max_lng) enclosing the radius"""
+    lat_delta = radius_miles / MILES_PER_DEGREE_LAT
+    # Longitude degrees shrink towards the poles; clamp to avoid dividing by ~0
+    lng_delta = radius_miles / (MILES_PER_DEGREE_LAT * max(cos(radians(latitude)), 0.01))
+    return (
+        latitude - lat_delta,
+        latitude + lat_delta,
+        longitude - lng_delta,
+        longitude + lng_delta,
+    )
+
+
+def _grid_row(latitude):
+    return floor((min(max(latitude, -90), 90) + 90) / GRID_DEGREES)
+
+
+def _grid_column(longitude):
+    return floor((longitude + 180) / GRID_DEGREES)
+
+
+def grid_cell(latitude, longitude):
+    """The grid cell containing a point, or None without coordinates"""
+    if latitude is None or longitude is None:
+        return None
+    return _grid_row(latitude) * GRID_COLUMNS + _grid_column(longitude) % GRID_COLUMNS
+
+
+def grid_cells(min_lat, max_lat, min_lng, max_lng):
+    """Every cell overlapping a bounding box, or None if there are more than MAX_GRID_CELLS"""
+    rows = range(_grid_row(min_lat), _grid_row(max_lat) + 1)
+    first_column, last_column = _grid_column(min_lng), _grid_column(max_lng)
+    if len(rows) * (last_column - first_column + 1) > MAX_GRID_CELLS:
+        return None
+    # Columns wrap around at the antimeridian
+    columns = {column % GRID_COLUMNS for column in range(first_column, last_column + 1)}
+    return [row * GRID_COLUMNS + column for row in rows for column in sorted(columns)]
+
+
+def remember_location(obj, update_fields=None):
+    """
+    Note the address and coordinates ``obj`` has in the database, after
+    loading it or saving ``update_fields`` (None for every field)
+    """
+    names = ADDRESS_FIELDS + COORDINATE_FIELDS
+    values = obj.__dict__
+    loaded = getattr(obj, LOADED_LOCATION_ATTR, None)
+    if update_fields is not None:
+        if loaded is not None:
+            setattr(obj, LOADED_LOCATION_ATTR, tuple(
+                values[name] if name in update_fields else value for name, value in zip(names, loaded)
+            ))
+    elif all(name in values for name in names):
+        # Rows loaded with only() or defer() aren't tracked
+        setattr(obj, LOADED_LOCATION_ATTR, tuple(values[name] for name in names))
+
+
+def refresh_location(obj, update_fields=None):
+    """
+    Before saving ``obj``: clear coordinates left over from a previous
+    address, and set geo_cell from the coordinates.
+
+    Returns the fields changed, to be added to ``update_fields``.
+    """
+    if update_fields is not None and not set(update_fields) & {*ADDRESS_FIELDS, *COORDINATE_FIELDS}:
+        return set()
+    changed = {'geo_cell'}
+    loaded = getattr(obj, LOADED_LOCATION_ATTR, None)
+    if loaded is not None:
+        loaded_address = dict(zip(ADDRESS_FIELDS, loaded))
+        loaded_coordinates = loaded[len(ADDRESS_FIELDS):]
+        saved_address = [name for name in ADDRESS_FIELDS if update_fields is None or name in update_fields]
+        moved = any(getattr(obj, name) != loaded_address[name] for name in saved_address)
+        if moved and tuple(getattr(obj, name) for name in COORDINATE_FIELDS) == loaded_coordinates:
+            obj.latitude = obj.longitude = None
+            changed.update(COORDINATE_FIELDS)
+    obj.geo_cell = grid_cell(obj.latitude, obj.longitude)
+    return changed
+
+
+def rank_by_distance(candidates, latitude, longitude, radius_miles, limit=None):
+    """
+    Rank ``(id, lat, lng)`` tuples by distance from a point.
+
+    The whole candidate batch is processed in one pass with the trig terms
+    for the origin hoisted out of the loop. Returns ``(id, miles)`` tuples
+    within the radius, nearest first.
+    """
+    lat0 = radians(latitude)
+    lng0 = radians(longitude)
+    cos_lat0 = cos(lat0)
+    diameter = 2 * EARTH_RADIUS_MILES
+
+    in_range = []
+    for pk, lat, lng in candidates:
+        lat1 = radians(lat)
+        a = sin((lat1 - lat0) / 2) ** 2 + cos_lat0 * cos(lat1) * sin((radians(lng) - lng0) / 2) ** 2
+        miles = diameter * asin(sqrt(a))
+        if miles <= radius_miles:
+            in_range.append((miles, pk))
+
+    if limit is not None:
+        ranked = heapq.nsmallest(limit, in_range)
+    else:
+        ranked = sorted(in_range)
+    return [(pk, miles) for miles, pk in ranked]
+
+
+def nearest(queryset, latitude, longitude, radius_miles, limit=None):
+    """
+    Return ``(id, miles)`` for rows of ``queryset`` within ``radius_miles``.
+
+    Rows without coordinates are never returned.
+    """
+    candidates = within_box(queryset, latitude, longitude, radius_miles).values_list('id', 'latitude', 'longitude')
+    return rank_by_distance(candidates, latitude, longitude, radius_miles, limit)
+
+
+def within_box(queryset, latitude, longitude, radius_miles):
+    """Rows of ``queryset`` in the bounding box around the radius"""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_miles)
+    cells = grid_cells(min_lat, max_lat, min_lng, max_lng)
+    if cells is not None:
+        queryset = queryset.filter(geo_cell__in=cells)
+    return queryset.filter(
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lng, max_lng),
+    )
+
+
+def geocode_address(address, geocoder=None):
+    """Look up ``(latitude, longitude)`` for an address, or None if not found"""
+    if geocoder is None:
+        from geopy.geocoders import Nominatim
+        geocoder = Nominatim(user_agent='laango')
+    location = geocoder.geocode(address)
+    if location is None:
+        return None
+    return location.latitude, location.longitude
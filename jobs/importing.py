@@ -0,0 +1,164 @@
+"""
+Bulk job import from CSV or JSON facility schedules.
+
+Rows are validated and deduplicated a chunk at a time, and each chunk's new
+jobs are inserted with one bulk_create inside a transaction. A chunk costs
+one query to look up existing jobs and one batch insert, so a file of
+thousands of rows takes a few dozen queries rather than a few per row.
+
+Imported jobs are always unassigned. bulk_create skips Job.save() and the
+Job signals, so the derived fields are filled in here and the available
+jobs board is invalidated once at the end.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from rest_framework import serializers
+
+from . import board_cache
+from .geo import grid_cell
+from .languages import LANGUAGE_BITS
+from .models import Job
+from .schedule import compute_end_time
+from .serializers import JobImportSerializer
+
+CHUNK_SIZE = 500
+
+
+class ImportFileError(ValueError):
+    """The file itself could not be read, as opposed to individual bad rows"""
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    # Row numbers of rows matching an existing job or an earlier row
+    duplicates: list = field(default_factory=list)
+    # {'row': number, 'errors': {field: [messages]}} for rows that failed validation
+    errors: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'duplicates': self.duplicates,
+            'errors': self.errors,
+        }
+
+
+def read_csv(text):
+    """Rows from CSV text with a header line; empty cells are left out so defaults apply"""
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise ImportFileError('CSV file has no header row')
+    return [
+        {key.strip(): value for key, value in row.items() if key and value not in (None, '')}
+        for row in reader
+    ]
+
+
+def read_json(data):
+    """Rows from parsed JSON: a list of objects, or an object with a "jobs" list"""
+    if isinstance(data, (str, bytes)):
+        try:
+            data = json.loads(data)
+        except ValueError as e:
+            raise ImportFileError(f'Invalid JSON: {e}')
+    if isinstance(data, dict):
+        data = data.get('jobs')
+    if not isinstance(data, list):
+        raise ImportFileError('Expected a list of jobs')
+    return data
+
+
+def read_file(name, content):
+    """Rows from an uploaded file's name and raw bytes"""
+    try:
+        text = content.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ImportFileError('File must be UTF-8 encoded')
+    if name.lower().endswith('.csv'):
+        return read_csv(text)
+    return read_json(text)
+
+
+def dedupe_key(date, time, street_address, city, state, zip_code, language_mask):
+    """What makes two jobs the same appointment"""
+    return (
+        date, time, street_address.strip().lower(), city.strip().lower(), state.strip().upper(),
+        zip_code.strip(), language_mask,
+    )
+
+
+def _existing_keys(rows):
+    dates = {data['date'] for _, data in rows}
+    existing = Job.objects.filter(date__in=dates).values_list(
+        'date', 'time', 'street_address', 'city', 'state', 'zip_code', 'language_mask',
+    )
+    return {dedupe_key(*values) for values in existing}
+
+
+def _build_job(data):
+    language_mask = data.pop('languages')
+    job = Job(
+        **data,
+        language_mask=language_mask,
+        end_time=compute_end_time(data['time'], data['duration_minutes']),
+        geo_cell=grid_cell(data.get('latitude'), data.get('longitude')),
+        status='unassigned',
+    )
+    for language, bit in LANGUAGE_BITS.items():
+        setattr(job, language, bool(language_mask & bit))
+    return job
+
+
+def import_jobs(rows, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Validate, deduplicate and insert ``rows`` (dicts of JobImportSerializer
+    fields). Row numbers in the result count from 1.
+
+    With ``dry_run`` nothing is written but the result is the same.
+    """
+    result = ImportResult()
+    validator = JobImportSerializer()
+    seen = set()
+    # (language mask, requires DSHS) of everything inserted, for the board cache
+    inserted = set()
+
+    for offset in range(0, len(rows), chunk_size):
+        valid = []
+        for number, row in enumerate(rows[offset:offset + chunk_size], start=offset + 1):
+            if not isinstance(row, dict):
+                result.errors.append({'row': number, 'errors': {'non_field_errors': ['Expected an object.']}})
+                continue
+            try:
+                valid.append((number, validator.run_validation(row)))
+            except serializers.ValidationError as e:
+                result.errors.append({'row': number, 'errors': e.detail})
+        if not valid:
+            continue
+
+        existing = _existing_keys(valid)
+        jobs = []
+        for number, data in valid:
+            key = dedupe_key(
+                data['date'], data['time'], data['street_address'], data['city'], data['state'],
+                data['zip_code'], data['languages'],
+            )
+            if key in existing or key in seen:
+                result.duplicates.append(number)
+                continue
+            seen.add(key)
+            jobs.append(_build_job(dict(data)))
+
+        if jobs and not dry_run:
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs, batch_size=chunk_size)
+            inserted.update((job.language_mask, job.requires_dshs_certification) for job in jobs)
+        result.created += len(jobs)
+
+    for language_mask, requires_dshs in inserted:
+        board_cache.invalidate(language_mask, requires_dshs)
+    return result
@@ -0,0 +1,55 @@
+"""
+Language bitmask helpers shared by Job and InterpreterProfile.
+
+Both models store languages as one BooleanField per language. Each field
+is also packed into a single integer (``language_mask``) so matching can be
+done in SQL instead of comparing Python sets row by row.
+"""
+
+# (field name, display name) in alphabetical order. The position of each
+# entry is its bit in the mask, so only ever append to this list.
+LANGUAGES = [
+    ('amharic', 'Amharic'),
+    ('farsi', 'Farsi'),
+    ('mandarin', 'Mandarin'),
+    ('portuguese', 'Portuguese'),
+    ('russian', 'Russian'),
+    ('somali', 'Somali'),
+    ('spanish', 'Spanish'),
+    ('tigrinya', 'Tigrinya'),
+    ('vietnamese', 'Vietnamese'),
+]
+
+LANGUAGE_FIELDS = [field for field, _ in LANGUAGES]
+
+LANGUAGE_BITS = {field: 1 << bit for bit, (field, _) in enumerate(LANGUAGES)}
+
+ALL_LANGUAGES_MASK = (1 << len(LANGUAGES)) - 1
+
+
+def compute_language_mask(obj):
+    """Return the bitmask for the language booleans set on ``obj``"""
+    mask = 0
+    for field, bit in LANGUAGE_BITS.items():
+        if getattr(obj, field):
+            mask |= bit
+    return mask
+
+
+def languages_from_mask(mask):
+    """Return the display names of the languages in ``mask``"""
+    return [name for bit, (_, name) in enumerate(LANGUAGES) if mask & (1 << bit)]
+
+
+# Display names for every possible mask, so serializing a row is a list lookup
+LANGUAGE_NAMES_BY_MASK = [tuple(languages_from_mask(mask)) for mask in range(ALL_LANGUAGES_MASK + 1)]
+
+
+def overlapping_masks(mask):
+    """
+    Return every mask value that shares at least one language with ``mask``.
+
+    ``language_mask IN (...)`` over this list is equivalent to
+    ``(language_mask & mask) != 0`` but can use a plain b-tree index.
+    """
+    return [value for value in range(1, ALL_LANGUAGES_MASK + 1) if value & mask]
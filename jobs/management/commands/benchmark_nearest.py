@@ -0,0 +1,78 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import InterpreterProfile
+from jobs.geo import grid_cell, haversine_miles, nearest
+from jobs.languages import ALL_LANGUAGES_MASK, overlapping_masks
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark nearest-interpreter ranking against a synthetic dataset (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interpreters', type=int, default=20000)
+        parser.add_argument('--radius', type=float, default=50)
+        parser.add_argument('--limit', type=int, default=15)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+
+        # Spread interpreters over the continental US
+        profiles = []
+        for i in range(options['interpreters']):
+            profiles.append(InterpreterProfile(
+                first_name='Bench',
+                last_name=f'Interpreter {i}',
+                phone_number='',
+                email_address=f'bench{i}@example.com',
+                street_address='',
+                city='',
+                state='WA',
+                zip_code='',
+                latitude=rng.uniform(25.0, 49.0),
+                longitude=rng.uniform(-124.0, -67.0),
+                language_mask=rng.randint(1, ALL_LANGUAGES_MASK),
+            ))
+        for profile in profiles:
+            profile.geo_cell = grid_cell(profile.latitude, profile.longitude)
+        InterpreterProfile.objects.bulk_create(profiles, batch_size=1000)
+
+        origins = [(rng.uniform(30.0, 45.0), rng.uniform(-120.0, -75.0)) for _ in range(options['repeat'])]
+        job_mask = 1 << 6  # Spanish
+        radius = options['radius']
+        limit = options['limit']
+
+        start = time.perf_counter()
+        for lat, lng in origins:
+            nearest(InterpreterProfile.objects.speaking_any(job_mask), lat, lng, radius, limit)
+        indexed = (time.perf_counter() - start) / len(origins)
+
+        start = time.perf_counter()
+        for lat, lng in origins:
+            rows = InterpreterProfile.objects.filter(
+                language_mask__in=overlapping_masks(job_mask)
+            ).values_list('id', 'latitude', 'longitude')
+            distances = sorted(
+                (haversine_miles(lat, lng, row_lat, row_lng), pk) for pk, row_lat, row_lng in rows
+            )
+            [pk for miles, pk in distances if miles <= radius][:limit]
+        full_scan = (time.perf_counter() - start) / len(origins)
+
+        self.stdout.write(f'{options["interpreters"]} interpreters, radius {radius} mi, top {limit}')
+        self.stdout.write(f'  grid cells + ranking:   {indexed * 1000:.2f} ms/query')
+        self.stdout.write(f'  full scan:              {full_scan * 1000:.2f} ms/query')
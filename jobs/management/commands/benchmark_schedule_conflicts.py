@@ -0,0 +1,123 @@
+import datetime
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from accounts.models import InterpreterProfile
+from jobs.languages import ALL_LANGUAGES_MASK, LANGUAGE_BITS
+from jobs.matching import matching_interpreters
+from jobs.models import Job
+from jobs.schedule import compute_end_time
+
+# Indexes that can answer "does this interpreter have an overlapping job"
+SCHEDULE_INDEXES = ['job_schedule_idx', 'job_interpreter_recent_idx']
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark schedule conflict checks on accept and busy-interpreter exclusion in matching '
+        'against a synthetic dataset (rolled back afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interpreters', type=int, default=5000)
+        parser.add_argument('--jobs', type=int, default=200000)
+        parser.add_argument('--days', type=int, default=730, help='Days of history the jobs are spread over')
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        today = datetime.date.today()
+
+        InterpreterProfile.objects.bulk_create([
+            InterpreterProfile(
+                first_name='Bench',
+                last_name=f'Interpreter {i}',
+                phone_number='',
+                email_address=f'bench{i}@example.com',
+                street_address='',
+                city='',
+                state='WA',
+                zip_code='',
+                language_mask=rng.randint(1, ALL_LANGUAGES_MASK),
+            )
+            for i in range(options['interpreters'])
+        ], batch_size=1000)
+        interpreters = list(InterpreterProfile.objects.values_list('id', flat=True))
+
+        jobs = []
+        for _ in range(options['jobs']):
+            start = datetime.time(rng.randint(7, 18), rng.choice([0, 15, 30, 45]))
+            duration = rng.choice([60, 90, 120, 180])
+            status = rng.choices(['completed', 'assigned', 'unassigned', 'cancelled'], [70, 15, 10, 5])[0]
+            jobs.append(Job(
+                date=today - datetime.timedelta(days=rng.randint(-60, options['days'])),
+                time=start,
+                duration_minutes=duration,
+                end_time=compute_end_time(start, duration),
+                status=status,
+                assigned_interpreter_id=None if status == 'unassigned' else rng.choice(interpreters),
+                spanish=True,
+                language_mask=LANGUAGE_BITS['spanish'],
+            ))
+        Job.objects.bulk_create(jobs, batch_size=1000)
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+            elif connection.vendor == 'postgresql':
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(Job._meta.db_table)}')
+
+        open_jobs = list(Job.objects.filter(status='unassigned', date__gte=today))
+        samples = [(rng.choice(open_jobs), rng.choice(interpreters)) for _ in range(options['repeat'])]
+
+        self.stdout.write(
+            f'{options["interpreters"]} interpreters, {options["jobs"]} jobs, {options["repeat"]} samples'
+        )
+        self.stdout.write(f'  conflict check on accept:       {self.time_conflict_checks(samples):.3f} ms')
+        anti_join, two_queries = self.time_matching([job for job, _ in samples[:20]])
+        self.stdout.write(f'  matching, one anti-join:        {anti_join:.2f} ms')
+        self.stdout.write(f'  matching, busy set in Python:   {two_queries:.2f} ms')
+
+        # Dropped inside the transaction, so they come back on rollback
+        with connection.cursor() as cursor:
+            for name in SCHEDULE_INDEXES:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+        self.stdout.write(f'  conflict check, date index only: {self.time_conflict_checks(samples):.3f} ms')
+
+    def time_conflict_checks(self, samples):
+        start = time.perf_counter()
+        for job, interpreter_id in samples:
+            job.conflicting_assignments(interpreter_id).exists()
+        return (time.perf_counter() - start) / len(samples) * 1000
+
+    def time_matching(self, jobs):
+        start = time.perf_counter()
+        for job in jobs:
+            list(matching_interpreters(job).values_list('id', flat=True))
+        anti_join = (time.perf_counter() - start) / len(jobs) * 1000
+
+        start = time.perf_counter()
+        for job in jobs:
+            busy = set(
+                Job.objects.overlapping(job.date, job.time, job.end_time)
+                .exclude(pk=job.pk)
+                .values_list('assigned_interpreter', flat=True)
+            )
+            candidates = InterpreterProfile.objects.speaking_any(job).values_list('id', flat=True)
+            [pk for pk in candidates if pk not in busy]
+        two_queries = (time.perf_counter() - start) / len(jobs) * 1000
+        return anti_join, two_queries
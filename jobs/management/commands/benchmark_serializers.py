@@ -0,0 +1,99 @@
+import datetime
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from accounts.models import InterpreterProfile
+from jobs.languages import LANGUAGE_FIELDS, LANGUAGE_BITS
+from jobs.models import Job
+from jobs.schedule import compute_end_time
+from jobs.serializers import JobSerializer, job_rows, serialize_job_rows
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark JobSerializer against the values()-based fast path on synthetic jobs '
+        '(rolled back afterwards), checking both render identical JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--interpreters', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        sizes = sorted(options['sizes'])
+
+        InterpreterProfile.objects.bulk_create([
+            InterpreterProfile(
+                first_name='Bench',
+                last_name=f'Interpreter {i}',
+                phone_number='',
+                email_address=f'bench{i}@example.com',
+                street_address='',
+                city='',
+                state='WA',
+                zip_code='',
+            )
+            for i in range(options['interpreters'])
+        ], batch_size=1000)
+        interpreters = list(InterpreterProfile.objects.values_list('id', flat=True))
+
+        today = datetime.date.today()
+        jobs = []
+        for i in range(sizes[-1]):
+            spoken = rng.sample(LANGUAGE_FIELDS, rng.randint(1, 3))
+            assigned = rng.random() < 0.8
+            start = datetime.time(rng.randint(7, 18), rng.choice([0, 15, 30, 45]))
+            jobs.append(Job(
+                street_address=f'{i} Main St',
+                city='Seattle',
+                state='WA',
+                zip_code='98101',
+                date=today + datetime.timedelta(days=rng.randint(-365, 90)),
+                time=start,
+                end_time=compute_end_time(start, 60),
+                status='assigned' if assigned else 'unassigned',
+                requires_dshs_certification=rng.random() < 0.2,
+                payment=rng.randint(50, 300),
+                mileage_included=rng.random() < 0.5,
+                assigned_interpreter_id=rng.choice(interpreters) if assigned else None,
+                language_mask=sum(LANGUAGE_BITS[language] for language in spoken),
+                **{language: True for language in spoken},
+            ))
+        Job.objects.bulk_create(jobs, batch_size=1000)
+
+        renderer = JSONRenderer()
+        self.stdout.write(f'{"rows":>8}  {"JobSerializer":>14}  {"fast path":>10}  speedup')
+        for size in sizes:
+            queryset = Job.objects.order_by('-date', '-time', '-id')[:size]
+
+            start = time.perf_counter()
+            slow = renderer.render(JobSerializer(queryset.select_related('assigned_interpreter'), many=True).data)
+            slow_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            fast = renderer.render(serialize_job_rows(job_rows(queryset)))
+            fast_seconds = time.perf_counter() - start
+
+            if fast != slow:
+                raise CommandError(f'Fast path output differs from JobSerializer at {size} rows')
+            self.stdout.write(
+                f'{size:>8}  {slow_seconds * 1000:>11.1f} ms  {fast_seconds * 1000:>7.1f} ms  '
+                f'{slow_seconds / fast_seconds:.1f}x'
+            )
+        self.stdout.write(self.style.SUCCESS('Output identical at every size'))
@@ -0,0 +1,223 @@
+import datetime
+import random
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from accounts.models import InterpreterProfile
+from job_requests.models import InterpreterContact
+from jobs.geo import grid_cell, within_box
+from jobs.languages import LANGUAGE_BITS
+from jobs.models import Job
+from jobs.schedule import compute_end_time
+
+
+class Rollback(Exception):
+    pass
+
+
+# Rough share of interpreters speaking each language; most speak one or two
+LANGUAGE_WEIGHTS = {
+    'spanish': 50,
+    'russian': 10,
+    'vietnamese': 10,
+    'mandarin': 8,
+    'somali': 6,
+    'portuguese': 6,
+    'amharic': 4,
+    'farsi': 4,
+    'tigrinya': 2,
+}
+
+STATUS_WEIGHTS = {
+    'completed': 70,
+    'assigned': 15,
+    'cancelled': 8,
+    'unassigned': 5,
+    'in_progress': 2,
+}
+
+STATES = ['WA', 'OR', 'ID', 'CA', 'MT']
+
+TABLES = {
+    Job._meta.db_table,
+    InterpreterProfile._meta.db_table,
+    InterpreterContact._meta.db_table,
+}
+
+
+def hot_queries(interpreter, job, today):
+    """(name, queryset) for each query shape the views and admin run"""
+    jobs_page = interpreter.jobs.order_by('-date', '-time', '-id')
+    last = jobs_page[5:6].get() if jobs_page[5:6].exists() else None
+
+    queries = [
+        ('available jobs board', Job.objects.available_to(interpreter, start=today).order_by('-date', '-time')),
+        ('interpreter jobs, first page', jobs_page[:11]),
+        ('job admin changelist', Job.objects.order_by('-date', '-time')[:100]),
+        ('job admin, status filter', Job.objects.filter(status='assigned').order_by('-date', '-time')[:100]),
+        ('job admin, state filter', Job.objects.filter(state='WA').order_by('-date', '-time')[:100]),
+        ('job admin, DSHS filter', Job.objects.filter(requires_dshs_certification=True).order_by('-date', '-time')[:100]),
+        ('interpreter admin changelist', InterpreterProfile.objects.order_by('last_name', 'first_name')[:100]),
+        ('matching interpreters', InterpreterProfile.objects.speaking_any(job).order_by('last_name', 'first_name')[:15]),
+        ('free matching interpreters', InterpreterProfile.objects.speaking_any(job).free_for(job).values_list('id', 'language_mask')),
+        ('schedule conflicts', job.conflicting_assignments(interpreter)),
+        ('nearest interpreters', within_box(
+            InterpreterProfile.objects.all(), 47.6, -122.3, 50,
+        ).values_list('id', 'latitude', 'longitude')),
+        ('interpreters by phone', InterpreterProfile.objects.with_phone_numbers(['+12065550001', '+12065550002'])),
+        ('contact admin changelist', InterpreterContact.objects.order_by('-contacted_at')[:100]),
+        ('contacts for a job', InterpreterContact.objects.filter(job=job).order_by('-contacted_at')),
+    ]
+    if last is not None:
+        queries.append(('interpreter jobs, deep page', jobs_page.filter(
+            Q(date__lt=last.date)
+            | Q(date=last.date, time__lt=last.time)
+            | Q(date=last.date, time=last.time, id__lt=last.id)
+        )[:11]))
+    return queries
+
+
+def sequential_scans(plan):
+    """Names of our tables that ``plan`` reads with a full table scan"""
+    if connection.vendor == 'postgresql':
+        tables = re.findall(r'Seq Scan on (\w+)', plan)
+    elif connection.vendor == 'sqlite':
+        # "SCAN table" is a table scan; "SCAN table USING INDEX ..." is not
+        tables = re.findall(r'\bSCAN (\w+)(?:\s+AS \w+)?\s*$', plan, flags=re.MULTILINE)
+    else:
+        return None
+    return [table for table in tables if table in TABLES]
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the hot view/admin queries against a large synthetic dataset (rolled back '
+        'afterwards) and fail if any of them does a sequential scan'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=50000)
+        parser.add_argument('--interpreters', type=int, default=5000)
+        parser.add_argument('--contacts', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not just failures')
+
+    def handle(self, *args, **options):
+        failures = []
+        try:
+            with transaction.atomic():
+                failures = self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError('Sequential scans in: ' + ', '.join(failures))
+        self.stdout.write(self.style.SUCCESS('No sequential scans in hot queries'))
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        today = timezone.localdate()
+        interpreters = self.create_interpreters(rng, options['interpreters'])
+        jobs = self.create_jobs(rng, options['jobs'], interpreters, today)
+        self.create_contacts(rng, options['contacts'], interpreters, jobs)
+        self.analyze()
+
+        interpreter = InterpreterProfile.objects.get(pk=interpreters[0])
+        job = Job.objects.filter(tigrinya=True).first() or Job.objects.first()
+
+        failures = []
+        for name, queryset in hot_queries(interpreter, job, today):
+            plan = queryset.explain()
+            scans = sequential_scans(plan)
+            if scans is None:
+                self.stdout.write(f'{name}: cannot check plans on {connection.vendor}')
+                self.stdout.write(plan)
+                continue
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: sequential scan on {", ".join(sorted(set(scans)))}'))
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(f'{name}: ok')
+                if options['verbose_plans']:
+                    self.stdout.write(plan)
+        return failures
+
+    def create_interpreters(self, rng, count):
+        languages = list(LANGUAGE_WEIGHTS)
+        weights = list(LANGUAGE_WEIGHTS.values())
+        profiles = []
+        for i in range(count):
+            spoken = set(rng.choices(languages, weights))
+            if rng.random() < 0.2:
+                spoken.update(rng.choices(languages, weights))
+            profiles.append(InterpreterProfile(
+                first_name=f'First{i}',
+                last_name=f'Last{rng.randrange(count):06d}',
+                phone_number=f'+1{2060000000 + i}',
+                phone_e164=f'+1{2060000000 + i}',
+                email_address=f'interpreter{i}@example.com',
+                street_address='1 Main St',
+                city='Seattle',
+                state=rng.choice(STATES),
+                zip_code='98101',
+                dshs_certified=rng.random() < 0.3,
+                latitude=rng.uniform(42.0, 49.0),
+                longitude=rng.uniform(-124.5, -116.5),
+                language_mask=sum(LANGUAGE_BITS[language] for language in spoken),
+                **{language: True for language in spoken},
+            ))
+        for profile in profiles:
+            profile.geo_cell = grid_cell(profile.latitude, profile.longitude)
+        InterpreterProfile.objects.bulk_create(profiles, batch_size=1000)
+        return list(InterpreterProfile.objects.values_list('id', flat=True))
+
+    def create_jobs(self, rng, count, interpreters, today):
+        languages = list(LANGUAGE_WEIGHTS)
+        language_weights = list(LANGUAGE_WEIGHTS.values())
+        statuses = list(STATUS_WEIGHTS)
+        status_weights = list(STATUS_WEIGHTS.values())
+        jobs = []
+        for _ in range(count):
+            language = rng.choices(languages, language_weights)[0]
+            status = rng.choices(statuses, status_weights)[0]
+            start = datetime.time(rng.randint(7, 18), rng.choice([0, 15, 30, 45]))
+            duration = rng.choice([60, 90, 120])
+            jobs.append(Job(
+                date=today + datetime.timedelta(days=rng.randint(-730, 120)),
+                time=start,
+                duration_minutes=duration,
+                end_time=compute_end_time(start, duration),
+                status=status,
+                state=rng.choice(STATES),
+                requires_dshs_certification=rng.random() < 0.05,
+                payment=rng.randint(50, 300),
+                assigned_interpreter_id=None if status == 'unassigned' else rng.choice(interpreters),
+                language_mask=LANGUAGE_BITS[language],
+                **{language: True},
+            ))
+        Job.objects.bulk_create(jobs, batch_size=1000)
+        return list(Job.objects.values_list('id', flat=True))
+
+    def create_contacts(self, rng, count, interpreters, jobs):
+        contacts = [
+            InterpreterContact(
+                job_id=rng.choice(jobs),
+                interpreter_id=rng.choice(interpreters),
+                message_sent='Synthetic message',
+                phone_number='+12065550000',
+            )
+            for _ in range(count)
+        ]
+        InterpreterContact.objects.bulk_create(contacts, batch_size=1000)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+            elif connection.vendor == 'postgresql':
+                for table in sorted(TABLES):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
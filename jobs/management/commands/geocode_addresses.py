@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from geopy.extra.rate_limiter import RateLimiter
+from geopy.geocoders import Nominatim
+from accounts.models import InterpreterProfile
+from jobs.geo import geocode_address
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Fill in missing latitude/longitude for jobs and interpreters from their addresses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of rows to geocode per model')
+        parser.add_argument('--min-delay', type=float, default=1.0, help='Seconds between geocoder requests')
+
+    def handle(self, *args, **options):
+        geocoder = Nominatim(user_agent='laango')
+        # Nominatim's usage policy allows at most one request per second
+        geocoder.geocode = RateLimiter(geocoder.geocode, min_delay_seconds=options['min_delay'])
+
+        for model in (Job, InterpreterProfile):
+            queryset = model.objects.filter(latitude__isnull=True).order_by('id')
+            if options['limit']:
+                queryset = queryset[:options['limit']]
+
+            found = missing = 0
+            for obj in queryset:
+                coords = geocode_address(obj.get_full_address(), geocoder)
+                if coords is None:
+                    missing += 1
+                    continue
+                obj.latitude, obj.longitude = coords
+                obj.save(update_fields=['latitude', 'longitude'])
+                found += 1
+
+            self.stdout.write(f'{model._meta.verbose_name_plural}: geocoded {found}, not found {missing}')
@@ -0,0 +1,31 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from jobs.importing import CHUNK_SIZE, ImportFileError, import_jobs, read_file
+
+
+class Command(BaseCommand):
+    help = 'Create unassigned jobs in bulk from a CSV or JSON facility schedule, reporting rejected rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row, or JSON list of jobs')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without creating jobs')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as f:
+                rows = read_file(options['path'], f.read())
+        except (OSError, ImportFileError) as e:
+            raise CommandError(str(e))
+
+        result = import_jobs(rows, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+
+        for error in result.errors:
+            self.stderr.write(f'Row {error["row"]}: {json.dumps(error["errors"])}')
+        if result.duplicates:
+            self.stderr.write(f'Skipped {len(result.duplicates)} duplicate rows: {result.duplicates}')
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.created} of {len(rows)} jobs ({len(result.errors)} invalid, '
+            f'{len(result.duplicates)} duplicate)'
+        ))
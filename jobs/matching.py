@@ -0,0 +1,140 @@
+"""
+Interpreters matching a job, one page at a time.
+
+The Job admin fetches these from a JSON endpoint after the change form has
+loaded, so opening a job no longer ranks every candidate up front.
+"""
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from accounts.models import InterpreterProfile
+from . import scoring
+from .geo import haversine_miles, nearest
+from .languages import languages_from_mask
+
+SORT_SCORE = 'score'
+SORT_NAME = 'name'
+SORT_DISTANCE = 'distance'
+SORTS = [SORT_SCORE, SORT_DISTANCE, SORT_NAME]
+
+PAGE_SIZE_DEFAULT = 15
+PAGE_SIZE_MAX = 100
+
+
+@dataclass
+class MatchPage:
+    # (interpreter, miles or None, scoring.Score or None) tuples
+    items: list
+    offset: int
+    has_more: bool
+    # None when it would cost an extra query (name sort past the first page)
+    total: int = None
+
+    @property
+    def next_offset(self):
+        return self.offset + len(self.items) if self.has_more else None
+
+
+def matching_interpreters(job):
+    """
+    Interpreters who speak one of the job's languages, meet its DSHS
+    requirement and aren't booked on another job at the same time
+    """
+    interpreters = InterpreterProfile.objects.speaking_any(job).free_for(job)
+    if job.requires_dshs_certification:
+        interpreters = interpreters.filter(dshs_certified=True)
+    return interpreters
+
+
+def has_coordinates(job):
+    return job.latitude is not None and job.longitude is not None
+
+
+def available_sorts(job):
+    return SORTS if has_coordinates(job) else [SORT_SCORE, SORT_NAME]
+
+
+def default_sort(job):
+    """Best match first"""
+    return SORT_SCORE
+
+
+def _miles(job, interpreter):
+    if not has_coordinates(job) or interpreter.latitude is None or interpreter.longitude is None:
+        return None
+    return haversine_miles(job.latitude, job.longitude, interpreter.latitude, interpreter.longitude)
+
+
+def page_params(job, params):
+    """(sort, offset, limit) from query parameters, raising ValueError for bad values"""
+    try:
+        offset = max(0, int(params.get('offset', 0)))
+        limit = max(1, min(int(params.get('limit', PAGE_SIZE_DEFAULT)), PAGE_SIZE_MAX))
+    except ValueError:
+        raise ValueError('offset and limit must be integers')
+    sort = params.get('sort') or default_sort(job)
+    if sort not in available_sorts(job):
+        raise ValueError(f'Cannot sort by {sort}')
+    return sort, offset, limit
+
+
+def match_page(job, sort=None, offset=0, limit=PAGE_SIZE_DEFAULT):
+    """
+    Return a MatchPage of interpreters for ``job``.
+
+    Sorting by distance only includes interpreters within
+    INTERPRETER_MATCH_RADIUS_MILES; sorting by score or name includes
+    everyone.
+    """
+    if sort is None:
+        sort = default_sort(job)
+    if sort not in available_sorts(job):
+        raise ValueError(f'Cannot sort by {sort!r} for this job')
+
+    interpreters = matching_interpreters(job)
+    if sort == SORT_SCORE:
+        scores = scoring.score_candidates(job, interpreters)
+        window = scoring.best(scores, offset + limit)[offset:]
+        profiles = interpreters.in_bulk([score.interpreter_id for score in window])
+        items = []
+        for score in window:
+            interpreter = profiles[score.interpreter_id]
+            items.append((interpreter, _miles(job, interpreter), score))
+        # Scoring sees every candidate, so the total comes for free
+        return MatchPage(items, offset, offset + limit < len(scores), len(scores))
+
+    if sort == SORT_DISTANCE:
+        ranked = nearest(interpreters, job.latitude, job.longitude, settings.INTERPRETER_MATCH_RADIUS_MILES)
+        window = ranked[offset:offset + limit]
+        profiles = interpreters.in_bulk([pk for pk, _ in window])
+        items = [(profiles[pk], miles, None) for pk, miles in window]
+        return MatchPage(items, offset, offset + limit < len(ranked), len(ranked))
+
+    # One extra row tells us whether there is a next page
+    window = list(interpreters.order_by('last_name', 'first_name', 'id')[offset:offset + limit + 1])
+    total = interpreters.count() if offset == 0 else None
+    return MatchPage(
+        [(interpreter, _miles(job, interpreter), None) for interpreter in window[:limit]],
+        offset,
+        len(window) > limit,
+        total,
+    )
+
+
+def match_data(job, interpreter, miles=None, score=None):
+    """JSON-ready summary of a matching interpreter"""
+    data = {
+        'id': interpreter.id,
+        'name': f"{interpreter.first_name} {interpreter.last_name}",
+        'email': interpreter.email_address,
+        'phone': interpreter.phone_number,
+        'city': interpreter.city,
+        'state': interpreter.state,
+        'dshs_certified': interpreter.dshs_certified,
+        'languages': languages_from_mask(interpreter.language_mask & job.language_mask),
+        'distance_miles': None if miles is None else round(miles, 1),
+    }
+    if score is not None:
+        data.update(score.as_dict())
+    return data
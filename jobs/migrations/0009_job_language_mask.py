@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:33
+
+from django.db import migrations, models
+
+LANGUAGE_FIELDS = [
+    "amharic",
+    "farsi",
+    "mandarin",
+    "portuguese",
+    "russian",
+    "somali",
+    "spanish",
+    "tigrinya",
+    "vietnamese",
+]
+
+
+def backfill_language_mask(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    db_alias = schema_editor.connection.alias
+    jobs = list(Job.objects.using(db_alias).only("id", *LANGUAGE_FIELDS))
+    for job in jobs:
+        job.language_mask = sum(
+            1 << bit
+            for bit, field in enumerate(LANGUAGE_FIELDS)
+            if getattr(job, field)
+        )
+    Job.objects.using(db_alias).bulk_update(jobs, ["language_mask"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0008_job_mileage_included_job_payment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="language_mask",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Bitmask of the language fields above",
+            ),
+        ),
+        migrations.RunPython(backfill_language_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_job_language_mask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(fields=["latitude", "longitude"], name="job_coords_idx"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_interpreterearnings"),
+        ("jobs", "0010_job_latitude_job_longitude_job_job_coords_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["assigned_interpreter", "-date", "-time", "-id"],
+                name="job_interpreter_recent_idx",
+            ),
+        ),
+    ]
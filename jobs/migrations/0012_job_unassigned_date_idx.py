@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_interpreterearnings"),
+        ("jobs", "0011_job_interpreter_recent_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("status", "unassigned")),
+                fields=["date", "time", "language_mask"],
+                name="job_unassigned_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_hot_query_indexes"),
+        ("jobs", "0012_job_unassigned_date_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(fields=["-date", "-time"], name="job_date_time_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["status", "-date", "-time"], name="job_status_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["state", "-date", "-time"], name="job_state_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("requires_dshs_certification", True)),
+                fields=["-date", "-time"],
+                name="job_dshs_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:55
+
+import datetime
+from django.db import migrations, models
+
+from jobs.schedule import compute_end_time
+
+
+def backfill_end_time(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    db_alias = schema_editor.connection.alias
+    jobs = []
+    for job in Job.objects.using(db_alias).only("id", "time", "duration_minutes").iterator(chunk_size=2000):
+        job.end_time = compute_end_time(job.time, job.duration_minutes)
+        jobs.append(job)
+    Job.objects.using(db_alias).bulk_update(jobs, ["end_time"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_hot_query_indexes"),
+        ("jobs", "0013_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="duration_minutes",
+            field=models.PositiveIntegerField(
+                default=60, help_text="Estimated length of the job in minutes"
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="end_time",
+            field=models.TimeField(
+                default=datetime.time(0, 0),
+                editable=False,
+                help_text="Estimated end time, from time and duration",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("status__in", ["assigned", "in_progress"])),
+                fields=["assigned_interpreter", "date", "time", "end_time"],
+                name="job_schedule_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_end_time, migrations.RunPython.noop),
+    ]
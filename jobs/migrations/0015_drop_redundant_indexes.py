@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_hot_query_indexes"),
+        ("jobs", "0014_job_schedule"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="job",
+            name="assigned_interpreter",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="The interpreter assigned to this job",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="jobs",
+                to="accounts.interpreterprofile",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="language_mask",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Bitmask of the language fields above",
+            ),
+        ),
+    ]
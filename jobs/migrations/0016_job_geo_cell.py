@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:20
+
+from django.db import migrations, models
+
+from jobs.geo import grid_cell
+
+
+def backfill_geo_cell(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    db_alias = schema_editor.connection.alias
+    jobs = []
+    located = Job.objects.using(db_alias).filter(latitude__isnull=False, longitude__isnull=False)
+    for job in located.only("id", "latitude", "longitude").iterator(chunk_size=2000):
+        job.geo_cell = grid_cell(job.latitude, job.longitude)
+        jobs.append(job)
+    Job.objects.using(db_alias).bulk_update(jobs, ["geo_cell"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_interpreterprofile_geo_cell"),
+        ("jobs", "0015_drop_redundant_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="job",
+            name="job_coords_idx",
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="geo_cell",
+            field=models.PositiveIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Grid cell of the coordinates (see jobs.geo)",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["geo_cell", "latitude", "longitude"], name="job_geo_cell_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_geo_cell, migrations.RunPython.noop),
+    ]
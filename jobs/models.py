@@ -1,4 +1,50 @@
-from django.db import models
+import datetime
+from django.conf import settings
+from django.db import models, router, transaction
+from django.utils import timezone
+from .geo import refresh_location, remember_location
+from .languages import LANGUAGE_FIELDS, compute_language_mask, overlapping_masks
+from .schedule import ACTIVE_STATUSES, compute_end_time
+
+
+class JobQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # end_time is derived from time and duration in Job.save(), which an
+        # UPDATE bypasses; save() each job instead, or pass end_time as well
+        if kwargs.keys() & {'time', 'duration_minutes'} and 'end_time' not in kwargs:
+            raise ValueError('Updating time or duration_minutes would leave end_time stale')
+        return super().update(**kwargs)
+
+    def overlapping(self, date, start, end):
+        """Active assignments on ``date`` whose time overlaps [start, end)"""
+        return self.filter(status__in=ACTIVE_STATUSES, date=date, time__lt=end, end_time__gt=start)
+
+    def needing_any(self, interpreter_or_mask):
+        """Jobs that need at least one of the interpreter's languages"""
+        mask = getattr(interpreter_or_mask, 'language_mask', interpreter_or_mask)
+        if not mask:
+            return self.none()
+        return self.filter(language_mask__in=overlapping_masks(mask))
+
+    def available_to(self, interpreter, start=None, days=None):
+        """
+        Unassigned jobs the interpreter could accept, from ``start`` (today by
+        default) through the next ``days`` days (AVAILABLE_JOBS_WINDOW_DAYS).
+        """
+        if start is None:
+            start = timezone.localdate()
+        if days is None:
+            days = settings.AVAILABLE_JOBS_WINDOW_DAYS
+        jobs = self.filter(
+            status='unassigned',
+            date__gte=start,
+            date__lt=start + datetime.timedelta(days=days),
+        ).needing_any(interpreter)
+
+        # Filter jobs that require DSHS certification if interpreter doesn't have it
+        if not interpreter.dshs_certified:
+            jobs = jobs.filter(requires_dshs_certification=False)
+        return jobs
 
 
 class Job(models.Model):
@@ -26,16 +72,22 @@ class Job(models.Model):
     spanish = models.BooleanField(default=False, verbose_name="Spanish")
     tigrinya = models.BooleanField(default=False, verbose_name="Tigrinya")
     vietnamese = models.BooleanField(default=False, verbose_name="Vietnamese")
+    language_mask = models.PositiveIntegerField(default=0, editable=False, help_text="Bitmask of the language fields above")
 
     # Job Location
     street_address = models.CharField(max_length=255, default='')
     city = models.CharField(max_length=100, default='')
     state = models.CharField(max_length=2, default='', help_text="Two-letter state code (e.g., WA)")
     zip_code = models.CharField(max_length=10, default='')
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Grid cell of the coordinates (see jobs.geo)")
 
     # Job Details
     date = models.DateField()
     time = models.TimeField()
+    duration_minutes = models.PositiveIntegerField(default=60, help_text="Estimated length of the job in minutes")
+    end_time = models.TimeField(editable=False, help_text="Estimated end time, from time and duration")
     job_type = models.CharField(max_length=50, choices=JOB_TYPE_CHOICES, default='medical')
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='unassigned')
     requires_dshs_certification = models.BooleanField(default=False, help_text="Does this job require DSHS certification?")
@@ -51,19 +103,87 @@ class Job(models.Model):
         null=True,
         blank=True,
         related_name='jobs',
+        # Leads job_interpreter_recent_idx and job_schedule_idx below
+        db_index=False,
         help_text="The interpreter assigned to this job"
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = JobQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date', '-time']
+        indexes = [
+            # Default ordering and the admin changelist filters that go with it
+            models.Index(fields=['-date', '-time'], name='job_date_time_idx'),
+            models.Index(fields=['status', '-date', '-time'], name='job_status_date_idx'),
+            models.Index(fields=['state', '-date', '-time'], name='job_state_date_idx'),
+            models.Index(
+                fields=['-date', '-time'],
+                condition=models.Q(requires_dshs_certification=True),
+                name='job_dshs_date_idx',
+            ),
+            models.Index(fields=['geo_cell', 'latitude', 'longitude'], name='job_geo_cell_idx'),
+            # Keyset pagination of an interpreter's jobs, newest first
+            models.Index(fields=['assigned_interpreter', '-date', '-time', '-id'], name='job_interpreter_recent_idx'),
+            # Schedule conflicts: an interpreter's active assignments by date and time
+            models.Index(
+                fields=['assigned_interpreter', 'date', 'time', 'end_time'],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='job_schedule_idx',
+            ),
+            # The available jobs board only ever looks at unassigned jobs
+            models.Index(
+                fields=['date', 'time', 'language_mask'],
+                condition=models.Q(status='unassigned'),
+                name='job_unassigned_date_idx',
+            ),
+        ]
 
     def __str__(self):
         languages = self.get_languages()
         lang_str = ', '.join(languages) if languages else 'No languages'
         return f"{lang_str} - {self.job_type} on {self.date} at {self.time}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        remember_location(instance)
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.language_mask = compute_language_mask(self)
+        # Fields aren't cleaned before save(), so these may still be strings
+        self.end_time = compute_end_time(
+            self._meta.get_field('time').to_python(self.time),
+            self._meta.get_field('duration_minutes').to_python(self.duration_minutes),
+        )
+        update_fields = kwargs.get('update_fields')
+        location_fields = refresh_location(self, update_fields)
+        if update_fields is not None:
+            update_fields = set(update_fields) | location_fields
+            if update_fields & set(LANGUAGE_FIELDS):
+                update_fields.add('language_mask')
+            if update_fields & {'time', 'duration_minutes'}:
+                update_fields.add('end_time')
+            kwargs['update_fields'] = update_fields
+        # The earnings signals read the stored row before the save and update
+        # totals after it, so all three run in one transaction
+        using = kwargs.get('using') or router.db_for_write(Job, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+        remember_location(self, update_fields)
+
+    def conflicting_assignments(self, interpreter):
+        """The interpreter's other active assignments that overlap this job"""
+        return Job.objects.overlapping(self.date, self.time, self.end_time).filter(
+            assigned_interpreter=interpreter,
+        ).exclude(pk=self.pk)
+
+    def get_full_address(self):
+        return f"{self.street_address}, {self.city}, {self.state} {self.zip_code}"
+
     def get_languages(self):
         """Return a list of languages needed for this job"""
         languages = []
@@ -0,0 +1,24 @@
+"""
+Job schedule helpers.
+
+Each job blocks its interpreter from ``time`` to ``end_time`` on its date.
+``end_time`` is derived from the estimated duration when the job is saved.
+"""
+import datetime
+
+# Jobs that keep their interpreter busy for their duration
+ACTIVE_STATUSES = ['assigned', 'in_progress']
+
+
+def compute_end_time(start, duration_minutes):
+    """
+    ``start`` plus ``duration_minutes``, capped at the end of the day.
+
+    Schedules are compared within a date, so a job running past midnight
+    only blocks the rest of its own day.
+    """
+    start_dt = datetime.datetime.combine(datetime.date.min, start)
+    end_dt = start_dt + datetime.timedelta(minutes=duration_minutes)
+    if end_dt.date() != start_dt.date():
+        return datetime.time.max
+    return end_dt.time()
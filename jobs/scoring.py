@@ -0,0 +1,112 @@
+"""
+Ranking interpreters for a job by how good a match they are.
+
+Every candidate is scored at once from a handful of columns, in a fixed
+number of queries however many candidates there are:
+
+    1. the candidates' language masks and DSHS status
+    2. how often each interpreter has been contacted recently
+
+Candidates are expected to be free at the job's time already
+(matching_interpreters leaves out anyone booked on an overlapping job).
+
+A candidate's score is the weighted sum of its features, so dispatchers see
+the best matches first rather than the alphabetically first.
+"""
+import datetime
+import heapq
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from job_requests.models import InterpreterContact
+from .languages import ALL_LANGUAGES_MASK
+
+# Points for covering every language the job needs (scaled by the share covered)
+LANGUAGE_WEIGHT = 50
+# Points for DSHS certification when the job doesn't require it
+DSHS_WEIGHT = 10
+# Penalty per recent contact, up to RECENT_CONTACTS_CAP contacts
+RECENT_CONTACT_PENALTY = 5
+RECENT_CONTACTS_CAP = 6
+
+# Set bits in every possible language mask
+POPCOUNT = [bin(mask).count('1') for mask in range(ALL_LANGUAGES_MASK + 1)]
+
+
+@dataclass
+class Score:
+    interpreter_id: int
+    score: float
+    language_overlap: float
+    dshs_certified: bool
+    recent_contacts: int
+
+    def as_dict(self):
+        return {
+            'score': round(self.score, 2),
+            'language_overlap': round(self.language_overlap, 2),
+            'recent_contacts': self.recent_contacts,
+        }
+
+
+def recent_contact_counts(since=None):
+    """Contacts per interpreter id since ``since`` (INTERPRETER_MATCH_CONTACT_DAYS ago by default)"""
+    if since is None:
+        since = timezone.now() - datetime.timedelta(days=settings.INTERPRETER_MATCH_CONTACT_DAYS)
+    rows = (
+        InterpreterContact.objects.filter(contacted_at__gte=since)
+        .order_by()
+        .values_list('interpreter')
+        .annotate(count=Count('id'))
+    )
+    return dict(rows)
+
+
+def score_candidates(job, candidates):
+    """
+    Score every candidate for ``job``.
+
+    ``candidates`` is a queryset of InterpreterProfile (usually
+    jobs.matching.matching_interpreters). Returns a list of Score in no
+    particular order.
+    """
+    rows = list(candidates.values_list('id', 'language_mask', 'dshs_certified'))
+    if not rows:
+        return []
+    ids, masks, certified = zip(*rows)
+    contacts = recent_contact_counts()
+
+    # Feature columns, computed column by column over all candidates
+    needed = POPCOUNT[job.language_mask] or 1
+    overlap = [POPCOUNT[mask & job.language_mask] / needed for mask in masks]
+    recent = [contacts.get(pk, 0) for pk in ids]
+    dshs_bonus = 0 if job.requires_dshs_certification else DSHS_WEIGHT
+
+    scores = []
+    for pk, share, dshs, count in zip(ids, overlap, certified, recent):
+        value = (
+            LANGUAGE_WEIGHT * share
+            + (dshs_bonus if dshs else 0)
+            - RECENT_CONTACT_PENALTY * min(count, RECENT_CONTACTS_CAP)
+        )
+        scores.append(Score(pk, value, share, dshs, count))
+    return scores
+
+
+def _rank_key(score):
+    return -score.score, score.interpreter_id
+
+
+def best(scores, limit=None):
+    """``scores`` best first (ties broken by id), at most ``limit`` of them"""
+    if limit is not None:
+        return heapq.nsmallest(limit, scores, key=_rank_key)
+    return sorted(scores, key=_rank_key)
+
+
+def rank(job, candidates, limit=None):
+    """The best ``limit`` candidates for ``job``, best first"""
+    return best(score_candidates(job, candidates), limit)
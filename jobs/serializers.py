@@ -1,4 +1,7 @@
+import re
 from rest_framework import serializers
+from laango.metrics import timed
+from .languages import LANGUAGE_BITS, LANGUAGE_NAMES_BY_MASK, LANGUAGES
 from .models import Job
 
 
@@ -19,6 +22,8 @@ class JobSerializer(serializers.ModelSerializer):
             'full_address',
             'date',
             'time',
+            'duration_minutes',
+            'end_time',
             'job_type',
             'status',
             'requires_dshs_certification',
@@ -29,7 +34,7 @@ class JobSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['end_time', 'created_at', 'updated_at']
 
     def get_languages(self, obj):
         return obj.get_languages()
@@ -41,3 +46,137 @@ class JobSerializer(serializers.ModelSerializer):
         if obj.assigned_interpreter:
             return f"{obj.assigned_interpreter.first_name} {obj.assigned_interpreter.last_name}"
         return None
+
+
+# Columns read by serialize_job_rows, in the order it unpacks them
+JOB_ROW_FIELDS = (
+    'id',
+    'language_mask',
+    'street_address',
+    'city',
+    'state',
+    'zip_code',
+    'date',
+    'time',
+    'duration_minutes',
+    'end_time',
+    'job_type',
+    'status',
+    'requires_dshs_certification',
+    'payment',
+    'mileage_included',
+    'assigned_interpreter',
+    'assigned_interpreter__first_name',
+    'assigned_interpreter__last_name',
+    'created_at',
+    'updated_at',
+)
+
+
+def job_rows(queryset):
+    """
+    ``queryset`` as lightweight named rows for serialize_job_rows.
+
+    Rows have ``date``, ``time`` and ``id`` attributes, so they can be
+    keyset-paginated like Job instances.
+    """
+    return queryset.values_list(*JOB_ROW_FIELDS, named=True)
+
+
+@timed('serialize')
+def serialize_job_rows(rows):
+    """
+    Read-only fast path for JobSerializer(many=True).data.
+
+    Takes rows from job_rows() and renders to the same JSON, without building
+    model instances or running the DRF field machinery for every row. Dates
+    and times still go through JobSerializer's own fields so formatting
+    settings are honoured.
+    """
+    fields = JobSerializer().fields
+    for name in ('created_at', 'updated_at'):
+        # Resolve the active timezone once rather than for every value
+        fields[name].timezone = fields[name].default_timezone()
+    date_repr = fields['date'].to_representation
+    time_repr = fields['time'].to_representation
+    created_repr = fields['created_at'].to_representation
+    updated_repr = fields['updated_at'].to_representation
+
+    data = []
+    for (
+        pk, language_mask, street_address, city, state, zip_code, date, time, duration_minutes,
+        end_time, job_type, status, requires_dshs_certification, payment, mileage_included, interpreter_id, first_name,
+        last_name, created_at, updated_at,
+    ) in rows:
+        data.append({
+            'id': pk,
+            'languages': list(LANGUAGE_NAMES_BY_MASK[language_mask]),
+            'street_address': street_address,
+            'city': city,
+            'state': state,
+            'zip_code': zip_code,
+            'full_address': f"{street_address}, {city}, {state} {zip_code}",
+            'date': date_repr(date),
+            'time': time_repr(time),
+            'duration_minutes': duration_minutes,
+            'end_time': time_repr(end_time),
+            'job_type': job_type,
+            'status': status,
+            'requires_dshs_certification': requires_dshs_certification,
+            'payment': payment,
+            'mileage_included': mileage_included,
+            'assigned_interpreter': interpreter_id,
+            'assigned_interpreter_name': f"{first_name} {last_name}" if interpreter_id is not None else None,
+            'created_at': created_repr(created_at),
+            'updated_at': updated_repr(updated_at),
+        })
+    return data
+
+
+class LanguageListField(serializers.Field):
+    """
+    A list of language names (or one comma/semicolon separated string),
+    validated to a language mask
+    """
+    LOOKUP = {
+        **{field: LANGUAGE_BITS[field] for field, _ in LANGUAGES},
+        **{name.lower(): LANGUAGE_BITS[field] for field, name in LANGUAGES},
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = re.split(r'[,;|]', data)
+        if not isinstance(data, (list, tuple)):
+            raise serializers.ValidationError('Expected a list of languages.')
+        mask = 0
+        for name in data:
+            name = str(name).strip().lower()
+            if not name:
+                continue
+            if name not in self.LOOKUP:
+                raise serializers.ValidationError(f'Unknown language "{name}".')
+            mask |= self.LOOKUP[name]
+        if not mask:
+            raise serializers.ValidationError('At least one language is required.')
+        return mask
+
+    def to_representation(self, value):
+        return list(LANGUAGE_NAMES_BY_MASK[value])
+
+
+class JobImportSerializer(serializers.Serializer):
+    """One row of a bulk job import; ``languages`` validates to a language mask"""
+    date = serializers.DateField()
+    time = serializers.TimeField()
+    duration_minutes = serializers.IntegerField(min_value=1, default=60)
+    languages = LanguageListField()
+    street_address = serializers.CharField(max_length=255)
+    city = serializers.CharField(max_length=100)
+    state = serializers.CharField(max_length=2)
+    zip_code = serializers.CharField(max_length=10)
+    job_type = serializers.ChoiceField(choices=Job.JOB_TYPE_CHOICES, default='medical')
+    requires_dshs_certification = serializers.BooleanField(default=False)
+    payment = serializers.IntegerField(default=0)
+    mileage_included = serializers.BooleanField(default=False)
+    latitude = serializers.FloatField(required=False, allow_null=True, min_value=-90, max_value=90)
+    longitude = serializers.FloatField(required=False, allow_null=True, min_value=-180, max_value=180)
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import board_cache
+from .models import Job
+
+# Attribute on Job instances holding the board state as loaded
+BOARD_SNAPSHOT_ATTR = '_board_snapshot'
+
+
+@receiver(post_init, sender=Job)
+def remember_board_state(sender, instance, **kwargs):
+    setattr(instance, BOARD_SNAPSHOT_ATTR, board_cache.board_state(instance) if instance.pk else ('', 0, False))
+
+
+@receiver(post_save, sender=Job)
+def invalidate_board_on_save(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    new = board_cache.board_state(instance)
+    board_cache.job_changed(getattr(instance, BOARD_SNAPSHOT_ATTR, None), new, using)
+    setattr(instance, BOARD_SNAPSHOT_ATTR, new)
+
+
+@receiver(post_delete, sender=Job)
+def invalidate_board_on_delete(sender, instance, using=None, **kwargs):
+    board_cache.job_changed(board_cache.board_state(instance), None, using)
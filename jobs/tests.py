@@ -0,0 +1,496 @@
+import datetime
+import math
+import threading
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.contrib.auth.models import Permission, User
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import InterpreterProfile
+from laango.factories import make_interpreter, make_job
+from job_requests.models import InterpreterContact
+from . import board_cache, scoring
+from .geo import (
+    EARTH_RADIUS_MILES, MAX_GRID_CELLS, MILES_PER_DEGREE_LAT, bounding_box, grid_cell, grid_cells,
+    haversine_miles, nearest,
+)
+from .importing import import_jobs, read_csv
+from .matching import matching_interpreters
+from .serializers import JobSerializer, job_rows, serialize_job_rows
+from .models import Job
+
+
+class BoardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.spanish = make_interpreter(1)
+        cls.spanish_dshs = make_interpreter(2, dshs_certified=True)
+        cls.somali = make_interpreter(3, spanish=False, somali=True)
+        cls.somali_dshs = make_interpreter(4, spanish=False, somali=True, dshs_certified=True)
+
+    def setUp(self):
+        board_cache.get_cache().clear()
+        board_cache.reset_stats()
+
+    def bucket_keys(self):
+        interpreters = [self.spanish, self.spanish_dshs, self.somali, self.somali_dshs]
+        return {i.pk: board_cache.bucket_key(i.language_mask, i.dshs_certified) for i in interpreters}
+
+    def invalidated_by(self, **job_fields):
+        before = self.bucket_keys()
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(**job_fields)
+        after = self.bucket_keys()
+        return {pk for pk in before if before[pk] != after[pk]}
+
+    def test_job_invalidates_only_matching_buckets(self):
+        self.assertEqual(self.invalidated_by(spanish=True), {self.spanish.pk, self.spanish_dshs.pk})
+        self.assertEqual(self.invalidated_by(spanish=False, somali=True), {self.somali.pk, self.somali_dshs.pk})
+        self.assertEqual(self.invalidated_by(requires_dshs_certification=True), {self.spanish_dshs.pk})
+        self.assertEqual(self.invalidated_by(status='assigned'), set())
+
+    def test_invalidation_waits_for_commit(self):
+        before = self.bucket_keys()
+        with self.captureOnCommitCallbacks() as callbacks:
+            make_job()
+        self.assertEqual(self.bucket_keys(), before)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(self.bucket_keys()[self.spanish.pk], before[self.spanish.pk])
+
+    def test_hit_and_miss_counters(self):
+        board_cache.available_jobs_for(self.spanish)
+        board_cache.available_jobs_for(self.spanish)
+        self.assertEqual(board_cache.stats(), {'hits': 1, 'misses': 1, 'invalidations': 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job()
+        self.assertEqual(len(board_cache.available_jobs_for(self.spanish)), 1)
+        self.assertEqual(board_cache.stats(), {'hits': 1, 'misses': 2, 'invalidations': 1})
+
+
+class BoardCacheCommitTests(TransactionTestCase):
+    def test_read_during_write_transaction_is_not_kept(self):
+        board_cache.get_cache().clear()
+        interpreter = make_interpreter(1)
+
+        def read_board():
+            try:
+                board_cache.available_jobs_for(interpreter)
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            make_job()
+            # Another request fills the cache before the new job is visible to it
+            reader = threading.Thread(target=read_board)
+            reader.start()
+            reader.join()
+
+        self.assertEqual(len(board_cache.available_jobs_for(interpreter)), 1)
+
+
+class AvailableToTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        cls.interpreter = make_interpreter(1, somali=True)
+        cls.certified = make_interpreter(2, dshs_certified=True)
+
+    def available(self, interpreter, **kwargs):
+        return set(Job.objects.available_to(interpreter, **kwargs))
+
+    @override_settings(AVAILABLE_JOBS_WINDOW_DAYS=30)
+    def test_date_window(self):
+        yesterday = make_job(date=self.today - datetime.timedelta(days=1))
+        today = make_job(date=self.today)
+        last_day = make_job(date=self.today + datetime.timedelta(days=29))
+        make_job(date=self.today + datetime.timedelta(days=30))
+        self.assertEqual(self.available(self.interpreter), {today, last_day})
+        self.assertEqual(self.available(self.interpreter, start=yesterday.date, days=2), {yesterday, today})
+
+    def test_status_languages_and_dshs(self):
+        spanish = make_job()
+        somali = make_job(spanish=False, somali=True)
+        russian = make_job(spanish=False, russian=True)
+        dshs = make_job(requires_dshs_certification=True)
+        make_job(status='assigned', assigned_interpreter=self.certified)
+        make_job(status='cancelled')
+
+        self.assertEqual(self.available(self.interpreter), {spanish, somali})
+        self.assertEqual(self.available(self.certified), {spanish, dshs})
+        self.assertNotIn(russian, self.available(self.certified))
+        self.assertEqual(self.available(make_interpreter(3, spanish=False)), set())
+
+    def test_page_lists_newest_first(self):
+        board_cache.get_cache().clear()
+        later = make_job(date=self.today + datetime.timedelta(days=2))
+        sooner = make_job(date=self.today + datetime.timedelta(days=1))
+        make_job(requires_dshs_certification=True)
+        response = self.client.get(reverse('accounts:available-jobs-page', args=[self.interpreter.id]))
+        self.assertEqual(list(response.context['available_jobs']), [later, sooner])
+        self.assertEqual(response.context['total_available'], 2)
+
+
+class ScheduleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.busy = make_interpreter(1)
+        cls.free = make_interpreter(2)
+        cls.booked = make_job(assigned_interpreter=cls.busy, status='assigned', time=datetime.time(9, 0))
+
+    def test_end_time_from_unclean_values(self):
+        job = Job.objects.create(date='2026-11-02', time='09:15', duration_minutes='90', spanish=True)
+        job.refresh_from_db()
+        self.assertEqual(job.end_time, datetime.time(10, 45))
+        late = make_job(time=datetime.time(23, 30), duration_minutes=120)
+        self.assertEqual(late.end_time, datetime.time.max)
+
+    def test_update_of_time_needs_end_time(self):
+        with self.assertRaises(ValueError):
+            Job.objects.filter(pk=self.booked.pk).update(time=datetime.time(11, 0))
+        Job.objects.filter(pk=self.booked.pk).update(time=datetime.time(11, 0), end_time=datetime.time(12, 0))
+
+    def test_free_for_excludes_overlapping_assignments(self):
+        overlapping = make_job(time=datetime.time(9, 30))
+        self.assertEqual(list(InterpreterProfile.objects.free_for(overlapping)), [self.free])
+
+        back_to_back = make_job(time=datetime.time(10, 0))
+        self.assertEqual(set(InterpreterProfile.objects.free_for(back_to_back)), {self.busy, self.free})
+
+        other_day = make_job(date=self.booked.date + datetime.timedelta(days=1), time=datetime.time(9, 0))
+        self.assertIn(self.busy, InterpreterProfile.objects.free_for(other_day))
+
+        # Cancelled jobs don't keep anyone busy
+        Job.objects.filter(pk=self.booked.pk).update(status='cancelled')
+        self.assertIn(self.busy, InterpreterProfile.objects.free_for(overlapping))
+
+    def test_no_redundant_single_column_indexes(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Job._meta.db_table)
+        indexed = [c['columns'] for c in constraints.values() if c['index'] and not c['primary_key']]
+        self.assertIn(['assigned_interpreter_id', 'date', 'time', 'end_time'], indexed)
+        self.assertNotIn(['assigned_interpreter_id'], indexed)
+        self.assertNotIn(['language_mask'], indexed)
+
+    def test_end_time_backfill_migration(self):
+        Job.objects.filter(pk=self.booked.pk).update(end_time=datetime.time(0, 0), duration_minutes=45)
+        migration = import_module('jobs.migrations.0014_job_schedule')
+        migration.backfill_end_time(apps, SimpleNamespace(connection=connection))
+        self.booked.refresh_from_db()
+        self.assertEqual(self.booked.end_time, datetime.time(9, 45))
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        board_cache.get_cache().clear()
+        board_cache.reset_stats()
+
+    def row(self, **fields):
+        return {
+            'date': '2026-11-02',
+            'time': '09:00',
+            'languages': ['spanish'],
+            'street_address': '500 5th Ave',
+            'city': 'Seattle',
+            'state': 'WA',
+            'zip_code': '98104',
+            **fields,
+        }
+
+    def test_duplicates_of_existing_jobs_and_earlier_rows(self):
+        make_job(date=datetime.date(2026, 11, 2), state='WA', zip_code='98104')
+        rows = [
+            self.row(),
+            self.row(time='10:00'),
+            self.row(time='10:00', street_address=' 500 5TH AVE ', city='seattle'),
+            self.row(time='10:00', languages='Spanish, Somali'),
+        ]
+        result = import_jobs(rows)
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.duplicates, [1, 3])
+        self.assertEqual(Job.objects.count(), 3)
+
+        imported = Job.objects.get(time=datetime.time(10, 0), somali=True)
+        self.assertEqual(imported.status, 'unassigned')
+        self.assertTrue(imported.spanish)
+        self.assertEqual(imported.end_time, datetime.time(11, 0))
+
+    def test_imported_coordinates_get_grid_cell(self):
+        import_jobs([self.row(latitude=47.6062, longitude=-122.3321), self.row(time='10:00')])
+        self.assertEqual(Job.objects.get(time=datetime.time(9, 0)).geo_cell, grid_cell(47.6062, -122.3321))
+        self.assertIsNone(Job.objects.get(time=datetime.time(10, 0)).geo_cell)
+
+    def test_bad_rows_are_reported_by_number(self):
+        rows = read_csv(
+            'date,time,languages,street_address,city,state,zip_code,duration_minutes\n'
+            '2026-11-02,09:00,spanish,1 Main St,Seattle,WA,98101,\n'
+            'not a date,09:00,spanish,1 Main St,Seattle,WA,98101,\n'
+            '2026-11-02,10:00,klingon,1 Main St,Seattle,WA,98101,0\n'
+        )
+        result = import_jobs(rows + ['not an object'])
+        self.assertEqual(result.created, 1)
+        self.assertEqual([error['row'] for error in result.errors], [2, 3, 4])
+        self.assertEqual(set(result.errors[0]['errors']), {'date'})
+        self.assertEqual(set(result.errors[1]['errors']), {'languages', 'duration_minutes'})
+        self.assertEqual(set(result.errors[2]['errors']), {'non_field_errors'})
+        self.assertEqual(Job.objects.get().duration_minutes, 60)
+
+    def test_chunk_boundaries(self):
+        rows = [self.row(time=f'{hour:02d}:00') for hour in range(7, 12)]
+        # The last row repeats the first, two chunks later
+        rows.append(self.row(time='07:00', zip_code=' 98104'))
+        rows.insert(3, self.row(date='someday'))
+        # Per chunk: the existing-jobs lookup, and the insert in its own
+        # savepoint; the last chunk is only the duplicate, so inserts nothing
+        with self.assertNumQueries(4 + 4 + 1):
+            result = import_jobs(rows, chunk_size=3)
+        self.assertEqual(result.created, 5)
+        self.assertEqual(result.duplicates, [7])
+        self.assertEqual([error['row'] for error in result.errors], [4])
+        self.assertEqual(
+            sorted(Job.objects.values_list('time', flat=True)),
+            [datetime.time(hour, 0) for hour in range(7, 12)],
+        )
+
+    def test_dry_run_writes_nothing(self):
+        result = import_jobs([self.row(), self.row()], dry_run=True)
+        self.assertEqual((result.created, result.duplicates), (1, [2]))
+        self.assertFalse(Job.objects.exists())
+
+    def test_board_is_invalidated_once(self):
+        interpreter = make_interpreter(1)
+        self.assertEqual(board_cache.available_jobs_for(interpreter), [])
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        rows = [self.row(date=tomorrow.isoformat(), time=f'{hour:02d}:00') for hour in range(7, 17)]
+        with self.captureOnCommitCallbacks(execute=True):
+            import_jobs(rows, chunk_size=3)
+        self.assertEqual(board_cache.stats()['invalidations'], 1)
+        self.assertEqual(len(board_cache.available_jobs_for(interpreter)), 10)
+
+
+class ScoringTests(TestCase):
+    def test_rank_order(self):
+        job = make_job(somali=True)
+        both = make_interpreter(1, somali=True)
+        both_dshs = make_interpreter(2, somali=True, dshs_certified=True)
+        spanish_dshs = make_interpreter(3, dshs_certified=True)
+        contacted = make_interpreter(4, somali=True, dshs_certified=True)
+        busy = make_interpreter(5, somali=True, dshs_certified=True)
+        make_job(assigned_interpreter=busy, status='assigned', time=datetime.time(9, 30))
+        for _ in range(2):
+            InterpreterContact.objects.create(job=job, interpreter=contacted, message_sent='Job offer')
+
+        ranked = scoring.rank(job, matching_interpreters(job))
+        self.assertEqual([score.interpreter_id for score in ranked], [both_dshs.pk, both.pk, contacted.pk, spanish_dshs.pk])
+        self.assertEqual([score.score for score in ranked], [60, 50, 50, 35])
+        self.assertEqual(ranked[3].language_overlap, 0.5)
+        self.assertEqual(ranked[2].recent_contacts, 2)
+        self.assertEqual(scoring.rank(job, matching_interpreters(job), limit=2), ranked[:2])
+
+
+class GeoTests(TestCase):
+    SEATTLE = (47.6062, -122.3321)
+
+    def place(self, index, north_miles=0, east_miles=0):
+        latitude, longitude = self.SEATTLE
+        return make_interpreter(
+            index,
+            latitude=latitude + north_miles / MILES_PER_DEGREE_LAT,
+            longitude=longitude + east_miles / (MILES_PER_DEGREE_LAT * math.cos(math.radians(latitude))),
+        )
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_miles(*self.SEATTLE, 47.2529, -122.4443), 24.9, delta=0.2)
+        self.assertEqual(haversine_miles(*self.SEATTLE, *self.SEATTLE), 0)
+
+    def test_nearest_first(self):
+        far = self.place(1, north_miles=10)
+        near = self.place(2, east_miles=-1)
+        middle = self.place(3, north_miles=-5)
+        self.place(4, north_miles=30)
+        # Inside the bounding box, but its corner is ~25 miles away
+        self.place(5, north_miles=18, east_miles=18)
+        make_interpreter(6)
+
+        ranked = nearest(InterpreterProfile.objects.all(), *self.SEATTLE, 20)
+        self.assertEqual([pk for pk, _ in ranked], [near.pk, middle.pk, far.pk])
+        for (_, miles), expected in zip(ranked, [1, 5, 10]):
+            self.assertAlmostEqual(miles, expected, delta=0.1)
+        self.assertEqual(nearest(InterpreterProfile.objects.all(), *self.SEATTLE, 20, limit=2), ranked[:2])
+        self.assertEqual(nearest(InterpreterProfile.objects.filter(pk=far.pk), *self.SEATTLE, 20), ranked[2:])
+
+    def test_bounding_box_encloses_radius(self):
+        for latitude in (0, 47.6, 70):
+            min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, 10, 25)
+            for degrees in range(0, 360, 15):
+                # The point 25 miles away on this bearing
+                angle = 25 / EARTH_RADIUS_MILES
+                lat1, bearing = math.radians(latitude), math.radians(degrees)
+                lat2 = math.asin(math.sin(lat1) * math.cos(angle) + math.cos(lat1) * math.sin(angle) * math.cos(bearing))
+                lng2 = 10 + math.degrees(math.atan2(
+                    math.sin(bearing) * math.sin(angle) * math.cos(lat1),
+                    math.cos(angle) - math.sin(lat1) * math.sin(lat2),
+                ))
+                with self.subTest(latitude=latitude, bearing=degrees):
+                    self.assertLessEqual(min_lat, math.degrees(lat2))
+                    self.assertLessEqual(math.degrees(lat2), max_lat)
+                    self.assertLessEqual(min_lng, lng2)
+                    self.assertLessEqual(lng2, max_lng)
+
+    def test_grid_cells_cover_bounding_box(self):
+        self.assertIsNone(grid_cell(None, -122.3))
+        box = bounding_box(*self.SEATTLE, 50)
+        cells = grid_cells(*box)
+        min_lat, max_lat, min_lng, max_lng = box
+        for latitude in (min_lat, self.SEATTLE[0], max_lat):
+            for longitude in (min_lng, self.SEATTLE[1], max_lng):
+                self.assertIn(grid_cell(latitude, longitude), cells)
+        self.assertNotIn(grid_cell(max_lat + 1, self.SEATTLE[1]), cells)
+        # Columns wrap at the antimeridian
+        self.assertIn(grid_cell(0, -179.9), grid_cells(-0.1, 0.1, 179.9, 180.1))
+        # Too many cells to list: only the coordinate ranges are used
+        self.assertIsNone(grid_cells(-60, 60, -120, 120))
+        self.assertLessEqual(len(grid_cells(*bounding_box(*self.SEATTLE, 100))), MAX_GRID_CELLS)
+
+    def test_saving_sets_grid_cell(self):
+        interpreter = self.place(1)
+        self.assertEqual(interpreter.geo_cell, grid_cell(*self.SEATTLE))
+        interpreter.latitude, interpreter.longitude = 40.7128, -74.0060
+        interpreter.save(update_fields=['latitude', 'longitude'])
+        interpreter.refresh_from_db()
+        self.assertEqual(interpreter.geo_cell, grid_cell(40.7128, -74.0060))
+        job = make_job(latitude=self.SEATTLE[0], longitude=self.SEATTLE[1])
+        self.assertEqual(Job.objects.get(pk=job.pk).geo_cell, grid_cell(*self.SEATTLE))
+
+    def test_nearest_over_many_cells(self):
+        near = self.place(1, north_miles=60)
+        self.place(2, north_miles=200)
+        self.assertEqual([pk for pk, _ in nearest(InterpreterProfile.objects.all(), *self.SEATTLE, 100)], [near.pk])
+        # A radius too large to list its cells still finds both
+        self.assertEqual(len(nearest(InterpreterProfile.objects.all(), *self.SEATTLE, 3000)), 2)
+
+    def test_new_address_clears_coordinates(self):
+        interpreter = self.place(1)
+        interpreter.street_address = '1 Pike St'
+        interpreter.save()
+        interpreter.refresh_from_db()
+        self.assertEqual((interpreter.latitude, interpreter.longitude, interpreter.geo_cell), (None, None, None))
+
+        job = make_job(latitude=self.SEATTLE[0], longitude=self.SEATTLE[1])
+        job = Job.objects.get(pk=job.pk)
+        job.city = 'Tacoma'
+        job.save(update_fields=['city'])
+        job.refresh_from_db()
+        self.assertEqual((job.latitude, job.longitude, job.geo_cell), (None, None, None))
+
+    def test_new_address_with_coordinates_keeps_them(self):
+        interpreter = InterpreterProfile.objects.get(pk=self.place(1).pk)
+        interpreter.city = 'Tacoma'
+        interpreter.latitude, interpreter.longitude = 47.2529, -122.4443
+        interpreter.save()
+        interpreter.refresh_from_db()
+        self.assertEqual((interpreter.latitude, interpreter.longitude), (47.2529, -122.4443))
+        self.assertEqual(interpreter.geo_cell, grid_cell(47.2529, -122.4443))
+
+        # Saving the same address, or other fields, leaves the coordinates alone
+        interpreter.save()
+        interpreter.first_name = 'Ana'
+        interpreter.save(update_fields=['first_name'])
+        interpreter.refresh_from_db()
+        self.assertEqual((interpreter.latitude, interpreter.longitude), (47.2529, -122.4443))
+
+    def test_geo_cell_backfill_migrations(self):
+        interpreter = self.place(1)
+        job = make_job(latitude=self.SEATTLE[0], longitude=self.SEATTLE[1])
+        unplaced = make_job()
+        InterpreterProfile.objects.update(geo_cell=None)
+        Job.objects.update(geo_cell=None)
+        schema_editor = SimpleNamespace(connection=connection)
+        for name in ('accounts.migrations.0009_interpreterprofile_geo_cell', 'jobs.migrations.0016_job_geo_cell'):
+            import_module(name).backfill_geo_cell(apps, schema_editor)
+        self.assertEqual(InterpreterProfile.objects.get(pk=interpreter.pk).geo_cell, grid_cell(*self.SEATTLE))
+        self.assertEqual(Job.objects.get(pk=job.pk).geo_cell, grid_cell(*self.SEATTLE))
+        self.assertIsNone(Job.objects.get(pk=unplaced.pk).geo_cell)
+
+
+class JobRowSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        interpreter = make_interpreter(1, first_name='Ana', last_name='Núñez')
+        make_job()
+        make_job(
+            spanish=False, somali=True, tigrinya=True, amharic=True, requires_dshs_certification=True,
+            time=datetime.time(23, 15, 30, 250000), duration_minutes=90, payment=125, mileage_included=True,
+            job_type='legal', state='WA', zip_code='98104',
+        )
+        make_job(assigned_interpreter=interpreter, status='completed', street_address='1 Pike St, Suite "B"')
+        make_job(spanish=False, status='cancelled')
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def assert_same_output(self, queryset):
+        queryset = queryset.select_related('assigned_interpreter').order_by('-date', '-time', '-id')
+        expected = self.render(JobSerializer(queryset, many=True).data)
+        self.assertEqual(self.render(serialize_job_rows(job_rows(queryset))), expected)
+
+    def test_matches_model_serializer(self):
+        self.assert_same_output(Job.objects.all())
+        self.assert_same_output(Job.objects.none())
+
+    def test_matches_model_serializer_in_other_timezone(self):
+        with timezone.override('Pacific/Chatham'):
+            self.assert_same_output(Job.objects.all())
+
+
+class JobAdminMatchesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = make_job()
+        cls.interpreters = [make_interpreter(index) for index in range(3)]
+        cls.url = reverse('admin:jobs_job_matching_interpreters', args=[cls.job.pk])
+
+    def login(self, **fields):
+        user = User.objects.create_user('dispatcher', password='password', **fields)
+        self.client.force_login(user)
+        return user
+
+    def test_anonymous_and_non_staff_are_sent_to_login(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('admin:login'), response['Location'])
+
+        self.login()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('admin:login'), response['Location'])
+
+    def test_staff_need_job_permission(self):
+        user = self.login(is_staff=True)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        user.user_permissions.add(Permission.objects.get(codename='view_job'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total'], 3)
+
+    def test_pages(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        data = self.client.get(self.url, {'sort': 'name', 'limit': 2}).json()
+        self.assertEqual([match['id'] for match in data['results']], [i.pk for i in self.interpreters[:2]])
+        self.assertEqual((data['total'], data['next_offset']), (3, 2))
+
+        data = self.client.get(self.url, {'sort': 'name', 'limit': 2, 'offset': 2}).json()
+        self.assertEqual([match['id'] for match in data['results']], [self.interpreters[2].pk])
+        self.assertIsNone(data['next_offset'])
+
+        self.assertEqual(self.client.get(self.url, {'sort': 'distance'}).status_code, 400)
+        missing = reverse('admin:jobs_job_matching_interpreters', args=[999999])
+        self.assertEqual(self.client.get(missing).status_code, 404)
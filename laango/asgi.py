@@ -14,3 +14,29 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "laango.settings")
 
 application = get_asgi_application()
+
+from asgiref.wsgi import WsgiToAsgi  # noqa: E402
+from django.conf import settings  # noqa: E402
+from whitenoise import WhiteNoise  # noqa: E402
+
+
+def not_found(environ, start_response):
+    start_response("404 Not Found", [("Content-Type", "text/plain")])
+    return [b"Not Found"]
+
+
+def with_static_files(app):
+    """Serve STATIC_URL with WhiteNoise (in a thread) and everything else with ``app``"""
+    static_app = WsgiToAsgi(WhiteNoise(not_found, root=settings.STATIC_ROOT, prefix=settings.STATIC_URL))
+
+    async def dispatch(scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(settings.STATIC_URL):
+            return await static_app(scope, receive, send)
+        return await app(scope, receive, send)
+
+    return dispatch
+
+
+if settings.ASYNC_VIEWS:
+    # settings.py drops WhiteNoiseMiddleware, which is sync-only
+    application = with_static_files(application)
@@ -0,0 +1,31 @@
+"""Model factories shared by the apps' tests"""
+import datetime
+
+from django.utils import timezone
+
+from accounts.models import InterpreterProfile
+from jobs.models import Job
+
+
+def make_interpreter(index, **kwargs):
+    fields = {
+        'first_name': 'Interpreter',
+        'last_name': f'{index:04d}',
+        'phone_number': f'+1206555{index:04d}',
+        'email_address': f'interpreter{index}@example.com',
+        'street_address': '1 Main St',
+        'city': 'Seattle',
+        'state': 'WA',
+        'zip_code': '98101',
+        'spanish': True,
+    }
+    return InterpreterProfile.objects.create(**{**fields, **kwargs})
+
+
+def make_job(**kwargs):
+    kwargs.setdefault('date', timezone.localdate() + datetime.timedelta(days=1))
+    kwargs.setdefault('time', datetime.time(9, 0))
+    kwargs.setdefault('spanish', True)
+    kwargs.setdefault('street_address', '500 5th Ave')
+    kwargs.setdefault('city', 'Seattle')
+    return Job.objects.create(**kwargs)
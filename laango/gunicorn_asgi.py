@@ -0,0 +1,25 @@
+"""
+Gunicorn config for serving laango.asgi with uvicorn workers:
+
+    gunicorn -c laango/gunicorn_asgi.py laango.asgi:application
+
+Each worker runs an event loop, so requests waiting on the database or on
+Twilio don't hold a worker the way a sync gunicorn worker does. The hot
+endpoints are switched to their async views (ASYNC_VIEWS); the rest still
+work, run by Django in a thread.
+"""
+import multiprocessing
+import os
+
+# Every module-level name here is read as a gunicorn setting, and `config`
+# is one, so decouple's config() is not imported by name
+import decouple
+
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+
+bind = f"0.0.0.0:{decouple.config('PORT', default='8000')}"
+worker_class = 'uvicorn_worker.UvicornWorker'
+workers = decouple.config('WEB_CONCURRENCY', default=min(multiprocessing.cpu_count() * 2 + 1, 4), cast=int)
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = timeout
+keepalive = 5
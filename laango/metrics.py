@@ -0,0 +1,241 @@
+"""
+Per-request performance metrics.
+
+MetricsMiddleware times every request and splits the time into phases:
+database (every query, through a wrapper installed on each connection),
+serialization (the JSON renderer and serialize_job_rows), template
+rendering (the DjangoTemplates backend below) and Twilio calls.
+The breakdown goes back to the client in a Server-Timing header and into
+histograms per URL name, which /api/metrics/ exposes in the Prometheus text
+format.
+
+Outside a request each hook is a single context variable lookup. Figures
+are per process, like board_cache.stats(): each worker reports the
+requests it served.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends import django as django_backend
+from rest_framework import renderers
+
+PHASES = ('db', 'serialize', 'template', 'sms')
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+@dataclass
+class RequestTimings:
+    queries: int = 0
+    db: float = 0.0
+    serialize: float = 0.0
+    template: float = 0.0
+    sms: float = 0.0
+
+
+_current = contextvars.ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to ``phase`` of the current request"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(timings, phase, getattr(timings, phase) + time.perf_counter() - start)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting and timing the current request's queries"""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """A Prometheus histogram labelled by view"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # view -> [count per bucket..., count above the last bucket], sum
+        self._series = {}
+
+    def observe(self, view, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(view) or ([0] * (len(self.buckets) + 1), 0)
+            counts[index] += 1
+            self._series[view] = counts, total + value
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((view, list(counts), total) for view, (counts, total) in self._series.items())
+        for view, counts, total in series:
+            label = f'view="{_escape(view)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{_format(bound)}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {_format(total)}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+        return lines
+
+
+HISTOGRAMS = {
+    'total': Histogram('laango_request_duration_seconds', 'Time to produce the response.', SECONDS_BUCKETS),
+    'queries': Histogram('laango_request_db_queries', 'Database queries per request.', QUERY_BUCKETS),
+    'db': Histogram('laango_request_db_seconds', 'Time spent in database queries.', SECONDS_BUCKETS),
+    'serialize': Histogram('laango_request_serialize_seconds', 'Time spent serializing JSON.', SECONDS_BUCKETS),
+    'template': Histogram('laango_request_template_seconds', 'Time spent rendering templates.', SECONDS_BUCKETS),
+    'sms': Histogram('laango_request_sms_seconds', 'Time spent waiting on Twilio.', SECONDS_BUCKETS),
+}
+
+
+def reset():
+    for histogram in HISTOGRAMS.values():
+        histogram.reset()
+
+
+def render():
+    """Every metric in the Prometheus text exposition format"""
+    from jobs import board_cache
+
+    lines = []
+    for histogram in HISTOGRAMS.values():
+        lines.extend(histogram.render())
+    lines.append('# HELP laango_board_cache_total Available jobs board cache lookups and invalidations.')
+    lines.append('# TYPE laango_board_cache_total counter')
+    for result, count in sorted(board_cache.stats().items()):
+        lines.append(f'laango_board_cache_total{{result="{result}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def server_timing(timings, total):
+    """The Server-Timing header value for a request's timings, in milliseconds"""
+    parts = [f'total;dur={total * 1000:.1f}', f'db;dur={timings.db * 1000:.1f};desc="{timings.queries} queries"']
+    for phase in PHASES[1:]:
+        value = getattr(timings, phase)
+        if value:
+            parts.append(f'{phase};dur={value * 1000:.1f}')
+    return ', '.join(parts)
+
+
+class MetricsMiddleware:
+    """Times each request, adds a Server-Timing header and records the histograms"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    def finish(self, request, response, timings, total):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        HISTOGRAMS['total'].observe(view, total)
+        HISTOGRAMS['queries'].observe(view, timings.queries)
+        for phase in PHASES:
+            HISTOGRAMS[phase].observe(view, getattr(timings, phase))
+        if settings.SERVER_TIMING:
+            response.headers['Server-Timing'] = server_timing(timings, total)
+        return response
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """DRF's JSONRenderer, counted as serialization time"""
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('serialize'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class Template:
+    """A Django template counted as template rendering time"""
+    def __init__(self, template):
+        self._template = template
+
+    def __getattr__(self, name):
+        return getattr(self._template, name)
+
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return self._template.render(context, request)
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """The DjangoTemplates backend, timing every top-level render"""
+    def from_string(self, template_code):
+        return Template(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return Template(super().get_template(template_name))
@@ -0,0 +1,93 @@
+"""
+Primary/replica database routing.
+
+When REPLICA_DATABASE_URL is set, reads made while handling a GET or HEAD
+request go to the ``replica`` database; everything else uses ``default``.
+A request is pinned to the primary from its first write on, and the
+response sets a cookie that keeps the client on the primary for
+REPLICA_PIN_SECONDS, so a redirect after a POST reads what it just wrote
+even if the replica is lagging.
+
+Code running outside a request (management commands, the SMS worker,
+background threads) always uses the primary.
+"""
+import contextvars
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE = 'primary_pin'
+
+# None outside requests, else a dict of flags for the current one. Mutable
+# rather than replaced, so a write made inside sync_to_async (which runs in
+# a copy of the context) still pins the rest of the request.
+_request_state = contextvars.ContextVar('replica_request_state', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in connections.settings
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state['pinned'] or not replica_configured():
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see its writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state['pinned'] = state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+
+class ReplicaMiddleware:
+    """Scopes the router's per-request state and sets the pin cookie"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request_state.set(self.initial_state(request))
+        try:
+            response = self.get_response(request)
+            return self.process_response(request, response)
+        finally:
+            _request_state.reset(token)
+
+    async def __acall__(self, request):
+        token = _request_state.set(self.initial_state(request))
+        try:
+            response = await self.get_response(request)
+            return self.process_response(request, response)
+        finally:
+            _request_state.reset(token)
+
+    def initial_state(self, request):
+        # Requests that may write read from the primary throughout
+        pinned = request.method not in ('GET', 'HEAD', 'OPTIONS') or PIN_COOKIE in request.COOKIES
+        return {'pinned': pinned, 'wrote': False}
+
+    def process_response(self, request, response):
+        if _request_state.get()['wrote'] and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
@@ -29,6 +29,13 @@ DEBUG = config('DEBUG', default=True, cast=bool)
 
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=Csv())
 
+# Behind a proxy that terminates TLS (Heroku's router), X-Forwarded-Proto says
+# whether the client used https; without trusting it, absolute URLs (which
+# Twilio webhook signatures cover) come out http://. Only turn this on when
+# the proxy always sets the header, or any client could claim https.
+if config('BEHIND_HTTPS_PROXY', default=False, cast=bool):
+    SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+
 
 # Application definition
 
@@ -50,7 +57,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "laango.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "laango.replica.ReplicaMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -65,7 +74,8 @@ ROOT_URLCONF = "laango.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, timing renders for laango.metrics
+        "BACKEND": "laango.metrics.DjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -80,6 +90,16 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "laango.wsgi.application"
 
+# Route the hot API endpoints to their async views (api/async_views.py,
+# accounts/async_views.py). laango/gunicorn_asgi.py sets it.
+ASYNC_VIEWS = config("ASYNC_VIEWS", default=False, cast=bool)
+
+if ASYNC_VIEWS:
+    # WhiteNoise's middleware is sync-only, so every request would be handed
+    # to a thread on its way to the async views. laango/asgi.py serves the
+    # static files in front of Django instead.
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -87,11 +107,50 @@ WSGI_APPLICATION = "laango.wsgi.application"
 DATABASES = {
     "default": dj_database_url.config(
         default="sqlite:///" + str(BASE_DIR / "db.sqlite3"),
-        conn_max_age=600,
+        # Under ASGI each request's queries run on a different thread, so
+        # persistent connections would pile up instead of being reused
+        conn_max_age=0 if ASYNC_VIEWS else 600,
+        conn_health_checks=True,
+    )
+}
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # Threaded tests need a file-backed test database: the shared in-memory
+    # one fails with "table is locked" instead of waiting for the lock.
+    DATABASES["default"]["TEST"] = {"NAME": str(BASE_DIR / "test_db.sqlite3")}
+
+# Optional read replica: reads made while serving GET/HEAD requests go here.
+# See laango/replica.py for the routing and read-your-writes pinning.
+REPLICA_DATABASE_URL = config("REPLICA_DATABASE_URL", default="")
+if REPLICA_DATABASE_URL:
+    DATABASES["replica"] = dj_database_url.parse(
+        REPLICA_DATABASE_URL,
+        conn_max_age=DATABASES["default"]["CONN_MAX_AGE"],
         conn_health_checks=True,
     )
+    # Tests share the primary's test database; ReplicaRoutingTests sets up
+    # a separate one
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["laango.replica.PrimaryReplicaRouter"]
+# Seconds a client keeps reading from the primary after a request that wrote
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=10, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default="laango"),
+    }
 }
 
+# Cache alias and timeout (seconds) for the available jobs board
+AVAILABLE_JOBS_CACHE = config("AVAILABLE_JOBS_CACHE", default="default")
+AVAILABLE_JOBS_CACHE_TIMEOUT = config("AVAILABLE_JOBS_CACHE_TIMEOUT", default=300, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -156,12 +215,53 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        'laango.metrics.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
+# Performance metrics (laango/metrics.py)
+# Send each request's time breakdown back in a Server-Timing header. Off by
+# default in production, where it would show anyone how long queries take
+SERVER_TIMING = config('SERVER_TIMING', default=DEBUG, cast=bool)
+# Bearer token for scraping /api/metrics/; staff users can always read it
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # Twilio Settings
 TWILIO_ACCOUNT_SID = config('TWILIO_ACCOUNT_SID', default='')
 TWILIO_AUTH_TOKEN = config('TWILIO_AUTH_TOKEN', default='')
 TWILIO_PHONE_NUMBER = config('TWILIO_PHONE_NUMBER', default='')
+# Send Twilio API requests somewhere else, e.g. a local `manage.py fake_twilio` server
+TWILIO_API_BASE_URL = config('TWILIO_API_BASE_URL', default='')
+TWILIO_TIMEOUT = config('TWILIO_TIMEOUT', default=10, cast=float)
+# Absolute URL of /api/sms/status/ for Twilio to report delivery outcomes to (unset: no callbacks)
+TWILIO_STATUS_CALLBACK_URL = config('TWILIO_STATUS_CALLBACK_URL', default='')
+
+# SMS Sending
+SMS_SEND_CONCURRENCY = config('SMS_SEND_CONCURRENCY', default=8, cast=int)
+SMS_SEND_MAX_RETRIES = config('SMS_SEND_MAX_RETRIES', default=2, cast=int)
+SMS_SEND_RETRY_BACKOFF = config('SMS_SEND_RETRY_BACKOFF', default=0.5, cast=float)
+SMS_OUTBOX_BATCH_SIZE = config('SMS_OUTBOX_BATCH_SIZE', default=50, cast=int)
+SMS_OUTBOX_LEASE_SECONDS = config('SMS_OUTBOX_LEASE_SECONDS', default=120, cast=int)
+SMS_OUTBOX_MAX_ATTEMPTS = config('SMS_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+# Delivery-status callbacks are stored as they arrive and folded into the
+# contacts this many seconds after the first one, this many per transaction
+SMS_STATUS_FLUSH_SIZE = config('SMS_STATUS_FLUSH_SIZE', default=500, cast=int)
+SMS_STATUS_FLUSH_SECONDS = config('SMS_STATUS_FLUSH_SECONDS', default=2.0, cast=float)
+# Callbacks for SIDs that still aren't known after this long are logged and dropped
+SMS_STATUS_ORPHAN_SECONDS = config('SMS_STATUS_ORPHAN_SECONDS', default=600, cast=int)
+# A YES reply accepts the latest offer sent to that number within this many hours
+SMS_REPLY_WINDOW_HOURS = config('SMS_REPLY_WINDOW_HOURS', default=48, cast=int)
+# Reject inbound webhooks without a valid X-Twilio-Signature (needs TWILIO_AUTH_TOKEN)
+TWILIO_VALIDATE_WEBHOOKS = config('TWILIO_VALIDATE_WEBHOOKS', default=True, cast=bool)
+
+# Interpreter Matching
+INTERPRETER_MATCH_RADIUS_MILES = config('INTERPRETER_MATCH_RADIUS_MILES', default=50, cast=float)
+# Contacts within this many days count against an interpreter's match score
+INTERPRETER_MATCH_CONTACT_DAYS = config('INTERPRETER_MATCH_CONTACT_DAYS', default=7, cast=int)
+# How far ahead the available jobs board looks
+AVAILABLE_JOBS_WINDOW_DAYS = config('AVAILABLE_JOBS_WINDOW_DAYS', default=90, cast=int)
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
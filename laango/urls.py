@@ -15,6 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
@@ -23,3 +24,11 @@ urlpatterns = [
     path("api/", include("api.urls")),
     path("", include("accounts.urls")),
 ]
+
+if settings.ASYNC_VIEWS:
+    # Matched first, so these paths are served by the async views while
+    # reverse() of the sync names keeps working
+    urlpatterns = [
+        path("api/", include("api.async_urls")),
+        path("", include("accounts.async_urls")),
+    ] + urlpatterns